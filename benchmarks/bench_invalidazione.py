@@ -0,0 +1,86 @@
+"""
+Benchmark del riallineamento del registro in memoria con le modifiche
+salvate da un altro processo:
+- controllo senza modifiche: inotify contro stat
+- una modifica esterna: ricarica completa contro riallineamento dei soli
+  record cambiati (confronto record per record sul JSON, coda del log con
+  il backend "log")
+
+Uso: python benchmarks/bench_invalidazione.py [numero_studenti] [ripetizioni]
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.registro import Registro
+from src.models.studente import Studente
+from src.utils.file_handler import FileHandler
+from src.utils.log_file_handler import LogFileHandler
+
+
+def cronometra(funzione, ripetizioni: int) -> float:
+    """Mediana in millisecondi"""
+    tempi = []
+    for _ in range(ripetizioni):
+        inizio = time.perf_counter()
+        funzione()
+        tempi.append((time.perf_counter() - inizio) * 1000)
+    return statistics.median(tempi)
+
+
+def modifica_esterna(classe, percorso: str, matricole, rnd: random.Random):
+    """Un altro operatore aggiunge un voto a uno studente e salva"""
+    altro = classe(percorso)
+    registro = Registro(altro)
+    registro.aggiungi_voto(rnd.choice(matricole), rnd.randint(18, 30))
+    registro.flush()
+
+
+def misura_modifiche(nome: str, classe, percorso: str, matricole, ripetizioni: int, rnd: random.Random):
+    registro = Registro(classe(percorso), osserva=True)
+    completa, incrementale = [], []
+    for _ in range(ripetizioni):
+        modifica_esterna(classe, percorso, matricole, rnd)
+        completa.append(cronometra(registro.ricarica, 1))
+        modifica_esterna(classe, percorso, matricole, rnd)
+        incrementale.append(cronometra(registro.aggiorna_se_cambiato, 1))
+    print(f"{nome:<6} ricarica completa {statistics.median(completa):9.1f} ms   "
+          f"solo record cambiati {statistics.median(incrementale):9.1f} ms")
+    print(f"       {registro.metriche.riepilogo()}")
+    registro.close()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    ripetizioni = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    rnd = random.Random(42)
+    matricole = [str(1000000 + i) for i in range(n)]
+    studenti = [Studente(m, f"Nome{i % 2000}", f"Cognome{i % 20000}",
+                         [rnd.randint(18, 30) for _ in range(5)]) for i, m in enumerate(matricole)]
+
+    with tempfile.TemporaryDirectory() as cartella:
+        percorso = os.path.join(cartella, "registro.txt")
+        FileHandler(percorso).save_students(studenti)
+        print(f"{n} studenti")
+
+        osservato = Registro(FileHandler(percorso), osserva=True)
+        con_stat = Registro(FileHandler(percorso))
+        print(f"controllo senza modifiche: inotify {cronometra(osservato.aggiorna_se_cambiato, 1000) * 1000:.2f} µs, "
+              f"stat {cronometra(con_stat.aggiorna_se_cambiato, 1000) * 1000:.2f} µs")
+        osservato.close()
+
+        misura_modifiche("json", FileHandler, percorso, matricole, ripetizioni, rnd)
+        # Il backend log parte dallo stesso snapshot, con una soglia alta per
+        # non compattare durante la misura
+        misura_modifiche("log", lambda p: LogFileHandler(p, soglia_compattazione=10 ** 9),
+                         percorso, matricole, ripetizioni, rnd)
+
+
+if __name__ == "__main__":
+    main()
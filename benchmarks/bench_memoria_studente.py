@@ -0,0 +1,63 @@
+"""
+Benchmark di memoria: Studente (dataclass + lista) contro StudenteCompatto.
+
+Ogni modello viene caricato in un processo separato, così il picco di RSS
+misurato non è influenzato dall'altro.
+
+Uso: python benchmarks/bench_memoria_studente.py [numero_studenti]
+"""
+
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.studente import Studente, StudenteCompatto
+
+MODELLI = {"Studente": Studente, "StudenteCompatto": StudenteCompatto}
+NOMI = ["Luca", "Mario", "Giovanna", "Roberta", "Marina", "Nunzio", "Anna", "Paolo"]
+COGNOMI = ["Rossi", "Bianchi", "Rossellini", "Pari", "Repetto", "Scevola", "Verdi"]
+
+
+def rss_mb() -> float:
+    """Picco di RSS del processo corrente in MB (ru_maxrss è in KB su Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def genera_record(n: int):
+    rnd = random.Random(42)
+    for i in range(n):
+        # Copie delle stringhe, come quelle prodotte da json.load per ogni record
+        yield {
+            "matricola": str(1000000 + i),
+            "nome": "".join(rnd.choice(NOMI)),
+            "cognome": "".join(rnd.choice(COGNOMI)),
+            "voti": [rnd.randint(18, 30) for _ in range(rnd.randint(0, 10))],
+        }
+
+
+def misura(nome_modello: str, n: int):
+    modello = MODELLI[nome_modello]
+    base = rss_mb()
+    inizio = time.perf_counter()
+    studenti = [modello.from_dict(r) for r in genera_record(n)]
+    durata = time.perf_counter() - inizio
+    print(f"{nome_modello:<18} {len(studenti):>9} studenti  "
+          f"RSS +{rss_mb() - base:8.1f} MB  caricamento {durata:6.2f}s")
+
+
+def main():
+    if len(sys.argv) == 3:
+        misura(sys.argv[1], int(sys.argv[2]))
+        return
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    for nome_modello in MODELLI:
+        subprocess.run([sys.executable, __file__, nome_modello, str(n)], check=True)
+
+
+if __name__ == "__main__":
+    main()
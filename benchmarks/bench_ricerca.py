@@ -0,0 +1,89 @@
+"""
+Benchmark della ricerca per nome e cognome: IndiceRicerca (prefisso e
+approssimata) contro la scansione lineare di tutti gli studenti.
+
+Nomi e cognomi sono generati combinando sillabe, quindi il vocabolario
+contiene molte parole simili tra loro come un registro reale.
+
+Uso: python benchmarks/bench_ricerca.py [numero_studenti] [interrogazioni]
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.indice_ricerca import IndiceRicerca, normalizza
+
+# Sillabe consonante (o gruppo consonantico) + vocale, come nei cognomi italiani
+SILLABE = [c + v for c in ["", "b", "c", "d", "f", "g", "l", "m", "n", "p", "r", "s", "t", "v", "z",
+                           "ch", "gl", "gn", "sc", "tr", "br", "st", "ll", "ss", "tt", "rr", "nn", "zz"]
+           for v in "aeiou"]
+
+
+def genera_parole(rnd: random.Random, quante: int, sillabe_min: int, sillabe_max: int):
+    return [("".join(rnd.choice(SILLABE) for _ in range(rnd.randint(sillabe_min, sillabe_max)))).capitalize()
+            for _ in range(quante)]
+
+
+def con_refuso(rnd: random.Random, parola: str) -> str:
+    i = rnd.randrange(1, len(parola))
+    return parola[:i] + rnd.choice("aeiourst") + parola[i + 1:]
+
+
+def scansione_prefisso(studenti, testo: str, limite: int = 20):
+    termini = normalizza(testo).split()
+    risultati = []
+    for matricola, nome, cognome in studenti:
+        parole = normalizza(cognome).split() + normalizza(nome).split()
+        if all(any(p.startswith(t) for p in parole) for t in termini):
+            risultati.append(matricola)
+            if len(risultati) >= limite:
+                break
+    return risultati
+
+
+def misura(nome: str, funzione, interrogazioni):
+    tempi = []
+    for testo in interrogazioni:
+        inizio = time.perf_counter()
+        funzione(testo)
+        tempi.append((time.perf_counter() - inizio) * 1000)
+    tempi.sort()
+    p99 = tempi[min(len(tempi) - 1, int(len(tempi) * 0.99))]
+    print(f"{nome:<26} mediana {statistics.median(tempi):9.3f} ms   p99 {p99:9.3f} ms")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    quante = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    rnd = random.Random(42)
+    cognomi = genera_parole(rnd, 20_000, 2, 4)
+    nomi = genera_parole(rnd, 2_000, 2, 3)
+    studenti = [(str(1000000 + i), rnd.choice(nomi), rnd.choice(cognomi)) for i in range(n)]
+
+    inizio = time.perf_counter()
+    indice = IndiceRicerca()
+    for matricola, nome, cognome in studenti:
+        indice.aggiungi(matricola, nome, cognome)
+    print(f"{n} studenti, indice costruito in {time.perf_counter() - inizio:.2f} s")
+
+    campione = [rnd.choice(studenti) for _ in range(quante)]
+    prefissi = [cognome[:3] for _, _, cognome in campione]
+    nomi_completi = [f"{cognome} {nome[:2]}" for _, nome, cognome in campione]
+    refusi = [con_refuso(rnd, cognome) for _, _, cognome in campione]
+    refusi_completi = [f"{con_refuso(rnd, cognome)} {nome}" for _, nome, cognome in campione]
+
+    misura("prefisso (3 lettere)", indice.cerca_prefisso, prefissi)
+    misura("prefisso (cognome + nome)", indice.cerca_prefisso, nomi_completi)
+    misura("simili (cognome)", indice.cerca_simili, refusi)
+    misura("simili (cognome + nome)", indice.cerca_simili, refusi_completi)
+    # La scansione lineare è molto più lenta: bastano poche interrogazioni
+    misura("scansione (cognome + nome)", lambda t: scansione_prefisso(studenti, t), nomi_completi[:10])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark della latenza di salvataggio del registro: scrittura con
+troncamento (open 'w', il comportamento precedente) contro scrittura
+atomica (file temporaneo + fsync + rinomina).
+
+Uso: python benchmarks/bench_scrittura_registro.py [numero_studenti] [ripetizioni]
+"""
+
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.scrittura_atomica import scrittura_atomica
+
+
+def scrittura_troncante(percorso: str, dati):
+    with open(percorso, 'w', encoding='utf-8') as file:
+        json.dump(dati, file, ensure_ascii=False, indent=2)
+
+
+def scrittura_sicura(percorso: str, dati):
+    with scrittura_atomica(percorso) as file:
+        json.dump(dati, file, ensure_ascii=False, indent=2)
+
+
+def misura(nome: str, funzione, percorso: str, dati, ripetizioni: int):
+    tempi = []
+    for _ in range(ripetizioni):
+        inizio = time.perf_counter()
+        funzione(percorso, dati)
+        tempi.append((time.perf_counter() - inizio) * 1000)
+    tempi.sort()
+    p99 = tempi[min(len(tempi) - 1, int(len(tempi) * 0.99))]
+    print(f"{nome:<12} mediana {statistics.median(tempi):8.2f} ms   p99 {p99:8.2f} ms")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    ripetizioni = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    rnd = random.Random(42)
+    dati = [{"matricola": str(1000000 + i), "nome": "Nome", "cognome": "Cognome",
+             "voti": [rnd.randint(18, 30) for _ in range(5)]} for i in range(n)]
+    print(f"{n} studenti, {ripetizioni} salvataggi")
+    with tempfile.TemporaryDirectory() as cartella:
+        percorso = os.path.join(cartella, "registro.txt")
+        misura("troncante", scrittura_troncante, percorso, dati, ripetizioni)
+        misura("atomica", scrittura_sicura, percorso, dati, ripetizioni)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Generatore di carico per il servizio HTTP del registro: molti client
+concorrenti con connessioni persistenti, un misto di letture e scritture
+(aggiunta voti), latenza p50/p99 per tipo di richiesta.
+
+Senza --porta avvia il servizio in un processo separato su un registro
+temporaneo di ``numero_studenti`` studenti e, alla fine, ne riporta il numero
+di salvataggi (group commit) rispetto alle scritture.
+
+Uso: python benchmarks/bench_servizio.py [--studenti 10000] [--client 64]
+         [--richieste 20000] [--scritture 0.5] [--backend json] [--porta 8080]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RADICE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RADICE)
+
+from src.models.studente import Studente
+from src.utils.file_handler import FileHandler
+
+
+async def client(porta: int, matricole, quante: int, quota_scritture: float, rnd: random.Random, tempi):
+    reader, writer = await asyncio.open_connection("127.0.0.1", porta)
+    try:
+        for _ in range(quante):
+            matricola = rnd.choice(matricole)
+            if rnd.random() < quota_scritture:
+                tipo, corpo = "scrittura", json.dumps({"voto": rnd.randint(18, 30)}).encode()
+                testa = f"POST /studenti/{matricola}/voti HTTP/1.1\r\nContent-Length: {len(corpo)}\r\n\r\n"
+            else:
+                tipo, corpo = "lettura", b""
+                testa = f"GET /studenti/{matricola} HTTP/1.1\r\n\r\n"
+            inizio = time.perf_counter()
+            writer.write(testa.encode() + corpo)
+            lunghezza = 0
+            while True:
+                riga = await reader.readline()
+                if riga in (b"\r\n", b""):
+                    break
+                if riga.lower().startswith(b"content-length:"):
+                    lunghezza = int(riga.split(b":")[1])
+            await reader.readexactly(lunghezza)
+            tempi[tipo].append((time.perf_counter() - inizio) * 1000)
+    finally:
+        writer.close()
+
+
+async def genera_carico(porta: int, matricole, n_client: int, richieste: int, quota_scritture: float):
+    tempi = {"lettura": [], "scrittura": []}
+    rnd = random.Random(42)
+    inizio = time.perf_counter()
+    await asyncio.gather(*(client(porta, matricole, richieste // n_client, quota_scritture,
+                                  random.Random(rnd.random()), tempi) for _ in range(n_client)))
+    durata = time.perf_counter() - inizio
+    totale = sum(len(t) for t in tempi.values())
+    print(f"{totale} richieste da {n_client} client in {durata:.2f} s ({totale / durata:.0f} richieste/s)")
+    for tipo, valori in tempi.items():
+        if valori:
+            valori.sort()
+            p99 = valori[min(len(valori) - 1, int(len(valori) * 0.99))]
+            print(f"{tipo:<10} {len(valori):>7}   p50 {statistics.median(valori):8.2f} ms   p99 {p99:8.2f} ms")
+
+
+async def attendi_porta(porta: int):
+    for _ in range(600):
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", porta)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.05)
+    raise RuntimeError("il servizio non risponde")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--studenti", type=int, default=10_000)
+    parser.add_argument("--client", type=int, default=64)
+    parser.add_argument("--richieste", type=int, default=20_000)
+    parser.add_argument("--scritture", type=float, default=0.5, help="quota di scritture (0-1)")
+    parser.add_argument("--backend", default="json")
+    parser.add_argument("--finestra", type=float, default=0.0, help="millisecondi, passati al servizio")
+    parser.add_argument("--porta", type=int, help="servizio già avviato su questa porta")
+    args = parser.parse_args()
+
+    matricole = [str(1000000 + i) for i in range(args.studenti)]
+    if args.porta:
+        asyncio.run(genera_carico(args.porta, matricole, args.client, args.richieste, args.scritture))
+        return
+
+    rnd = random.Random(42)
+    with tempfile.TemporaryDirectory() as cartella:
+        FileHandler(os.path.join(cartella, "registro.txt")).save_students(
+            Studente(m, "Nome", "Cognome", [rnd.randint(18, 30) for _ in range(5)]) for m in matricole)
+        porta = 18080
+        servizio = subprocess.Popen(
+            [sys.executable, "-m", "src.utils.servizio_registro", "--porta", str(porta),
+             "--backend", args.backend, "--finestra", str(args.finestra)],
+            cwd=cartella, env={**os.environ, "PYTHONPATH": RADICE},
+            stdout=subprocess.PIPE, text=True)
+        try:
+            asyncio.run(attendi_porta(porta))
+            print(f"backend {args.backend}, {args.studenti} studenti, quota scritture {args.scritture:.0%}")
+            asyncio.run(genera_carico(porta, matricole, args.client, args.richieste, args.scritture))
+        finally:
+            servizio.send_signal(signal.SIGINT)
+            uscita, _ = servizio.communicate(timeout=60)
+        print(uscita.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    main()
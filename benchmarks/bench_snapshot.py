@@ -0,0 +1,80 @@
+"""
+Benchmark dello snapshot binario contro il registro JSON: avvio a freddo
+(apertura + prima ricerca di una matricola), lettura completa e latenza
+delle ricerche per matricola.
+
+Uso: python benchmarks/bench_snapshot.py [numero_studenti] [ricerche]
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.studente import Studente
+from src.utils.file_handler import FileHandler
+from src.utils.snapshot_file_handler import Snapshot, esporta_snapshot
+
+
+def cronometra(funzione):
+    inizio = time.perf_counter()
+    risultato = funzione()
+    return risultato, (time.perf_counter() - inizio) * 1000
+
+
+def avvio_json(percorso: str, matricola: str):
+    studenti = {s.matricola: s for s in FileHandler(percorso).load_students()}
+    return studenti, studenti.get(matricola)
+
+
+def avvio_snapshot(percorso: str, matricola: str):
+    snapshot = Snapshot(percorso)
+    return snapshot, snapshot.trova(matricola)
+
+
+def misura_ricerche(nome: str, trova, matricole):
+    tempi = []
+    for matricola in matricole:
+        inizio = time.perf_counter()
+        trova(matricola)
+        tempi.append((time.perf_counter() - inizio) * 1_000_000)
+    tempi.sort()
+    p99 = tempi[min(len(tempi) - 1, int(len(tempi) * 0.99))]
+    print(f"{nome:<28} mediana {statistics.median(tempi):8.2f} µs   p99 {p99:8.2f} µs")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    ricerche = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    rnd = random.Random(42)
+    studenti = [Studente(str(1000000 + i), f"Nome{i % 2000}", f"Cognome{i % 20000}",
+                         [rnd.randint(18, 30) for _ in range(rnd.randint(0, 8))]) for i in range(n)]
+    rnd.shuffle(studenti)
+    matricole = [str(1000000 + rnd.randrange(n)) for _ in range(ricerche)]
+
+    with tempfile.TemporaryDirectory() as cartella:
+        percorso_json = os.path.join(cartella, "registro.txt")
+        percorso_snap = os.path.join(cartella, "registro.snap")
+        FileHandler(percorso_json).save_students(studenti)
+        _, ms = cronometra(lambda: esporta_snapshot(studenti, percorso_snap))
+        print(f"{n} studenti: JSON {os.path.getsize(percorso_json) / 2**20:.1f} MiB, "
+              f"snapshot {os.path.getsize(percorso_snap) / 2**20:.1f} MiB (esportato in {ms:.0f} ms)")
+
+        (indice, _), ms = cronometra(lambda: avvio_json(percorso_json, matricole[0]))
+        print(f"{'avvio + ricerca JSON':<28} {ms:10.1f} ms")
+        (snapshot, _), ms = cronometra(lambda: avvio_snapshot(percorso_snap, matricole[0]))
+        print(f"{'avvio + ricerca snapshot':<28} {ms:10.3f} ms")
+        _, ms = cronometra(lambda: sum(1 for _ in snapshot))
+        print(f"{'lettura completa snapshot':<28} {ms:10.1f} ms")
+
+        misura_ricerche("ricerca dict (JSON caricato)", indice.get, matricole)
+        misura_ricerche("ricerca snapshot (mmap)", snapshot.trova, matricole)
+        snapshot.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,50 +5,61 @@ import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from src.models.studente import Studente
-from src.utils.file_handler import FileHandler
+from src.models.registro import Registro, registro_condiviso
+from src.utils.backends import crea_file_handler
 from src.utils.input_validator import InputValidator
-from src.views.console_view import ConsoleView
+from src.views.console_view import ConsoleView, DIMENSIONE_PAGINA
 from colorama import init
 from src.utils.database_updater import DatabaseUpdater
+from src.utils.classifica import PERCENTILI
+from src.models.storico_voti import periodo_mese
 
 def main():
     init()  # Inizializza colorama
-    file_handler = FileHandler("registro.txt")
+    file_handler = crea_file_handler()
+    registro = registro_condiviso(file_handler)
     view = ConsoleView()
     validator = InputValidator()
 
+    try:
+        menu(registro, view, validator)
+    finally:
+        # Salva eventuali modifiche rimaste in sospeso all'uscita
+        registro.flush()
+
+def menu(registro: Registro, view: ConsoleView, validator: InputValidator):
     while True:
+        # Un solo stat: rilegge il registro solo se un altro processo l'ha salvato
+        registro.aggiorna_se_cambiato()
         scelta = view.mostra_menu()
         if scelta == "0":
             print("👋 Arrivederci!")
             break
             
         elif scelta == "1":
-            studenti = file_handler.load_students()
-            view.stampa_studenti(studenti)
+            if not sys.stdout.isatty():
+                # Output rediretto su file o pipe: testo semplice in streaming
+                view.stampa_studenti_testo(registro.studenti(), aggregati=registro.aggregati())
+            elif len(registro) > DIMENSIONE_PAGINA:
+                view.stampa_studenti_paginata(registro.studenti(), aggregati=registro.aggregati())
+            else:
+                view.stampa_studenti(registro.studenti(), registro.aggregati())
             
         elif scelta == "2":
             # Aggiunta nuovo studente
             nuovo_studente = view.richiedi_dati_studente(validator)
             if nuovo_studente:
-                studenti = file_handler.load_students()
                 # Verifica se la matricola esiste già
-                if any(s.matricola == nuovo_studente.matricola for s in studenti):
+                if not registro.aggiungi(nuovo_studente):
                     print("❌ Errore: Matricola già esistente!")
                     continue
-                studenti.append(nuovo_studente)
-                if file_handler.save_students(studenti):
+                if registro.flush():
                     print(f"✅ Studente {nuovo_studente.nome} {nuovo_studente.cognome} aggiunto con successo!")
                     
         elif scelta == "3":
             # Aggiunta voto
-            studenti = file_handler.load_students()
-            if not studenti:
-                print("❌ Nessuno studente presente nel registro!")
-                continue
-                
             matricola = input("Inserisci la matricola dello studente: ").strip()
-            studente = next((s for s in studenti if s.matricola == matricola), None)
+            studente = registro.trova(matricola)
             if not studente:
                 print("❌ Studente non trovato!")
                 continue
@@ -56,39 +67,38 @@ def main():
             voto_str = input("Inserisci il nuovo voto (18-30): ").strip()
             if validator.valida_voto(voto_str):
                 voto = int(voto_str)
-                studente.voti.append(voto)
-                if file_handler.save_students(studenti):
+                corso = input("Codice del corso (invio per saltare): ").strip()
+                lode = voto == 30 and input("Con lode? (s/N): ").strip().lower() == 's'
+                registro.aggiungi_voto(matricola, voto, corso or None, lode=lode)
+                if registro.flush():
                     print(f"✅ Voto {voto} aggiunto con successo!")
             else:
                 print("❌ Voto non valido!")
                 
         elif scelta == "4":
             # Cancellazione studente
-            studenti = file_handler.load_students()
-            if not studenti:
-                print("❌ Nessuno studente presente nel registro!")
-                continue
-                
             matricola = input("Inserisci la matricola dello studente da cancellare: ").strip()
-            studente = next((s for s in studenti if s.matricola == matricola), None)
+            studente = registro.trova(matricola)
             if not studente:
                 print("❌ Studente non trovato!")
                 continue
                 
             conferma = input(f"⚠️ Sei sicuro di voler cancellare lo studente {studente.nome} {studente.cognome}? (s/N): ").strip().lower()
             if conferma == 's':
-                studenti.remove(studente)
-                if file_handler.save_students(studenti):
+                registro.cancella(matricola)
+                if registro.flush():
                     print("✅ Studente cancellato con successo!")
             else:
                 print("Operazione annullata.")
         
         elif scelta == "5":
             print("\nControllo matricole nel database...")
-            updater = DatabaseUpdater(file_handler, validator)
+            registro.flush()
+            updater = DatabaseUpdater(registro.file_handler, validator)
             n_aggiornamenti, modifiche = updater.aggiorna_matricole()
             
             if n_aggiornamenti > 0:
+                registro.ricarica()
                 print(f"\nMatricole aggiornate: {n_aggiornamenti}")
                 print("\nRiepilogo modifiche:")
                 for m in modifiche:
@@ -96,6 +106,69 @@ def main():
             else:
                 print("✅ Nessuna matricola da aggiornare!")
         
+        elif scelta == "6":
+            testo = input("Cerca (nome e/o cognome, anche solo l'inizio): ").strip()
+            risultati = registro.cerca(testo)
+            if not risultati:
+                # Nessuna corrispondenza per prefisso: prova a tollerare refusi
+                risultati = registro.cerca_simili(testo)
+                if risultati:
+                    print("Nessuna corrispondenza esatta, studenti con nomi simili:")
+            if risultati:
+                view.stampa_studenti(risultati, registro.aggregati())
+            else:
+                print("❌ Nessuno studente trovato!")
+
+        elif scelta == "7":
+            tipo = input("[1] Migliori K  [2] Media sotto una soglia  [3] Percentili: ").strip()
+            try:
+                if tipo == "1":
+                    view.stampa_classifica(registro.migliori(int(input("Quanti studenti? ").strip())))
+                elif tipo == "2":
+                    view.stampa_classifica(registro.sotto_soglia(float(input("Soglia: ").strip())))
+                elif tipo == "3":
+                    if registro.percentile(50) is None:
+                        print("Nessuno studente con voti nel registro.")
+                        continue
+                    for p in PERCENTILI:
+                        print(f"{p}° percentile: {registro.percentile(p):.2f}")
+                    matricola = input("Matricola per il rango percentile (invio per saltare): ").strip()
+                    if matricola:
+                        rango = registro.rango_percentile(matricola)
+                        if rango is None:
+                            print("❌ Studente non trovato o senza voti!")
+                        else:
+                            print(f"Media migliore del {rango:.1f}% degli studenti")
+                else:
+                    print("⚠️ Scelta non valida!")
+            except ValueError:
+                print("❌ Valore non valido!")
+
+        elif scelta == "8":
+            tipo = input("[1] Voti di un mese  [2] Statistiche di un corso: ").strip()
+            if tipo == "1":
+                try:
+                    inizio, fine = periodo_mese(input("Mese (AAAA-MM): ").strip())
+                except ValueError:
+                    print("❌ Mese non valido!")
+                    continue
+                view.stampa_voti_storico(registro.voti_nel_periodo(inizio, fine))
+            elif tipo == "2":
+                corsi = registro.corsi()
+                if not corsi:
+                    print("Nessun voto con il corso registrato.")
+                    continue
+                print("Corsi: " + ", ".join(corsi))
+                corso = input("Codice del corso: ").strip()
+                statistiche = registro.statistiche_corso(corso)
+                if statistiche is None:
+                    print("❌ Nessun voto per questo corso!")
+                else:
+                    print(f"{corso}: {statistiche.voti} voti, media {statistiche.media:.2f}, "
+                          f"{statistiche.lodi} lodi")
+            else:
+                print("⚠️ Scelta non valida!")
+
         else:
             print("⚠️ Scelta non valida!")
 
@@ -0,0 +1,60 @@
+"""
+Benchmark della banca precompilata (.qbank) contro il file JSON: tempo per
+aprire la banca ed estrarre le domande di una sessione, dimensione dei file
+e tempo di compilazione.
+
+Uso: python benchmarks/bench_binary_bank.py [numero_domande] [domande_per_sessione]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from binary_bank import compile_questions
+from data_loader import load_questions, open_questions
+from question_bank import QuestionBank
+
+
+def genera_banca(percorso: str, n: int):
+    with open(percorso, "w", encoding="utf-8") as f:
+        json.dump([{
+            "domanda": f"Domanda numero {i}: quale opzione è corretta?",
+            "opzioni": {lettera: f"Risposta {lettera} alla domanda {i}" for lettera in "ABCD"},
+            "corretta": random.choice("ABCD"),
+        } for i in range(n)], f)
+
+
+def cronometra(funzione):
+    inizio = time.perf_counter()
+    risultato = funzione()
+    return risultato, (time.perf_counter() - inizio) * 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+    with tempfile.TemporaryDirectory() as cartella:
+        percorso_json = os.path.join(cartella, "questions.json")
+        percorso_qbank = os.path.join(cartella, "questions.qbank")
+        genera_banca(percorso_json, n)
+        _, ms_compila = cronometra(lambda: compile_questions(percorso_json, percorso_qbank))
+        print(f"Banca di {n} domande: JSON {os.path.getsize(percorso_json) / 1e6:.1f} MB, "
+              f".qbank {os.path.getsize(percorso_qbank) / 1e6:.1f} MB (compilata in {ms_compila / 1000:.1f} s)")
+
+        _, ms_json = cronometra(lambda: QuestionBank(load_questions(percorso_json)).sample(k))
+        _, ms_qbank = cronometra(lambda: QuestionBank(open_questions(percorso_qbank)).sample(k))
+        banca = QuestionBank(open_questions(percorso_qbank))
+        _, ms_sessione = cronometra(lambda: [banca.sample(k) for _ in range(1000)])
+
+    print(f"JSON:   apertura + {k} domande {ms_json:10.3f} ms")
+    print(f".qbank: apertura + {k} domande {ms_qbank:10.3f} ms")
+    print(f".qbank: {k} domande da banca aperta {ms_sessione / 1000:7.3f} ms/sessione")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark del caricamento di banche domande molto grandi: lettura completa
+con json.load (come prima del caricamento in streaming) contro
+iter_questions, in un solo processo e (per i .jsonl) con più processi.
+
+Ogni prova gira in un processo separato, che scorre le domande senza
+tenerle e riporta tempo e memoria massima (RSS) usata.
+
+Uso: python benchmarks/bench_data_loader.py [numero_domande] [processi]
+"""
+
+import json
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_loader import LoadReport, iter_questions, validate_question
+
+
+def genera_banca(cartella: str, n: int):
+    """Scrive la stessa banca in .json e .jsonl, con l'1% di domande non valide"""
+    percorso_json = os.path.join(cartella, "questions.json")
+    percorso_jsonl = os.path.join(cartella, "questions.jsonl")
+    with open(percorso_json, "w", encoding="utf-8") as fj, open(percorso_jsonl, "w", encoding="utf-8") as fl:
+        fj.write("[\n")
+        for i in range(n):
+            domanda = {
+                "domanda": f"Domanda numero {i}: quale opzione è corretta?",
+                "opzioni": {lettera: f"Risposta {lettera} alla domanda {i}" for lettera in "ABCD"},
+                "corretta": random.choice("ABCD") if i % 100 else "E",
+            }
+            riga = json.dumps(domanda, ensure_ascii=False)
+            fj.write(riga + (",\n" if i < n - 1 else "\n"))
+            fl.write(riga + "\n")
+        fj.write("]\n")
+    return percorso_json, percorso_jsonl
+
+
+def json_load(percorso: str, _workers: int) -> int:
+    with open(percorso, encoding="utf-8") as f:
+        return sum(1 for raw in json.load(f) if validate_question(raw))
+
+
+def streaming(percorso: str, workers: int) -> int:
+    report = LoadReport()
+    for _ in iter_questions(percorso, report, workers):
+        pass
+    return report.accepted
+
+
+def prova(coda, funzione, percorso: str, workers: int):
+    inizio = time.perf_counter()
+    valide = funzione(percorso, workers)
+    secondi = time.perf_counter() - inizio
+    coda.put((valide, secondi, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))
+
+
+def misura(nome: str, funzione, percorso: str, workers: int = 1):
+    coda = multiprocessing.Queue()
+    processo = multiprocessing.Process(target=prova, args=(coda, funzione, percorso, workers))
+    processo.start()
+    valide, secondi, rss_mb = coda.get()
+    processo.join()
+    print(f"{nome:<34} {valide:>9} valide  {secondi:7.2f} s  {valide / secondi:>9,.0f} domande/s  RSS {rss_mb:6.0f} MB")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    with tempfile.TemporaryDirectory() as cartella:
+        percorso_json, percorso_jsonl = genera_banca(cartella, n)
+        print(f"Banca di {n} domande ({os.path.getsize(percorso_json) / 1e6:.0f} MB), {workers} processi")
+        misura("json.load + validazione", json_load, percorso_json)
+        misura("streaming .json", streaming, percorso_json)
+        misura("streaming .jsonl", streaming, percorso_jsonl)
+        if workers > 1:
+            misura(f"streaming .jsonl, {workers} processi", streaming, percorso_jsonl, workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark di memoria: Domanda compatta (__slots__, tupla di opzioni,
+stringhe internate) contro la precedente dataclass con un dict di opzioni
+per domanda.
+
+Ogni modello viene caricato in un processo separato, così il picco di RSS
+misurato non è influenzato dall'altro.
+
+Uso: python benchmarks/bench_memoria_domanda.py [numero_domande]
+"""
+
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import LETTERE, Domanda
+
+# Opzioni ricorrenti nelle banche reali, mescolate a opzioni uniche
+OPZIONI_COMUNI = ["Vero", "Falso", "Nessuna delle precedenti", "Tutte le precedenti", "1989", "Roma"]
+
+
+@dataclass(frozen=True)
+class DomandaDataclass:
+    """La Domanda com'era prima: dataclass con una mappa delle opzioni per istanza"""
+    testo: str
+    opzioni: Mapping[str, str]
+    corretta: str
+
+
+def crea_dataclass(testo, opzioni, corretta):
+    return DomandaDataclass(testo, MappingProxyType(dict(zip(LETTERE, opzioni))), corretta)
+
+
+MODELLI = {"DomandaDataclass": crea_dataclass, "Domanda": Domanda}
+
+
+def rss_mb() -> float:
+    """Picco di RSS del processo corrente in MB (ru_maxrss è in KB su Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def genera_record(n: int):
+    rnd = random.Random(42)
+    for i in range(n):
+        # Copie delle stringhe, come quelle prodotte dal parsing del file
+        opzioni = tuple("".join(rnd.choice(OPZIONI_COMUNI)) if rnd.random() < 0.5 else f"Risposta {lettera} {i}"
+                        for lettera in LETTERE)
+        yield f"Domanda numero {i}: quale opzione è corretta?", opzioni, rnd.choice(LETTERE)
+
+
+def misura(nome_modello: str, n: int):
+    modello = MODELLI[nome_modello]
+    base = rss_mb()
+    inizio = time.perf_counter()
+    domande = [modello(testo, opzioni, corretta) for testo, opzioni, corretta in genera_record(n)]
+    durata = time.perf_counter() - inizio
+    print(f"{nome_modello:<18} {len(domande):>9} domande  "
+          f"RSS +{rss_mb() - base:8.1f} MB  creazione {durata:6.2f}s")
+
+
+def main():
+    if len(sys.argv) == 3:
+        misura(sys.argv[1], int(sys.argv[2]))
+        return
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    for nome_modello in MODELLI:
+        subprocess.run([sys.executable, __file__, nome_modello, str(n)], check=True)
+
+
+if __name__ == "__main__":
+    main()
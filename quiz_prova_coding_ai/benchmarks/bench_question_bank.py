@@ -0,0 +1,72 @@
+"""
+Benchmark della banca domande: costo di una nuova partita rileggendo il
+file a ogni sessione (load_questions) contro la banca in cache (load_bank),
+e scelta delle domande mescolando tutta la banca contro sample() in O(k).
+
+Uso: python benchmarks/bench_question_bank.py [numero_domande] [sessioni]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_loader import load_questions
+from question_bank import load_bank, clear_cache
+
+
+def genera_banca(percorso: str, n: int):
+    with open(percorso, "w", encoding="utf-8") as f:
+        json.dump([{
+            "domanda": f"Domanda numero {i}: quale opzione è corretta?",
+            "opzioni": {lettera: f"Risposta {lettera} alla domanda {i}" for lettera in "ABCD"},
+            "corretta": random.choice("ABCD"),
+        } for i in range(n)], f)
+
+
+def cronometra(funzione, ripetizioni: int) -> float:
+    """Millisecondi medi per chiamata"""
+    inizio = time.perf_counter()
+    for _ in range(ripetizioni):
+        funzione()
+    return (time.perf_counter() - inizio) * 1000 / ripetizioni
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    sessioni = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    with tempfile.TemporaryDirectory() as cartella:
+        percorso = os.path.join(cartella, "questions.json")
+        genera_banca(percorso, n)
+        print(f"Banca di {n} domande ({os.path.getsize(percorso) / 1e6:.1f} MB), {sessioni} sessioni")
+
+        ms_file = cronometra(lambda: load_questions(percorso), sessioni)
+        clear_cache()
+        ms_primo = cronometra(lambda: load_bank(percorso), 1)
+        ms_cache = cronometra(lambda: load_bank(percorso), sessioni)
+        banca = load_bank(percorso)
+
+    def mescola():
+        domande = list(banca)
+        random.shuffle(domande)
+        return domande[:15]
+
+    ms_shuffle = cronometra(mescola, sessioni)
+    ms_sample = cronometra(lambda: banca.sample(15), sessioni * 100)
+    seen = set()
+    ms_seen = cronometra(lambda: banca.sample(15, seen=seen), sessioni * 100)
+
+    print(f"load_questions a ogni sessione: {ms_file:9.3f} ms/sessione")
+    print(f"load_bank, primo caricamento:    {ms_primo:9.3f} ms")
+    print(f"load_bank, sessioni successive:  {ms_cache:9.3f} ms/sessione")
+    print(f"15 domande, shuffle + slice:     {ms_shuffle:9.3f} ms/sessione")
+    print(f"15 domande, sample:              {ms_sample:9.3f} ms/sessione")
+    print(f"15 domande, sample senza ripetizioni ({len(seen)} già viste): {ms_seen:.3f} ms/sessione")
+
+
+if __name__ == "__main__":
+    main()
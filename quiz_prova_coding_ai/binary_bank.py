@@ -0,0 +1,181 @@
+"""
+Banca domande precompilata in formato binario, letta con mmap.
+
+Un file .qbank si ottiene da un file JSON, JSON Lines o CSV con
+compile_questions (o da riga di comando, vedi in fondo). Aprirlo legge solo
+l'intestazione: ogni Domanda viene decodificata quando viene richiesta,
+quindi l'avvio e l'estrazione delle domande di una sessione non dipendono
+dalla dimensione della banca.
+
+Formato (little endian):
+- intestazione: MAGIC, numero di domande, offset della tabella, hash del contenuto
+- testi: per ogni domanda testo e 4 opzioni (A–D) in UTF-8, uno dopo l'altro
+- tabella a larghezza fissa, un record per domanda: offset del testo,
+  lunghezze di testo e opzioni, indice della risposta corretta
+
+:author: frixx & ai
+:created: 2026-10-18
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from typing import Iterator, List, Optional, Sequence, Union, overload
+
+from models import LETTERE, Domanda
+
+MAGIC = b"QBANK001"
+#: magic, numero di domande, offset della tabella, hash (blake2b a 16 byte)
+INTESTAZIONE = struct.Struct("<8sIQ16s")
+#: offset del testo, lunghezze di testo e opzioni A–D, corretta (0–3), riempimento a 32 byte
+RECORD = struct.Struct("<Q5IB3x")
+ESTENSIONE = ".qbank"
+
+
+def compile_questions(source: str, dest: str, report=None, workers: int = 1) -> int:
+    """
+    Compila un file di domande (.json, .jsonl, .csv) nel formato binario.
+
+    Le domande sono lette in streaming e validate come in data_loader; il
+    file di destinazione viene sostituito solo a scrittura completata.
+
+    :param source: file delle domande
+    :param dest: file .qbank da scrivere
+    :param report: LoadReport opzionale con le domande scartate
+    :param workers: processi per la validazione (vedi data_loader.iter_questions)
+    :return: numero di domande compilate
+    :raises ValueError: se il file è malformato o senza domande valide
+    """
+    from data_loader import iter_questions  # data_loader apre i .qbank con questo modulo
+
+    cartella = os.path.dirname(os.path.abspath(dest))
+    fd, temporaneo = tempfile.mkstemp(dir=cartella, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            digest = hashlib.blake2b(digest_size=16)
+            tabella = bytearray()
+            posizione = INTESTAZIONE.size
+            f.write(b"\0" * INTESTAZIONE.size)  # Riscritta alla fine
+            for domanda in iter_questions(source, report, workers):
+                parti = [domanda.testo.encode("utf-8")]
+                parti.extend(domanda.opzioni[lettera].encode("utf-8") for lettera in LETTERE)
+                tabella += RECORD.pack(posizione, *map(len, parti), LETTERE.index(domanda.corretta))
+                blocco = b"".join(parti)
+                f.write(blocco)
+                digest.update(blocco)
+                posizione += len(blocco)
+            n = len(tabella) // RECORD.size
+            if not n:
+                raise ValueError("Nessuna domanda valida trovata nel file.")
+            f.write(tabella)
+            digest.update(tabella)
+            f.seek(0)
+            f.write(INTESTAZIONE.pack(MAGIC, n, posizione, digest.digest()))
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp crea il file con permessi 0600: si usano quelli di un file nuovo
+        os.chmod(temporaneo, 0o666 & ~_umask())
+        os.replace(temporaneo, dest)
+    except BaseException:
+        os.unlink(temporaneo)
+        raise
+    return n
+
+
+def _umask() -> int:
+    """Umask corrente (si legge solo impostandola, poi la si ripristina)"""
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+class BinaryBank(Sequence[Domanda]):
+    """
+    Sequenza di domande di un file .qbank mappato in memoria.
+
+    Solo l'intestazione viene letta all'apertura; ``bank[i]`` decodifica la
+    sola domanda i (un record della tabella e i suoi testi).
+
+    :param path: file .qbank
+    :raises ValueError: se il file non è una banca domande compilata
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            try:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # File vuoto
+                raise ValueError(f"{path} non è una banca domande compilata")
+        try:
+            magic, self._n, self._tabella, digest = INTESTAZIONE.unpack_from(self._mm, 0)
+        except struct.error:
+            magic = None
+        if magic != MAGIC or self._tabella + self._n * RECORD.size > len(self._mm):
+            self._mm.close()
+            raise ValueError(f"{path} non è una banca domande compilata")
+        self.path = path
+        #: Hash del contenuto scritto dal compilatore (non serve rileggere il file)
+        self.content_hash = digest.hex()
+
+    def close(self):
+        self._mm.close()
+
+    def __len__(self) -> int:
+        return self._n
+
+    @overload
+    def __getitem__(self, i: int) -> Domanda: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> List[Domanda]: ...
+
+    def __getitem__(self, i: Union[int, slice]):
+        if isinstance(i, slice):
+            return [self._domanda(j) for j in range(*i.indices(self._n))]
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError("indice della domanda fuori intervallo")
+        return self._domanda(i)
+
+    def __iter__(self) -> Iterator[Domanda]:
+        for i in range(self._n):
+            yield self._domanda(i)
+
+    def _domanda(self, i: int) -> Domanda:
+        posizione, *lunghezze, corretta = RECORD.unpack_from(self._mm, self._tabella + i * RECORD.size)
+        testi = []
+        for lunghezza in lunghezze:
+            testi.append(self._mm[posizione:posizione + lunghezza].decode("utf-8"))
+            posizione += lunghezza
+        return Domanda(testo=testi[0], opzioni=testi[1:], corretta=LETTERE[corretta])
+
+
+def read_content_hash(path: str) -> Optional[str]:
+    """Hash del contenuto letto dall'intestazione, None se il file non è valido"""
+    with open(path, "rb") as f:
+        try:
+            magic, _, _, digest = INTESTAZIONE.unpack(f.read(INTESTAZIONE.size))
+        except struct.error:
+            return None
+    return digest.hex() if magic == MAGIC else None
+
+
+if __name__ == "__main__":
+    # Uso: python binary_bank.py questions.json questions.qbank
+    if len(sys.argv) != 3:
+        print("Uso: python binary_bank.py <domande.json|.jsonl|.csv> <domande.qbank>")
+        sys.exit(1)
+    from data_loader import LoadReport
+    esito = LoadReport()
+    try:
+        n = compile_questions(sys.argv[1], sys.argv[2], esito)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"✅ Compilate {n} domande in {sys.argv[2]} ({esito.rejected} scartate)")
+    for scarto in esito.rejections[:20]:
+        print(f"   riga {scarto.line}: {scarto.reason}")
@@ -13,7 +13,8 @@ Questo modulo viene importato da:
 :created: 2025-06-12
 """
 
-from typing import Dict, Tuple
+import os
+from typing import Dict, Optional, Tuple
 
 #: Dizionario che associa ciascun livello di difficoltà a una coppia di parametri.
 #:
@@ -37,3 +38,15 @@ DIFFICULTY_SETTINGS: Dict[int, Tuple[int, int]] = {
 #: Livello di difficoltà predefinito (medio), usato in caso di input errato
 #: o dopo un numero massimo di tentativi falliti nella selezione della difficoltà.
 DEFAULT_DIFFICULTY: int = 2
+
+#: Seme per l'estrazione delle domande (variabile d'ambiente QUIZ_SEED).
+#: Se impostato ogni partita propone le stesse domande, ad esempio per
+#: ripetere un esame; se assente l'estrazione è casuale e non ripropone
+#: le domande già viste dal giocatore.
+SAMPLING_SEED: Optional[int] = int(os.environ["QUIZ_SEED"]) if os.environ.get("QUIZ_SEED") else None
+
+#: Percorso del file con la banca domande usata da entrambe le interfacce.
+#: Con la variabile d'ambiente QUIZ_QUESTIONS si può indicare un altro file,
+#: ad esempio una banca precompilata .qbank (vedi binary_bank.py).
+QUESTIONS_PATH: str = (os.environ.get("QUIZ_QUESTIONS")
+                       or os.path.join(os.path.dirname(os.path.abspath(__file__)), "questions.json"))
@@ -1,15 +1,28 @@
 """
 Modulo per il caricamento e la validazione delle domande del quiz.
 
-Supporta due formati di input:
+Supporta tre formati di input:
 - JSON: array di oggetti con campi "domanda", "opzioni", "corretta"
+- JSON Lines (.jsonl): un oggetto come sopra per riga
 - CSV: file con intestazioni "domanda", "A", "B", "C", "D", "corretta"
 
+e le banche precompilate (.qbank, vedi binary_bank.py), già validate:
+open_questions le apre con mmap senza leggerle.
+
 Una domanda valida deve avere:
 - un testo non vuoto
-- esattamente 4 opzioni (A, B, C, D)
+- esattamente 4 opzioni (A, B, C, D), con testo di tipo stringa
 - una risposta corretta che sia una delle lettere "A", "B", "C" o "D"
 
+Il caricamento è in streaming: iter_questions legge il file a blocchi e
+restituisce le domande valide man mano, quindi la memoria usata non
+dipende dalla dimensione del file. Le domande scartate finiscono in un
+LoadReport con riga e motivo. Con ``workers`` > 1 i file JSON Lines sono
+decodificati e validati in più processi, che ricevono i byte grezzi dei
+blocchi. JSON e CSV restano nel processo corrente: il loro parsing va fatto
+in sequenza, e ai processi resterebbe solo la validazione, che costa meno
+del passaggio dei dati.
+
 :author: Tuo Nome
 :created: 2025-06-12
 """
@@ -17,56 +30,69 @@ Una domanda valida deve avere:
 import json
 import csv
 import os
-from typing import List, Dict
-from models import Domanda
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Deque, Iterable, Iterator, List, NamedTuple, Optional, Sequence, TextIO, Tuple
+from binary_bank import ESTENSIONE as ESTENSIONE_BINARIA, BinaryBank
+from models import LETTERE, Domanda
+
+_CHIAVI = frozenset(LETTERE)
+_DECODER = json.JSONDecoder()
+
+#: Righe (o oggetti) per blocco di validazione.
+CHUNK_SIZE = 5000
+
+#: Caratteri letti per volta dai file JSON.
+READ_SIZE = 1 << 20
+
+#: Lunghezza massima (in caratteri) di una singola domanda in un file JSON.
+MAX_ELEMENT_SIZE = 64 << 20
+
+#: Domanda validata, pronta per Domanda: (testo, opzioni A–D, corretta).
+DomandaValida = Tuple[str, Tuple[str, str, str, str], str]
+
+
+class Rejection(NamedTuple):
+    """Domanda scartata: riga del file in cui inizia e motivo."""
+    line: int
+    reason: str
 
 
-def load_questions(path: str) -> List[Domanda]:
+@dataclass
+class LoadReport:
     """
-    Carica le domande da un file (JSON o CSV) e restituisce una lista di oggetti Domanda validi.
+    Esito di un caricamento.
 
-    :param path: percorso al file delle domande. Estensioni supportate: .json, .csv
+    :param accepted: domande valide
+    :param rejected: domande scartate in totale
+    :param rejections: dettaglio (riga, motivo) delle prime ``max_rejections``
+    :param max_rejections: limite del dettaglio, per non crescere senza fine
+    """
+    accepted: int = 0
+    rejected: int = 0
+    rejections: List[Rejection] = field(default_factory=list)
+    max_rejections: int = 10_000
+
+    def add_rejections(self, rejections: Iterable[Rejection]):
+        for rejection in rejections:
+            self.rejected += 1
+            if len(self.rejections) < self.max_rejections:
+                self.rejections.append(rejection)
+
+
+def load_questions(path: str, report: Optional[LoadReport] = None, workers: int = 1) -> List[Domanda]:
+    """
+    Carica le domande da un file (JSON, JSON Lines o CSV) e restituisce una lista di oggetti Domanda validi.
+
+    :param path: percorso al file delle domande. Estensioni supportate: .json, .jsonl, .csv, .qbank
+    :param report: se indicato, raccoglie il numero di domande valide e le righe scartate con il motivo
+    :param workers: processi per parsing e validazione (1 = nel processo corrente)
     :return: lista di Domanda validate
     :raises ValueError: se il file è mancante, malformato o se nessuna domanda è valida
     """
-    _, ext = os.path.splitext(path)  # Estrae l'estensione del file (.json o .csv)
-    raw_questions = []  # Lista temporanea per le domande grezze da validare
-
-    # -- Caso 1: file JSON
-    if ext.lower() == ".json":
-        try:
-            with open(path, encoding="utf-8") as f:
-                raw_questions = json.load(f)  # Carica un array di dizionari
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Errore nel parsing del file JSON: {e}")
-
-    # -- Caso 2: file CSV
-    elif ext.lower() == ".csv":
-        with open(path, newline='', encoding="utf-8") as f:
-            reader = csv.DictReader(f)  # Usa le intestazioni della prima riga
-            for row in reader:
-                # Crea un dizionario in formato compatibile con Domanda
-                opzioni = {key: row[key].strip() for key in ("A", "B", "C", "D") if key in row}
-                raw_questions.append({
-                    "domanda": row.get("domanda", "").strip(),
-                    "opzioni": opzioni,
-                    "corretta": row.get("corretta", "").strip().upper()
-                })
-
-    # -- Caso 3: formato non supportato
-    else:
-        raise ValueError("Formato file non supportato. Utilizzare .json o .csv")
-
-    # -- Validazione delle domande
-    domande_valide = []  # Lista finale di oggetti Domanda
-    for raw in raw_questions:
-        if validate_question(raw):
-            domanda = Domanda(
-                testo=raw["domanda"],
-                opzioni=raw["opzioni"],
-                corretta=raw["corretta"]
-            )
-            domande_valide.append(domanda)
+    domande_valide = list(iter_questions(path, report, workers))
 
     # -- Controllo finale: almeno una domanda valida deve essere presente
     if not domande_valide:
@@ -75,6 +101,71 @@ def load_questions(path: str) -> List[Domanda]:
     return domande_valide
 
 
+def open_questions(path: str, report: Optional[LoadReport] = None, workers: int = 1) -> Sequence[Domanda]:
+    """
+    Apre le domande di un file per l'accesso casuale.
+
+    Una banca precompilata (.qbank) viene mappata in memoria e ogni Domanda
+    è letta solo quando richiesta; gli altri formati sono caricati per intero.
+
+    :param path: percorso al file delle domande. Estensioni supportate: .json, .jsonl, .csv, .qbank
+    :param report: come in load_questions (non usato per i .qbank, già validati)
+    :param workers: come in load_questions
+    :return: sequenza di Domanda
+    :raises ValueError: se il file è malformato o se nessuna domanda è valida
+    """
+    if os.path.splitext(path)[1].lower() == ESTENSIONE_BINARIA:
+        banca = BinaryBank(path)
+        if report is not None:
+            report.accepted += len(banca)
+        return banca
+    return load_questions(path, report, workers)
+
+
+def iter_questions(path: str, report: Optional[LoadReport] = None, workers: int = 1,
+                   chunk_size: int = CHUNK_SIZE) -> Iterator[Domanda]:
+    """
+    Restituisce le domande valide del file man mano che vengono lette.
+
+    I blocchi sono validati nell'ordine del file anche con più processi, e
+    al massimo ``2 * workers`` blocchi sono in lavorazione insieme. Solo i
+    .jsonl usano più processi; .json e .csv sono letti nel processo corrente.
+
+    :param path: percorso al file delle domande. Estensioni supportate: .json, .jsonl, .csv
+    :param report: se indicato, raccoglie domande valide e scartate
+    :param workers: processi per parsing e validazione dei .jsonl (1 = nel processo corrente)
+    :param chunk_size: righe o oggetti per blocco
+    :raises ValueError: se il formato non è supportato o il file è malformato
+    """
+    _, ext = os.path.splitext(path)  # Estrae l'estensione del file
+    ext = ext.lower()
+    if ext == ESTENSIONE_BINARIA:
+        banca = BinaryBank(path)
+        try:
+            for domanda in banca:
+                if report is not None:
+                    report.accepted += 1
+                yield domanda
+        finally:
+            banca.close()
+        return
+    if ext == ".json":
+        lavoro, blocchi, workers = _valida_blocco, _blocchi_json(path, chunk_size), 1
+    elif ext == ".jsonl":
+        lavoro, blocchi = _valida_righe_jsonl, _blocchi_jsonl(path, chunk_size)
+    elif ext == ".csv":
+        lavoro, blocchi, workers = _valida_blocco, _blocchi_csv(path, chunk_size), 1
+    else:
+        raise ValueError("Formato file non supportato. Utilizzare .json, .jsonl, .csv o .qbank")
+
+    report = report if report is not None else LoadReport()
+    for valide, scartate in _elabora(lavoro, blocchi, workers):
+        report.accepted += len(valide)
+        report.add_rejections(scartate)
+        for testo, opzioni, corretta in valide:
+            yield Domanda(testo=testo, opzioni=opzioni, corretta=corretta)
+
+
 def validate_question(raw: dict) -> bool:
     """
     Verifica che una struttura di domanda sia completa e corretta.
@@ -82,24 +173,219 @@ def validate_question(raw: dict) -> bool:
     :param raw: dizionario con i campi "domanda", "opzioni", "corretta"
     :return: True se la struttura è valida, False altrimenti
     """
+    return question_error(raw) is None
+
+
+def question_error(raw: Any) -> Optional[str]:
+    """
+    Motivo per cui una struttura di domanda non è valida.
+
+    :param raw: dizionario con i campi "domanda", "opzioni", "corretta"
+    :return: descrizione del problema, None se la domanda è valida
+    """
     # Il dizionario deve esistere
     if not isinstance(raw, dict):
-        return False
+        return "la domanda non è un oggetto"
 
     # Il campo "domanda" deve essere una stringa non vuota
     if not raw.get("domanda") or not isinstance(raw.get("domanda"), str):
-        return False
+        return "testo della domanda mancante"
 
     # Il campo "opzioni" deve essere un dizionario con esattamente 4 chiavi (A, B, C, D)
     opzioni = raw.get("opzioni")
     if not isinstance(opzioni, dict) or len(opzioni) != 4:
-        return False
-    if not all(k in opzioni for k in ("A", "B", "C", "D")):
-        return False
+        return "servono esattamente 4 opzioni"
+    if opzioni.keys() != _CHIAVI:
+        return "le opzioni devono essere A, B, C e D"
+    if not all(isinstance(testo, str) for testo in opzioni.values()):
+        return "il testo delle opzioni deve essere una stringa"
 
     # La risposta "corretta" deve essere una tra "A", "B", "C", "D"
     corretta = raw.get("corretta")
-    if corretta not in ("A", "B", "C", "D"):
-        return False
+    if corretta not in LETTERE:
+        return f"risposta corretta non valida: {corretta!r}"
+
+    return None
+
+
+# --- Lettura a blocchi ------------------------------------------------------
+# Ogni blocco è una tupla di argomenti per la funzione di validazione, che
+# restituisce (domande valide, scartate) e può girare in un altro processo.
+
+Risultato = Tuple[List[DomandaValida], List[Rejection]]
+
+
+def _valida_blocco(elementi: List[Tuple[int, Any]]) -> Risultato:
+    """Valida una lista di (riga, domanda grezza)"""
+    valide, scartate = [], []
+    for riga, raw in elementi:
+        errore = question_error(raw)
+        if errore is None:
+            opzioni = raw["opzioni"]
+            valide.append((raw["domanda"], (opzioni["A"], opzioni["B"], opzioni["C"], opzioni["D"]),
+                           raw["corretta"]))
+        else:
+            scartate.append(Rejection(riga, errore))
+    return valide, scartate
+
+
+def _valida_righe_jsonl(prima_riga: int, dati: bytes) -> Risultato:
+    """Decodifica e valida un blocco di righe JSON Lines"""
+    elementi, scartate = [], []
+    # raw_decode direttamente: json.loads per riga costa il triplo
+    decodifica = _DECODER.raw_decode
+    for riga, testo in enumerate(dati.split(b"\n"), prima_riga):
+        testo = testo.strip()
+        if not testo:
+            continue
+        try:
+            testo = testo.decode("utf-8")
+            raw, fine = decodifica(testo)
+            if fine != len(testo):
+                raise ValueError("contenuto dopo la domanda")
+            elementi.append((riga, raw))
+        except ValueError as e:
+            scartate.append(Rejection(riga, f"JSON non valido: {e}"))
+    valide, non_valide = _valida_blocco(elementi)
+    scartate.extend(non_valide)
+    scartate.sort()
+    return valide, scartate
+
+
+def _blocchi_jsonl(path: str, chunk_size: int) -> Iterator[Tuple[int, bytes]]:
+    """Blocchi di righe intere ancora da decodificare: (prima riga, byte)"""
+    with open(path, "rb") as f:
+        riga = 1
+        while True:
+            righe = f.readlines(chunk_size * 256)  # circa 256 byte per domanda
+            if not righe:
+                break
+            # Un solo oggetto bytes: si passa a un altro processo senza copie per riga
+            yield riga, b"".join(righe)
+            riga += len(righe)
+
+
+def _blocchi_csv(path: str, chunk_size: int) -> Iterator[Tuple[List[Tuple[int, dict]]]]:
+    with open(path, newline='', encoding="utf-8") as f:
+        reader = csv.DictReader(f)  # Usa le intestazioni della prima riga
+        blocco: List[Tuple[int, dict]] = []
+        reader.fieldnames  # Legge l'intestazione, per numerare le righe da quella successiva
+        riga = reader.line_num + 1
+        for row in reader:
+            # Crea un dizionario in formato compatibile con Domanda
+            opzioni = {key: row[key].strip() for key in LETTERE if row.get(key) is not None}
+            blocco.append((riga, {
+                "domanda": (row.get("domanda") or "").strip(),
+                "opzioni": opzioni,
+                "corretta": (row.get("corretta") or "").strip().upper()
+            }))
+            riga = reader.line_num + 1
+            if len(blocco) >= chunk_size:
+                yield (blocco,)
+                blocco = []
+        if blocco:
+            yield (blocco,)
+
+
+_SPAZI = re.compile(r"[ \t\n\r]*")
+# Caratteri con cui un numero JSON può proseguire nel blocco successivo
+_SEGUITO_NUMERO = re.compile(r"[0-9.eE+-]*")
+
+
+def _blocchi_json(path: str, chunk_size: int) -> Iterator[Tuple[List[Tuple[int, Any]]]]:
+    blocco: List[Tuple[int, Any]] = []
+    with open(path, encoding="utf-8") as f:
+        for elemento in _iter_json_array(f):
+            blocco.append(elemento)
+            if len(blocco) >= chunk_size:
+                yield (blocco,)
+                blocco = []
+    if blocco:
+        yield (blocco,)
+
+
+def _iter_json_array(f: TextIO, read_size: int = READ_SIZE) -> Iterator[Tuple[int, Any]]:
+    """
+    Elementi (riga, valore) di un array JSON letto a blocchi.
+
+    In memoria restano solo il blocco corrente e l'elemento in lettura:
+    ogni elemento è decodificato con raw_decode appena è completo.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+    riga, contati = 1, 0  # righe prima di buffer[contati]
+
+    def leggi() -> bool:
+        """Aggiunge un blocco al buffer, scartando la parte già letta"""
+        nonlocal buffer, pos, eof, riga, contati
+        if eof:
+            return False
+        riga += buffer.count("\n", contati, pos)
+        nuovo = f.read(read_size)
+        eof = not nuovo
+        buffer, pos, contati = buffer[pos:] + nuovo, 0, 0
+        return not eof
+
+    def salta_spazi() -> str:
+        """Primo carattere significativo da ``pos`` ("" a fine file)"""
+        nonlocal pos
+        while True:
+            pos = _SPAZI.match(buffer, pos).end()
+            if pos < len(buffer) or not leggi():
+                return buffer[pos:pos + 1]
+
+    def errore(messaggio: str) -> ValueError:
+        return ValueError(f"Errore nel parsing del file JSON (riga {riga + buffer.count(chr(10), contati, pos)}): "
+                          f"{messaggio}")
+
+    if salta_spazi() != "[":
+        raise errore("atteso un array di domande")
+    pos += 1
+    if salta_spazi() == "]":
+        return
+    while True:
+        riga += buffer.count("\n", contati, pos)
+        contati = pos
+        while True:
+            try:
+                valore, fine = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                # Elemento incompleto: si legge ancora, ma senza caricare tutto il file
+                if len(buffer) - pos < MAX_ELEMENT_SIZE and leggi():
+                    continue
+                raise errore(e.msg)
+            # Un numero seguito solo da cifre, ".", "e", segni fino a fine buffer
+            # può continuare nel blocco successivo ("1500" + ".0", "1e" + "3"):
+            # raw_decode ne ha letto solo la prima parte, si rilegge e ridecodifica
+            if (type(valore) in (int, float) and _SEGUITO_NUMERO.fullmatch(buffer, fine)
+                    and leggi()):
+                continue
+            break
+        yield riga, valore
+        pos = fine
+        separatore = salta_spazi()
+        pos += 1
+        if separatore == "]":
+            break
+        if separatore != ",":
+            raise errore("attesi ',' o ']' dopo una domanda")
+        salta_spazi()
+    if salta_spazi():
+        raise errore("contenuto dopo la fine dell'array")
+
 
-    return True
+def _elabora(lavoro, blocchi: Iterable[tuple], workers: int) -> Iterator[Risultato]:
+    """Applica ``lavoro`` ai blocchi, in ordine, eventualmente in più processi"""
+    if workers <= 1:
+        for blocco in blocchi:
+            yield lavoro(*blocco)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_corso: Deque[Future] = deque()
+        for blocco in blocchi:
+            in_corso.append(executor.submit(lavoro, *blocco))
+            # Al massimo 2 blocchi per processo in attesa: memoria limitata
+            if len(in_corso) >= 2 * workers:
+                yield in_corso.popleft().result()
+        while in_corso:
+            yield in_corso.popleft().result()
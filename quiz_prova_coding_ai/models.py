@@ -13,22 +13,106 @@ Utilizzato da:
 :created: 2025-06-12
 """
 
-from typing import List, Dict, Optional, Tuple
+import sys
+from collections.abc import Mapping as MappingABC
+from typing import Iterator, List, Dict, Mapping, Optional, Sequence, Tuple, Union
 from dataclasses import dataclass, field
 
+#: Lettere delle opzioni, nell'ordine in cui sono memorizzate.
+LETTERE: Tuple[str, str, str, str] = ("A", "B", "C", "D")
+_INDICI: Dict[str, int] = {lettera: i for i, lettera in enumerate(LETTERE)}
+
+
+class Opzioni(MappingABC):
+    """
+    Vista in sola lettura delle opzioni di una Domanda come mappa lettera → testo.
+
+    Non copia nulla: legge dalla tupla della domanda.
+    """
+    __slots__ = ("_valori",)
+
+    def __init__(self, valori: Tuple[str, str, str, str]):
+        self._valori = valori
+
+    def __getitem__(self, lettera: str) -> str:
+        i = _INDICI.get(lettera)
+        if i is None:
+            raise KeyError(lettera)
+        return self._valori[i]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(LETTERE)
+
+    def __len__(self) -> int:
+        return 4
+
+    def __repr__(self) -> str:
+        return repr(dict(zip(LETTERE, self._valori)))
+
 
-@dataclass
 class Domanda:
     """
     Rappresenta una singola domanda del quiz.
 
+    Le domande sono immutabili: la stessa istanza è condivisa da tutte le
+    sessioni che usano la banca domande (vedi question_bank.py).
+
+    La rappresentazione è compatta, per tenere in memoria banche molto
+    grandi: __slots__ al posto del dizionario per istanza, le opzioni in
+    una tupla in ordine A–D (invece di un dict per domanda) e la risposta
+    corretta come indice 0–3, un intero piccolo condiviso da tutte le
+    istanze. Le opzioni sono internate: quelle ripetute (es. "Vero", "Falso",
+    "Nessuna delle precedenti") occupano memoria una volta sola. Il testo,
+    quasi sempre diverso per ogni domanda, non lo è: internarlo aggiungerebbe
+    solo una voce nella tabella delle stringhe internate.
+    ``opzioni`` e ``corretta`` restano accessibili come mappa e come lettera.
+
     :param testo: testo della domanda
-    :param opzioni: dizionario delle opzioni (es. {"A": "...", "B": "...", ...})
+    :param opzioni: mappa delle opzioni (es. {"A": "...", "B": "...", ...})
+        oppure sequenza dei 4 testi in ordine A–D
     :param corretta: chiave della risposta corretta (es. "C")
+    :raises ValueError: se le opzioni non sono 4 o ``corretta`` non è una di A–D
     """
-    testo: str
-    opzioni: Dict[str, str]
-    corretta: str
+    __slots__ = ("_testo", "_opzioni", "_corretta")
+
+    def __init__(self, testo: str, opzioni: Union[Mapping[str, str], Sequence[str]], corretta: str):
+        try:
+            if isinstance(opzioni, MappingABC):
+                a, b, c, d = opzioni["A"], opzioni["B"], opzioni["C"], opzioni["D"]
+            else:
+                a, b, c, d = opzioni
+        except (KeyError, ValueError):
+            raise ValueError("Una domanda ha esattamente 4 opzioni (A, B, C, D)") from None
+        intern = sys.intern
+        self._testo = testo
+        self._opzioni = (intern(a) if type(a) is str else a, intern(b) if type(b) is str else b,
+                         intern(c) if type(c) is str else c, intern(d) if type(d) is str else d)
+        self._corretta = _INDICI.get(corretta)
+        if self._corretta is None:
+            raise ValueError(f"Risposta corretta non valida: {corretta!r}")
+
+    @property
+    def testo(self) -> str:
+        return self._testo
+
+    @property
+    def opzioni(self) -> Opzioni:
+        return Opzioni(self._opzioni)
+
+    @property
+    def corretta(self) -> str:
+        return LETTERE[self._corretta]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Domanda):
+            return NotImplemented
+        return (self._testo, self._opzioni, self._corretta) == (other._testo, other._opzioni, other._corretta)
+
+    def __hash__(self) -> int:
+        return hash((self._testo, self._opzioni, self._corretta))
+
+    def __repr__(self) -> str:
+        return f"Domanda(testo={self._testo!r}, opzioni={self.opzioni!r}, corretta={self.corretta!r})"
 
 
 @dataclass
@@ -0,0 +1,200 @@
+"""
+Banca domande condivisa tra le sessioni del quiz.
+
+Il file delle domande viene letto e validato una sola volta: le domande
+già convertite in oggetti Domanda restano in una cache di processo,
+indicizzata per percorso e firma del file (mtime e dimensione, poi hash
+del contenuto). Finché il file non cambia, ogni nuova partita riceve la
+stessa QuestionBank senza rileggere nulla.
+
+La QuestionBank è una vista immutabile (tupla di Domanda immutabili):
+le sessioni possono condividerla senza copiarla, e ciascuna estrae le sue
+domande con sample() in O(k) invece di mescolare l'intera banca.
+
+Utilizzato da:
+- quiz_gui.py → a ogni nuova partita
+- quiz_streamlit.py → tramite la cache di risorse di Streamlit
+
+:author: frixx & ai
+:created: 2026-10-18
+"""
+
+import hashlib
+import os
+import random
+import threading
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union, overload
+
+from binary_bank import ESTENSIONE as ESTENSIONE_BINARIA, BinaryBank, read_content_hash
+from data_loader import open_questions
+from models import Domanda
+
+#: Firma rapida di un file: (mtime in nanosecondi, dimensione in byte).
+Firma = Tuple[int, int]
+
+
+def file_signature(path: str) -> Firma:
+    """
+    Restituisce la firma rapida del file (solo un stat, nessuna lettura).
+
+    :param path: percorso del file
+    :return: coppia (mtime_ns, dimensione)
+    """
+    info = os.stat(path)
+    return info.st_mtime_ns, info.st_size
+
+
+def _content_hash(path: str) -> str:
+    """Hash del contenuto del file, per riconoscere i file toccati ma non cambiati."""
+    if os.path.splitext(path)[1].lower() == ESTENSIONE_BINARIA:
+        # Scritto dal compilatore nell'intestazione: non serve leggere la banca
+        return read_content_hash(path) or ""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for blocco in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(blocco)
+    return digest.hexdigest()
+
+
+class QuestionBank(Sequence[Domanda]):
+    """
+    Insieme immutabile delle domande valide di un file.
+
+    Una banca precompilata (BinaryBank) non viene copiata: le domande
+    restano nel file mappato in memoria e sono lette solo quando estratte.
+
+    :param domande: domande già validate
+    :param path: file di provenienza
+    :param content_hash: hash del contenuto del file letto
+    """
+
+    __slots__ = ("_domande", "path", "content_hash")
+
+    def __init__(self, domande: Sequence[Domanda], path: str = "", content_hash: str = ""):
+        self._domande: Sequence[Domanda] = domande if isinstance(domande, BinaryBank) else tuple(domande)
+        self.path = path
+        self.content_hash = content_hash
+
+    @classmethod
+    def from_file(cls, path: str) -> "QuestionBank":
+        """
+        Legge e valida il file, senza passare dalla cache.
+        Un file .qbank viene solo aperto (mmap).
+
+        :raises ValueError: come load_questions
+        """
+        domande = open_questions(path)
+        if isinstance(domande, BinaryBank):
+            return cls(domande, path, domande.content_hash)
+        return cls(domande, path, _content_hash(path))
+
+    def __len__(self) -> int:
+        return len(self._domande)
+
+    @overload
+    def __getitem__(self, i: int) -> Domanda: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> Sequence[Domanda]: ...
+
+    def __getitem__(self, i: Union[int, slice]):
+        return self._domande[i]
+
+    def __iter__(self) -> Iterator[Domanda]:
+        return iter(self._domande)
+
+    def sample_indices(self, k: int, seed: Optional[int] = None,
+                       exclude: Optional[Set[int]] = None) -> List[int]:
+        """
+        Estrae k indici distinti in ordine casuale, in O(k).
+
+        Gli indici sono estratti a caso e scartati se già presi o esclusi:
+        finché gli esclusi sono meno della metà della banca servono in media
+        meno di 2k estrazioni. Oltre, si estrae da un array compatto degli
+        indici ancora disponibili.
+
+        :param k: numero di domande (ridotto a quelle disponibili)
+        :param seed: seme per rendere l'estrazione riproducibile
+        :param exclude: indici da non estrarre (es. domande già viste)
+        :return: lista di indici nella banca
+        """
+        rng = random.Random(seed) if seed is not None else random
+        n = len(self._domande)
+        exclude = exclude or set()
+        k = max(0, min(k, n - len(exclude)))
+        if 2 * len(exclude) > n:
+            disponibili = array("I", (i for i in range(n) if i not in exclude))
+            return rng.sample(disponibili, k)
+        scelti: List[int] = []
+        presi: Set[int] = set()
+        while len(scelti) < k:
+            i = rng.randrange(n)
+            if i not in presi and i not in exclude:
+                presi.add(i)
+                scelti.append(i)
+        return scelti
+
+    def sample(self, k: int, seed: Optional[int] = None,
+               seen: Optional[Set[int]] = None) -> List[Domanda]:
+        """
+        Estrae k domande distinte per una sessione, in O(k).
+
+        Con ``seen`` non ripropone le domande già viste dal giocatore e vi
+        aggiunge quelle estratte; quando non ne restano abbastanza di nuove
+        l'insieme viene svuotato e si ricomincia da tutta la banca.
+        Con lo stesso ``seed`` (e gli stessi ``seen``) l'estrazione si ripete
+        identica, ad esempio per ripetere un esame.
+
+        :param k: numero di domande
+        :param seed: seme opzionale per un'estrazione riproducibile
+        :param seen: indici delle domande già viste, aggiornato sul posto
+        :return: lista di k domande (meno se la banca è più piccola)
+        """
+        if seen is not None and len(self._domande) - len(seen) < k:
+            seen.clear()
+        indici = self.sample_indices(k, seed, seen)
+        if seen is not None:
+            seen.update(indici)
+        return [self._domande[i] for i in indici]
+
+    def __repr__(self) -> str:
+        return f"QuestionBank({len(self)} domande da {self.path!r})"
+
+
+# percorso assoluto -> (firma, banca)
+_cache: Dict[str, Tuple[Firma, QuestionBank]] = {}
+_lock = threading.Lock()
+
+
+def load_bank(path: str) -> QuestionBank:
+    """
+    Restituisce la banca domande del file, dalla cache se il file non è cambiato.
+
+    Se mtime o dimensione sono cambiati si confronta l'hash del contenuto:
+    un file solo "toccato" non viene rivalidato.
+
+    :param path: percorso al file delle domande (.json o .csv)
+    :return: QuestionBank condivisa
+    :raises ValueError: se il file è malformato o senza domande valide
+    """
+    chiave = os.path.abspath(path)
+    with _lock:  # Streamlit serve le sessioni da thread diversi
+        firma = file_signature(chiave)
+        in_cache = _cache.get(chiave)
+        if in_cache is not None:
+            firma_cache, banca = in_cache
+            if firma_cache == firma:
+                return banca
+            if _content_hash(chiave) == banca.content_hash:
+                _cache[chiave] = (firma, banca)
+                return banca
+        banca = QuestionBank.from_file(chiave)
+        _cache[chiave] = (firma, banca)
+        return banca
+
+
+def clear_cache():
+    """Svuota la cache delle banche domande."""
+    with _lock:
+        _cache.clear()
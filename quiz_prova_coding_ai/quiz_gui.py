@@ -17,13 +17,11 @@ Implementa le tre schermate principali con le seguenti caratteristiche:
 import tkinter as tk
 from tkinter import ttk, messagebox
 import json
-import os
-import random
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Set
 
 from models import Domanda, QuizSession
-from config import DIFFICULTY_SETTINGS
-from data_loader import load_questions
+from config import DIFFICULTY_SETTINGS, QUESTIONS_PATH, SAMPLING_SEED
+from question_bank import QuestionBank, load_bank
 from score_calculator import calculate_score
 
 # Costanti per i colori e lo stile
@@ -51,6 +49,9 @@ class QuizApp:
         self.current_question: Optional[Domanda] = None
         self.timer_id = None
         self.time_left = 0
+        # Domande già viste in questa finestra (indici nella banca), per non riproporle
+        self.bank: Optional[QuestionBank] = None
+        self.seen: Set[int] = set()
         
         # Configura stili
         self.setup_styles()
@@ -136,14 +137,15 @@ class QuizApp:
         num_questions, timeout = DIFFICULTY_SETTINGS[difficulty]
         
         try:
-            # Carica le domande
-            base_dir = os.path.dirname(os.path.abspath(__file__))
-            file_path = os.path.join(base_dir, "questions.json")
-            questions = load_questions(file_path)
+            # Banca domande condivisa: il file viene riletto solo se è cambiato
+            bank = load_bank(QUESTIONS_PATH)
+            if bank is not self.bank:
+                # Gli indici delle domande viste valgono solo per la stessa banca
+                self.bank, self.seen = bank, set()
             
-            # Mescola e seleziona le domande
-            random.shuffle(questions)
-            selected_questions = questions[:num_questions]
+            # Estrae solo le domande della sessione, senza mescolare tutta la banca
+            selected_questions = bank.sample(
+                num_questions, SAMPLING_SEED, None if SAMPLING_SEED is not None else self.seen)
             
             # Inizializza la sessione
             self.session = QuizSession(
@@ -11,13 +11,11 @@ Implementa le tre schermate principali:
 
 import streamlit as st
 import json
-import os
-import random
 from datetime import datetime, timedelta
 
 from models import Domanda, QuizSession
-from config import DIFFICULTY_SETTINGS
-from data_loader import load_questions
+from config import DIFFICULTY_SETTINGS, QUESTIONS_PATH, SAMPLING_SEED
+from question_bank import QuestionBank, load_bank
 from process_answer import process_answer
 
 # Configurazione della pagina
@@ -50,6 +48,17 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
+def get_question_bank(path: str) -> QuestionBank:
+    """
+    Banca domande condivisa da tutte le sessioni del server Streamlit.
+
+    Usa la cache di load_bank, comune a tutto il processo: se il file cambia
+    la banca viene ricaricata (un file solo "toccato" no, grazie all'hash
+    del contenuto), altrimenti ogni partita riusa la stessa.
+    """
+    return load_bank(path)
+
+
 def initialize_session_state():
     """Inizializza o resetta lo stato della sessione."""
     if 'quiz_started' not in st.session_state:
@@ -71,20 +80,26 @@ def initialize_session_state():
         st.session_state.timeout = 0
     if 'start_time' not in st.session_state:
         st.session_state.start_time = None
+    if 'seen' not in st.session_state:
+        # Domande già viste dal giocatore: (hash della banca, indici)
+        st.session_state.seen = ("", set())
 
 def load_and_start_quiz(difficulty: int):
     """Carica le domande e avvia una nuova sessione quiz."""
     num_questions, timeout = DIFFICULTY_SETTINGS[difficulty]
     
     try:
-        # Carica le domande
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        file_path = os.path.join(base_dir, "questions.json")
-        all_questions = load_questions(file_path)
+        # Banca domande condivisa tra le sessioni (letta e validata una volta)
+        bank = get_question_bank(QUESTIONS_PATH)
+        seen_hash, seen = st.session_state.seen
+        if seen_hash != bank.content_hash:
+            # Gli indici delle domande viste valgono solo per la stessa banca
+            seen = set()
+            st.session_state.seen = (bank.content_hash, seen)
         
-        # Mescola e seleziona le domande
-        random.shuffle(all_questions)
-        selected_questions = all_questions[:num_questions]
+        # Estrae solo le domande della sessione, senza mescolare tutta la banca
+        selected_questions = bank.sample(
+            num_questions, SAMPLING_SEED, None if SAMPLING_SEED is not None else seen)
         
         # Inizializza la sessione
         st.session_state.quiz_started = True
@@ -0,0 +1,80 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+
+# Aggiunge la cartella del quiz al path (i moduli del quiz si importano senza package)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from binary_bank import BinaryBank, compile_questions
+from data_loader import LoadReport, load_questions, open_questions
+from question_bank import load_bank, clear_cache
+
+
+class TestBinaryBank(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.sorgente = os.path.join(self.tmp_dir.name, "domande.json")
+        self.compilato = os.path.join(self.tmp_dir.name, "domande.qbank")
+        domande = [{"domanda": f"Domanda {i} — perché?", "opzioni": {"A": "sì", "B": "no", "C": "forse", "D": "😀" * i},
+                    "corretta": "ABCD"[i % 4]} for i in range(50)]
+        domande.insert(3, {"domanda": "senza opzioni"})
+        with open(self.sorgente, "w", encoding="utf-8") as f:
+            json.dump(domande, f, ensure_ascii=False)
+
+    def tearDown(self):
+        clear_cache()
+        self.tmp_dir.cleanup()
+
+    def test_andata_e_ritorno(self):
+        report = LoadReport()
+        self.assertEqual(compile_questions(self.sorgente, self.compilato, report), 50)
+        self.assertEqual(report.rejected, 1)
+        banca = open_questions(self.compilato)
+        self.assertIsInstance(banca, BinaryBank)
+        originali = load_questions(self.sorgente)
+        self.assertEqual(len(banca), 50)
+        self.assertEqual(list(banca), originali)
+        self.assertEqual(banca[-1], originali[-1])
+        self.assertEqual(banca[10:12], originali[10:12])
+        with self.assertRaises(IndexError):
+            banca[50]
+        self.assertEqual(load_questions(self.compilato), originali)
+        banca.close()
+
+    def test_opzioni_non_stringa_e_permessi(self):
+        with open(self.sorgente, "w", encoding="utf-8") as f:
+            json.dump([{"domanda": "Quanto fa 6 * 7?", "opzioni": {"A": None, "B": 42, "C": "41", "D": "43"},
+                        "corretta": "B"}, {"domanda": "Sì?", "opzioni": {"A": "sì", "B": "no", "C": "", "D": "-"},
+                                           "corretta": "A"}], f, ensure_ascii=False)
+        report = LoadReport()
+        self.assertEqual(compile_questions(self.sorgente, self.compilato, report), 1)
+        self.assertEqual(report.rejections[0].reason, "il testo delle opzioni deve essere una stringa")
+        umask = os.umask(0o022)
+        os.umask(umask)
+        self.assertEqual(os.stat(self.compilato).st_mode & 0o777, 0o666 & ~umask)
+
+    def test_banca_condivisa(self):
+        compile_questions(self.sorgente, self.compilato)
+        banca = load_bank(self.compilato)
+        self.assertEqual(len(banca.sample(15, seed=1)), 15)
+        self.assertEqual(banca.sample(15, seed=1), banca.sample(15, seed=1))
+        self.assertIs(load_bank(self.compilato), banca)
+
+    def test_file_non_valido(self):
+        with open(self.compilato, "wb") as f:
+            f.write(b"non una banca")
+        with self.assertRaises(ValueError):
+            BinaryBank(self.compilato)
+        # Una compilazione fallita lascia intatto il file precedente
+        with open(self.sorgente, "w", encoding="utf-8") as f:
+            json.dump([{"domanda": "senza opzioni"}], f)
+        with self.assertRaises(ValueError):
+            compile_questions(self.sorgente, self.compilato)
+        with open(self.compilato, "rb") as f:
+            self.assertEqual(f.read(), b"non una banca")
+        self.assertEqual([n for n in os.listdir(self.tmp_dir.name) if n.endswith(".tmp")], [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+import io
+
+# Aggiunge la cartella del quiz al path (i moduli del quiz si importano senza package)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_loader import LoadReport, Rejection, _iter_json_array, iter_questions, load_questions
+
+VALIDA = {"domanda": "Capitale d'Italia?", "opzioni": {"A": "Roma", "B": "Milano", "C": "Napoli", "D": "Torino"},
+          "corretta": "A"}
+DOMANDE = [VALIDA, {"domanda": ""}, [1, 2], dict(VALIDA, corretta="E"), VALIDA]
+
+
+class TestDataLoader(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def scrivi(self, nome: str, contenuto: str) -> str:
+        percorso = os.path.join(self.tmp_dir.name, nome)
+        with open(percorso, "w", encoding="utf-8") as f:
+            f.write(contenuto)
+        return percorso
+
+    def test_json_in_streaming(self):
+        percorso = self.scrivi("domande.json", json.dumps(DOMANDE, indent=2))
+        report = LoadReport()
+        # Blocchi piccoli per attraversare più blocchi di validazione
+        domande = list(iter_questions(percorso, report, chunk_size=2))
+        self.assertEqual([d.testo for d in domande], [VALIDA["domanda"]] * 2)
+        self.assertEqual(dict(domande[0].opzioni), VALIDA["opzioni"])
+        self.assertEqual((report.accepted, report.rejected), (2, 3))
+        self.assertEqual([r.line for r in report.rejections], [12, 15, 19])
+        self.assertEqual(report.rejections[2], Rejection(19, "risposta corretta non valida: 'E'"))
+
+    def test_jsonl_con_piu_processi(self):
+        righe = [json.dumps(d) for d in DOMANDE] + ["{non valida", "", json.dumps(VALIDA)]
+        percorso = self.scrivi("domande.jsonl", "\n".join(righe))
+        report = LoadReport()
+        self.assertEqual(len(load_questions(percorso, report, workers=2)), 3)
+        self.assertEqual([r.line for r in report.rejections], [2, 3, 4, 6])
+        self.assertTrue(report.rejections[3].reason.startswith("JSON non valido"))
+
+    def test_csv(self):
+        percorso = self.scrivi("domande.csv", 'domanda,A,B,C,D,corretta\n'
+                                              'uno,a,b,c,d,a\n"due\nrighe",a,b,c,d,z\ntre,a,b\n')
+        report = LoadReport()
+        self.assertEqual([d.corretta for d in load_questions(percorso, report)], ["A"])
+        self.assertEqual([r.line for r in report.rejections], [3, 5])
+
+    def test_numeri_tra_due_blocchi(self):
+        # Un numero spezzato tra due letture è un solo elemento (scartato), non un errore
+        for contenuto in ("[1.5]", "[1e3]", "[-12.5e+10, 7]"):
+            for read_size in range(1, len(contenuto) + 1):
+                elementi = list(_iter_json_array(io.StringIO(contenuto), read_size))
+                self.assertEqual([v for _, v in elementi], json.loads(contenuto), (contenuto, read_size))
+        # Come in un file in cui 1500.0 attraversa il confine di READ_SIZE
+        testo = json.dumps([VALIDA, 1500.0, VALIDA])
+        elementi = list(_iter_json_array(io.StringIO(testo), testo.index("1500.0") + 4))
+        self.assertEqual([v for _, v in elementi], [VALIDA, 1500.0, VALIDA])
+        report = LoadReport()
+        self.assertEqual(len(load_questions(self.scrivi("domande.json", testo), report)), 2)
+        self.assertEqual(report.rejections, [Rejection(1, "la domanda non è un oggetto")])
+
+    def test_json_malformato(self):
+        for contenuto in ('{"domanda": "x"}', '[' + json.dumps(VALIDA) + ',', '[1] 2'):
+            with self.assertRaises(ValueError):
+                load_questions(self.scrivi("domande.json", contenuto))
+
+if __name__ == '__main__':
+    unittest.main()
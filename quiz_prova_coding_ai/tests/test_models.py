@@ -0,0 +1,53 @@
+import unittest
+import os
+import sys
+
+# Aggiunge la cartella del quiz al path (i moduli del quiz si importano senza package)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Domanda, QuizSession
+
+OPZIONI = {"A": "Roma", "B": "Milano", "C": "Napoli", "D": "Torino"}
+
+
+class TestDomanda(unittest.TestCase):
+    def test_accesso_come_prima(self):
+        domanda = Domanda("Capitale d'Italia?", OPZIONI, "A")
+        self.assertEqual(domanda.testo, "Capitale d'Italia?")
+        self.assertEqual(dict(domanda.opzioni), OPZIONI)
+        self.assertEqual(list(domanda.opzioni.items()), list(OPZIONI.items()))
+        self.assertEqual(domanda.opzioni["C"], "Napoli")
+        self.assertEqual(domanda.corretta, "A")
+        self.assertEqual(domanda, Domanda("Capitale d'Italia?", ("Roma", "Milano", "Napoli", "Torino"), "A"))
+        self.assertEqual(len({domanda, Domanda("Capitale d'Italia?", OPZIONI, "A")}), 1)
+
+    def test_compatta_e_immutabile(self):
+        domanda = Domanda("Domanda?", OPZIONI, "B")
+        self.assertFalse(hasattr(domanda, "__dict__"))
+        # Opzioni ripetute condividono la stessa stringa
+        altra = Domanda("Altra domanda?", {**OPZIONI, "A": "".join(["Ro", "ma"])}, "B")
+        self.assertIs(altra.opzioni["A"], domanda.opzioni["A"])
+        with self.assertRaises(AttributeError):
+            domanda.corretta = "C"
+        with self.assertRaises(TypeError):
+            domanda.opzioni["A"] = "Firenze"
+
+    def test_non_valida(self):
+        with self.assertRaises(ValueError):
+            Domanda("Domanda?", OPZIONI, "E")
+        with self.assertRaises(ValueError):
+            Domanda("Domanda?", ("Roma", "Milano"), "A")
+        with self.assertRaises(ValueError):
+            Domanda("Domanda?", {"A": "Roma"}, "A")
+
+    def test_sessione(self):
+        domanda = Domanda("Capitale d'Italia?", OPZIONI, "A")
+        sessione = QuizSession([domanda], timeout=10)
+        self.assertIs(sessione.next_question(), domanda)
+        punti, corretta, scaduto = sessione.record_answer(domanda, "A", 2)
+        self.assertTrue(corretta)
+        self.assertFalse(scaduto)
+        self.assertEqual(sessione.punteggio, punti)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+
+# Aggiunge la cartella del quiz al path (i moduli del quiz si importano senza package)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import question_bank
+from models import Domanda
+from question_bank import QuestionBank, load_bank, clear_cache
+
+
+def domanda_grezza(i: int) -> dict:
+    return {"domanda": f"Domanda {i}?", "opzioni": {"A": "a", "B": "b", "C": "c", "D": "d"}, "corretta": "A"}
+
+
+class TestQuestionBank(unittest.TestCase):
+    def setUp(self):
+        clear_cache()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.percorso = os.path.join(self.tmp_dir.name, "questions.json")
+        self.scrivi([domanda_grezza(i) for i in range(3)] + [{"domanda": "senza opzioni"}])
+
+    def tearDown(self):
+        clear_cache()
+        self.tmp_dir.cleanup()
+
+    def scrivi(self, domande, mtime_ns=None):
+        with open(self.percorso, "w", encoding="utf-8") as f:
+            json.dump(domande, f)
+        if mtime_ns is not None:
+            os.utime(self.percorso, ns=(mtime_ns, mtime_ns))
+
+    def test_caricata_una_volta(self):
+        banca = load_bank(self.percorso)
+        self.assertIsInstance(banca, QuestionBank)
+        self.assertEqual(len(banca), 3)
+        self.assertIs(load_bank(self.percorso), banca)
+
+        # File toccato ma con lo stesso contenuto: stessa banca
+        os.utime(self.percorso, ns=(10 ** 18, 10 ** 18))
+        self.assertIs(load_bank(self.percorso), banca)
+
+        self.scrivi([domanda_grezza(i) for i in range(5)], mtime_ns=2 * 10 ** 18)
+        nuova = load_bank(self.percorso)
+        self.assertIsNot(nuova, banca)
+        self.assertEqual(len(nuova), 5)
+
+    def test_immutabile(self):
+        banca = load_bank(self.percorso)
+        with self.assertRaises(TypeError):
+            banca[0] = banca[1]
+        with self.assertRaises(AttributeError):
+            banca[0].testo = "altro"
+        with self.assertRaises(TypeError):
+            banca[0].opzioni["A"] = "altro"
+
+    def test_estrazione(self):
+        banca = QuestionBank([Domanda(f"D{i}", ("a", "b", "c", "d"), "A") for i in range(100)])
+        indici = banca.sample_indices(15)
+        self.assertEqual(len(set(indici)), 15)
+        self.assertEqual(banca.sample_indices(15, seed=7), banca.sample_indices(15, seed=7))
+        self.assertEqual(len(banca.sample_indices(500)), 100)
+        # Più della metà esclusa: estrazione dagli indici disponibili
+        self.assertEqual(sorted(banca.sample_indices(10, exclude=set(range(90)))), list(range(90, 100)))
+
+    def test_domande_gia_viste(self):
+        banca = QuestionBank([Domanda(f"D{i}", ("a", "b", "c", "d"), "A") for i in range(30)])
+        seen = set()
+        partite = [banca.sample(10, seen=seen) for _ in range(3)]
+        self.assertEqual(len({d.testo for partita in partite for d in partita}), 30)
+        # Tutte viste: si ricomincia da capo
+        self.assertEqual(len(banca.sample(10, seen=seen)), 10)
+        self.assertEqual(len(seen), 10)
+
+    def test_file_senza_domande_valide(self):
+        self.scrivi([{"domanda": "senza opzioni"}], mtime_ns=3 * 10 ** 18)
+        with self.assertRaises(ValueError):
+            load_bank(self.percorso)
+        self.assertEqual(question_bank._cache, {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,14 +7,20 @@ Questo programma implementa un registro elettronico che permette di:
 - Aggiungere voti agli studenti esistenti
 
 I dati vengono salvati in formato JSON in un file di testo.
+
+Lettura e scrittura passano per lo stesso livello dati di main.py (Registro e
+FileHandler del pacchetto src): il registro viene caricato una volta per
+processo e riletto solo quando il file cambia.
 """
 
 import os  # Modulo per interagire con il sistema operativo
-import json  # Modulo per lavorare con dati in formato JSON (JavaScript Object Notation)
 from typing import List, Dict, Optional
 from colorama import init, Fore, Style
 from tabulate import tabulate
 from utils_matematici import calcola_media  # Importa la funzione dal nuovo modulo
+from src.models.registro import Registro, registro_condiviso
+from src.models.studente import Studente
+from src.utils.file_handler import FileHandler
 
 # Inizializza colorama per i colori nel terminale
 init()
@@ -33,6 +39,18 @@ main_dir = os.path.dirname(__file__)  # Gets the directory containing the script
 file_path = os.path.join(main_dir, 'registro.txt')  # Composes the complete file path
 
 
+def registro_da_file(percorso_file: str) -> Registro:
+    """
+    Restituisce il registro condiviso del processo per il file indicato.
+
+    Note:
+        - Il file viene letto solo la prima volta e quando cambia (inode, data
+          di modifica o dimensione): le letture successive restano in memoria
+        - Se main.py ha già aperto lo stesso file, il registro è lo stesso
+    """
+    return registro_condiviso(FileHandler(percorso_file, encoding=FILE_ENCODING))
+
+
 def leggi_studenti_da_file(percorso_file: str) -> List[Dict]:
     """
     Legge il file JSON e restituisce la lista degli studenti come lista di dizionari.
@@ -45,16 +63,12 @@ def leggi_studenti_da_file(percorso_file: str) -> List[Dict]:
                    Restituisce lista vuota in caso di errore
     
     Note:
-        - Usa encoding='utf-8' per gestire correttamente i caratteri speciali
-        - Gestisce due possibili eccezioni:
-          * FileNotFoundError: quando il file non esiste
-          * JSONDecodeError: quando il file esiste ma non contiene JSON valido    """
-    try:
-        with open(percorso_file, encoding='utf-8') as file:  # 'with' assicura che il file venga chiuso
-            return json.load(file)  # Converte il JSON in una struttura dati Python
-    except (json.JSONDecodeError, FileNotFoundError):
-        print("❌ Error in JSON file or file not found.")
-        return []  # Returns an empty list in case of error
+        - Gli studenti arrivano dal registro condiviso, senza rileggere il file
+          se non è cambiato
+        - I dizionari sono copie: modificarli non altera il registro
+        - File mancante o JSON non valido danno una lista vuota    """
+    return [{"matricola": s.matricola, "nome": s.nome, "cognome": s.cognome, "voti": list(s.voti)}
+            for s in registro_da_file(percorso_file).studenti()]
 
 
 def stampa_studenti(studenti: List[Dict]):
@@ -157,15 +171,13 @@ def aggiungi_studente(percorso_file: str):
         "voti": voti
     }
 
-    # Load current students and add the new one
-    studenti = leggi_studenti_da_file(percorso_file)
-    studenti.append(nuovo_studente)  # Adds the new student to the existing list
-
-    # Save the updated file
-    with open(percorso_file, "w", encoding="utf-8") as file:
-        # ensure_ascii=False allows saving non-ASCII characters (e.g. accented letters)
-        # indent=2 formats JSON with 2-space indentation for better readability
-        json.dump(studenti, file, ensure_ascii=False, indent=2)
+    # Adds the new student to the shared registry and saves only that record
+    registro = registro_da_file(percorso_file)
+    if not registro.aggiungi(Studente.from_dict(nuovo_studente)):
+        print(f"❌ Errore: La matricola {matricola} è già presente nel registro.")
+        return
+    if not registro.flush():
+        return
 
     # Confirmation to user
     print(f"\n✅ Student {nome} {cognome} successfully added.")
@@ -182,13 +194,13 @@ def stampa_lista_voti_studente(percorso_file: str):
         - Se la matricola non esiste, mostra un messaggio di errore
         - Se esiste, mostra i voti dello studente
     """
-    studenti = leggi_studenti_da_file(percorso_file)
+    registro = registro_da_file(percorso_file)
     matricola_input = input("Inserisci il numero di matricola dello studente: ").strip()
-    studente = next((s for s in studenti if s.get("matricola") == matricola_input), None)
+    studente = registro.trova(matricola_input)  # Ricerca nell'indice per matricola
     if not studente:
         print(f"❌ Errore: Nessuno studente trovato con matricola {matricola_input}")
         return
-    voti = studente.get("voti", [])
+    voti = studente.voti
     if not voti:
         print("⚠️ Nessun voto disponibile per questo studente.")
     else:
@@ -204,21 +216,18 @@ def aggiungi_voto(percorso_file: str):
         percorso_file: Percorso completo del file dati
         
     Note:
-        - Cerca lo studente tramite la matricola usando la funzione next() con un generatore
+        - Cerca lo studente tramite la matricola nell'indice del registro
         - Valida il voto inserito assicurandosi che sia un intero tra 18 e 30
-        - Usa il metodo setdefault() per gestire il caso in cui lo studente non abbia già voti
+        - Salva solo il record modificato (Registro.flush)
     """
-    # Carica i dati attuali
-    studenti = leggi_studenti_da_file(percorso_file)
+    # Registro condiviso: non rilegge il file se non è cambiato
+    registro = registro_da_file(percorso_file)
 
     # Richiesta della matricola
     matricola_input = input("Inserisci il numero di matricola: ").strip()
 
     # Ricerca dello studente con la matricola inserita
-    # La funzione next() prende:
-    # - Un generatore (espressione che produce valori uno alla volta)
-    # - Un valore di default (None) da restituire se il generatore è vuoto
-    studente_trovato = next((s for s in studenti if s.get("matricola") == matricola_input), None)
+    studente_trovato = registro.trova(matricola_input)
 
     # Verifica se lo studente è stato trovato
     if not studente_trovato:
@@ -233,17 +242,13 @@ def aggiungi_voto(percorso_file: str):
         print("❌ Errore: Il voto deve essere un numero intero tra 18 e 30.")
         return  # Esce dalla funzione
 
-    # Aggiunta del voto all'elenco
-    # setdefault() restituisce il valore della chiave se esiste o crea la chiave
-    # con il valore di default specificato (lista vuota in questo caso)
-    studente_trovato.setdefault("voti", []).append(voto)
-
-    # Salvataggio nel file
-    with open(percorso_file, "w", encoding="utf-8") as file:
-        json.dump(studenti, file, ensure_ascii=False, indent=2)
+    # Aggiunta del voto e salvataggio nel file
+    registro.aggiungi_voto(matricola_input, voto)
+    if not registro.flush():
+        return
 
     # Conferma all'utente
-    print(f"✅ Voto {voto} aggiunto con successo a {studente_trovato['nome']} {studente_trovato['cognome']}.")
+    print(f"✅ Voto {voto} aggiunto con successo a {studente_trovato.nome} {studente_trovato.cognome}.")
 
 
 def cancella_studente(percorso_file: str):
@@ -258,11 +263,11 @@ def cancella_studente(percorso_file: str):
         - Richiede conferma prima di procedere con la cancellazione
         - Aggiorna il file JSON dopo la cancellazione
     """
-    # Carica i dati attuali
-    studenti = leggi_studenti_da_file(percorso_file)
+    # Registro condiviso: non rilegge il file se non è cambiato
+    registro = registro_da_file(percorso_file)
     
     # Se non ci sono studenti nel registro
-    if not studenti:
+    if not len(registro):
         print("❌ Nessuno studente presente nel registro.")
         return
     
@@ -270,20 +275,15 @@ def cancella_studente(percorso_file: str):
     matricola_input = input("Inserisci il numero di matricola dello studente da cancellare: ").strip()
     
     # Ricerca dello studente con la matricola inserita
-    studente_index = None
-    for index, studente in enumerate(studenti):
-        if studente.get("matricola") == matricola_input:
-            studente_index = index
-            break
+    studente = registro.trova(matricola_input)
     
     # Verifica se lo studente è stato trovato
-    if studente_index is None:
+    if studente is None:
         print(f"❌ Errore: Nessuno studente trovato con matricola {matricola_input}")
         return
     
     # Ottieni i dati dello studente per la conferma
-    studente = studenti[studente_index]
-    nome_completo = f"{studente.get('nome', 'N/D')} {studente.get('cognome', 'N/D')}"
+    nome_completo = f"{studente.nome or 'N/D'} {studente.cognome or 'N/D'}"
     
     # Chiedi conferma prima di procedere
     conferma = input(f"Sei sicuro di voler cancellare lo studente {nome_completo}? (s/n): ").strip().lower()
@@ -291,12 +291,10 @@ def cancella_studente(percorso_file: str):
         print("Operazione annullata.")
         return
     
-    # Rimuovi lo studente dalla lista
-    studente_rimosso = studenti.pop(studente_index)
-
-    # Salvataggio nel file
-    with open(percorso_file, "w", encoding="utf-8") as file:
-        json.dump(studenti, file, ensure_ascii=False, indent=2)
+    # Rimuovi lo studente e salva la cancellazione
+    registro.cancella(matricola_input)
+    if not registro.flush():
+        return
 
     # Conferma all'utente
     print(f"✅ Studente {nome_completo} rimosso con successo dal registro.")
@@ -304,7 +302,7 @@ def cancella_studente(percorso_file: str):
 # Menu principale del programma
 def menu():
     azioni = {
-        "1": ("Visualizza lista studenti", stampa_studenti),
+        "1": ("Visualizza lista studenti", esegui_processo),
         "2": ("Aggiungi studente", aggiungi_studente),
         "3": ("Aggiungi voto", aggiungi_voto),
         "4": ("Cancella studente", cancella_studente),
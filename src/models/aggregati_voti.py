@@ -0,0 +1,47 @@
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+@dataclass
+class AggregatiVoti:
+    """
+    Aggregati dei voti di uno studente aggiornati a ogni voto aggiunto.
+
+    Come calcola_media considerano solo i voti numerici. Media e varianza
+    diventano letture in O(1) invece di un passaggio sull'intera lista.
+    """
+    conteggio: int = 0
+    somma: float = 0
+    somma_quadrati: float = 0
+    minimo: Optional[float] = None
+    massimo: Optional[float] = None
+
+    @classmethod
+    def da_voti(cls, voti: Iterable) -> 'AggregatiVoti':
+        """Ricalcola gli aggregati dall'intera lista dei voti"""
+        aggregati = cls()
+        for voto in voti:
+            aggregati.aggiungi(voto)
+        return aggregati
+
+    def aggiungi(self, voto):
+        if not isinstance(voto, (int, float)):
+            return
+        self.conteggio += 1
+        self.somma += voto
+        self.somma_quadrati += voto * voto
+        if self.minimo is None or voto < self.minimo:
+            self.minimo = voto
+        if self.massimo is None or voto > self.massimo:
+            self.massimo = voto
+
+    @property
+    def media(self) -> float:
+        return self.somma / self.conteggio if self.conteggio else 0.0
+
+    @property
+    def varianza(self) -> float:
+        """Varianza della popolazione dei voti, 0.0 se non ce ne sono"""
+        if not self.conteggio:
+            return 0.0
+        media = self.media
+        return max(self.somma_quadrati / self.conteggio - media * media, 0.0)
@@ -0,0 +1,140 @@
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+LARGHEZZA_FASCIA = 0.01
+
+
+class IstogrammaMedie:
+    """
+    Istogramma delle medie a fasce di ``larghezza``: percentili e ranghi
+    percentuali si calcolano sulle fasce occupate (al più qualche migliaio),
+    non sugli studenti.
+    """
+
+    def __init__(self, larghezza: float = LARGHEZZA_FASCIA):
+        self.larghezza = larghezza
+        self._conteggi: Counter = Counter()
+        self.totale = 0
+
+    def _fascia(self, media: float) -> int:
+        return round(media / self.larghezza)
+
+    def aggiungi(self, media: float):
+        self._conteggi[self._fascia(media)] += 1
+        self.totale += 1
+
+    def rimuovi(self, media: float):
+        fascia = self._fascia(media)
+        self._conteggi[fascia] -= 1
+        if not self._conteggi[fascia]:
+            del self._conteggi[fascia]
+        self.totale -= 1
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Media sotto la quale (o uguale) cade il p per cento degli studenti"""
+        if not self.totale:
+            return None
+        obiettivo = max(p, 0) / 100 * self.totale
+        cumulata = 0
+        for fascia in sorted(self._conteggi):
+            cumulata += self._conteggi[fascia]
+            if cumulata >= obiettivo:
+                return fascia * self.larghezza
+        return max(self._conteggi) * self.larghezza
+
+    def rango_percentile(self, media: float) -> Optional[float]:
+        """Percentuale di studenti con una media più bassa di ``media``"""
+        if not self.totale:
+            return None
+        fascia = self._fascia(media)
+        sotto = sum(n for f, n in self._conteggi.items() if f < fascia)
+        return sotto / self.totale * 100
+
+
+class IndiceMedie:
+    """
+    Medie degli studenti tenute ordinate (con bisect) e raccolte in un
+    istogramma, aggiornati a ogni voto.
+
+    Le interrogazioni non riordinano nulla: i migliori K sono la coda della
+    lista ordinata, gli studenti sotto una soglia un suo prefisso. Gli
+    studenti senza voti non hanno una media e non compaiono.
+    """
+
+    def __init__(self):
+        self._ordinate: List[Tuple[float, str]] = []
+        self._media_di: Dict[str, float] = {}
+        self.istogramma = IstogrammaMedie()
+
+    @classmethod
+    def da_medie(cls, medie: Iterable[Tuple[str, float]]) -> 'IndiceMedie':
+        """Costruisce l'indice con un solo ordinamento (invece di n inserimenti)"""
+        indice = cls()
+        indice._media_di = dict(medie)
+        indice._ordinate = sorted((media, matricola) for matricola, media in indice._media_di.items())
+        for media, _ in indice._ordinate:
+            indice.istogramma.aggiungi(media)
+        return indice
+
+    def __len__(self) -> int:
+        return len(self._ordinate)
+
+    def media(self, matricola: str) -> Optional[float]:
+        return self._media_di.get(matricola)
+
+    def aggiorna(self, matricola: str, media: float):
+        """
+        Sposta la media di ``matricola`` al suo nuovo posto nella lista.
+
+        Costa O(log n + d), con d gli studenti con media tra la vecchia e la
+        nuova: con un voto in più la media si sposta poco e si fa scorrere solo
+        quel tratto, non la coda della lista. Il primo voto di uno studente è
+        un inserimento con insort, O(n) nel caso peggiore.
+        """
+        vecchia = self._media_di.get(matricola)
+        if vecchia is None:
+            self._media_di[matricola] = media
+            insort(self._ordinate, (media, matricola))
+            self.istogramma.aggiungi(media)
+            return
+        if vecchia == media:
+            return
+        self._media_di[matricola] = media
+        self.istogramma.rimuovi(vecchia)
+        self.istogramma.aggiungi(media)
+        ordinate = self._ordinate
+        da = bisect_left(ordinate, (vecchia, matricola))
+        a = bisect_left(ordinate, (media, matricola))
+        if a > da:
+            # Verso destra: il tratto in mezzo scala di un posto a sinistra
+            a -= 1
+            ordinate[da:a] = ordinate[da + 1:a + 1]
+        else:
+            ordinate[a + 1:da + 1] = ordinate[a:da]
+        ordinate[a] = (media, matricola)
+
+    def rimuovi(self, matricola: str):
+        media = self._media_di.pop(matricola, None)
+        if media is None:
+            return
+        del self._ordinate[bisect_left(self._ordinate, (media, matricola))]
+        self.istogramma.rimuovi(media)
+
+    def migliori(self, k: int) -> List[Tuple[str, float]]:
+        """Le k medie più alte, dalla più alta"""
+        if k <= 0:
+            return []
+        return [(matricola, media) for media, matricola in reversed(self._ordinate[-k:])]
+
+    def sotto(self, soglia: float) -> List[Tuple[str, float]]:
+        """Studenti con media minore di ``soglia``, dalla più bassa"""
+        fine = bisect_left(self._ordinate, (soglia, ""))
+        return [(matricola, media) for media, matricola in self._ordinate[:fine]]
+
+    def percentile(self, p: float) -> Optional[float]:
+        return self.istogramma.percentile(p)
+
+    def rango_percentile(self, matricola: str) -> Optional[float]:
+        media = self._media_di.get(matricola)
+        return self.istogramma.rango_percentile(media) if media is not None else None
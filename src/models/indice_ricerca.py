@@ -0,0 +1,184 @@
+import heapq
+import math
+import unicodedata
+from bisect import bisect_left, insort
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+SOGLIA_SOMIGLIANZA = 0.4
+
+
+@lru_cache(maxsize=65536)
+def normalizza(testo: str) -> str:
+    """Minuscolo e senza accenti: "Nicolò" -> "nicolo" """
+    scomposto = unicodedata.normalize("NFKD", testo.lower())
+    return "".join(c for c in scomposto if not unicodedata.combining(c))
+
+
+def parole(testo: str) -> List[str]:
+    return normalizza(testo).split()
+
+
+@lru_cache(maxsize=65536)
+def trigrammi(parola: str) -> FrozenSet[str]:
+    # Il riempimento dà peso all'inizio della parola, dove i refusi sono più rari
+    esteso = f"  {parola} "
+    return frozenset(esteso[i:i + 3] for i in range(len(esteso) - 2))
+
+
+class IndiceRicerca:
+    """
+    Indice di ricerca per nome e cognome degli studenti.
+
+    Nomi e cognomi sono scomposti in parole normalizzate (minuscole, senza
+    accenti). Gli indici sono costruiti sul vocabolario delle parole
+    distinte, molto più piccolo del numero di studenti:
+    - parole ordinate, per la ricerca per prefisso (``cerca_prefisso``,
+      adatta alla ricerca mentre si digita)
+    - trigrammi -> parole, per la ricerca approssimata (``cerca_simili``,
+      tollera refusi)
+    Ogni parola rimanda alle matricole che la contengono, quindi aggiungere o
+    togliere uno studente tocca solo le sue parole.
+    """
+
+    def __init__(self):
+        # parola -> matricole (dict usato come insieme ordinato per inserimento)
+        self._matricole: Dict[str, Dict[str, None]] = {}
+        self._parole_ordinate: List[str] = []
+        self._trigrammi: Dict[str, Set[str]] = {}
+        self._parole_di: Dict[str, Tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._parole_di)
+
+    def aggiungi(self, matricola: str, nome: str, cognome: str):
+        if matricola in self._parole_di:
+            self.rimuovi(matricola)
+        parole_studente = tuple(dict.fromkeys(parole(cognome) + parole(nome)))
+        self._parole_di[matricola] = parole_studente
+        for parola in parole_studente:
+            matricole = self._matricole.get(parola)
+            if matricole is None:
+                matricole = self._matricole[parola] = {}
+                insort(self._parole_ordinate, parola)
+                for trigramma in trigrammi(parola):
+                    self._trigrammi.setdefault(trigramma, set()).add(parola)
+            matricole[matricola] = None
+
+    def rimuovi(self, matricola: str):
+        for parola in self._parole_di.pop(matricola, ()):
+            matricole = self._matricole[parola]
+            del matricole[matricola]
+            if matricole:
+                continue
+            # Ultimo studente con questa parola: esce dal vocabolario
+            del self._matricole[parola]
+            del self._parole_ordinate[bisect_left(self._parole_ordinate, parola)]
+            for trigramma in trigrammi(parola):
+                self._trigrammi[trigramma].discard(parola)
+                if not self._trigrammi[trigramma]:
+                    del self._trigrammi[trigramma]
+
+    def cerca_prefisso(self, testo: str, limite: Optional[int] = 20) -> List[str]:
+        """
+        Matricole degli studenti che hanno, per ogni parola cercata, una
+        parola di nome o cognome che inizia così ("ros lu" trova Luca Rossi).
+        I risultati seguono l'ordine alfabetico della parola trovata.
+        """
+        termini = parole(testo)
+        if not termini:
+            return []
+        candidati = [self._prefissi(t) for t in termini]
+        punteggi = [dict.fromkeys(parole_trovate, 1.0) for parole_trovate in candidati]
+        risultati = []
+        for matricola, _, _ in self._combina(punteggi):
+            risultati.append(matricola)
+            if limite is not None and len(risultati) >= limite:
+                break
+        return risultati
+
+    def cerca_simili(self, testo: str, limite: int = 20,
+                     soglia: float = SOGLIA_SOMIGLIANZA) -> List[Tuple[str, float]]:
+        """
+        Ricerca approssimata: (matricola, punteggio) ordinati per punteggio.
+
+        Per ogni parola cercata si considerano le parole del vocabolario con
+        somiglianza (Jaccard sui trigrammi) almeno ``soglia``; il punteggio di
+        uno studente è la media della somiglianza migliore per ogni parola.
+        """
+        termini = parole(testo)
+        if not termini:
+            return []
+        punteggi = [self._simili(t, soglia) for t in termini]
+        migliori: List[Tuple[float, int, str]] = []
+        for ordine, (matricola, punteggio, somiglianza_guida) in enumerate(self._combina(punteggi)):
+            # Gli studenti successivi hanno somiglianza sul termine guida al più
+            # somiglianza_guida: se neanche con gli altri termini perfetti possono
+            # entrare tra i migliori, la ricerca è finita
+            massimo_raggiungibile = (somiglianza_guida + len(termini) - 1) / len(termini)
+            if len(migliori) == limite and migliori[0][0] >= massimo_raggiungibile:
+                break
+            elemento = (punteggio, -ordine, matricola)
+            if len(migliori) < limite:
+                heapq.heappush(migliori, elemento)
+            elif elemento > migliori[0]:
+                heapq.heapreplace(migliori, elemento)
+        return [(matricola, punteggio) for punteggio, _, matricola in sorted(migliori, reverse=True)]
+
+    def _prefissi(self, prefisso: str) -> List[str]:
+        inizio = bisect_left(self._parole_ordinate, prefisso)
+        fine = bisect_left(self._parole_ordinate, prefisso + "\uffff", inizio)
+        return self._parole_ordinate[inizio:fine]
+
+    def _simili(self, termine: str, soglia: float) -> Dict[str, float]:
+        trigrammi_termine = trigrammi(termine)
+        # Con somiglianza >= soglia una parola condivide almeno
+        # ceil(soglia * q) dei q trigrammi del termine, quindi almeno uno dei
+        # q - ceil(soglia * q) + 1 più rari: basta scorrere quelli
+        minimo_comuni = max(1, math.ceil(soglia * len(trigrammi_termine)))
+        piu_rari = sorted(trigrammi_termine, key=lambda t: len(self._trigrammi.get(t, ())))
+        candidati: Set[str] = set()
+        for trigramma in piu_rari[:len(trigrammi_termine) - minimo_comuni + 1]:
+            candidati.update(self._trigrammi.get(trigramma, ()))
+        simili = {}
+        q = len(trigrammi_termine)
+        for parola in candidati:
+            trigrammi_parola = trigrammi(parola)
+            n = len(trigrammi_termine & trigrammi_parola)
+            somiglianza = n / (q + len(trigrammi_parola) - n)
+            if somiglianza >= soglia:
+                simili[parola] = somiglianza
+        # Le parole migliori per prime, così i risultati seguono la somiglianza
+        return dict(sorted(simili.items(), key=lambda p: -p[1]))
+
+    def _combina(self, punteggi: List[Dict[str, float]]) -> Iterable[Tuple[str, float, float]]:
+        """
+        Studenti che hanno una parola trovata per ogni termine, come
+        (matricola, punteggio medio, somiglianza sul termine guida).
+
+        Parte dal termine con meno studenti (la guida), scorrendone le parole
+        in ordine di somiglianza decrescente, e verifica gli altri termini
+        sulle parole del singolo studente, senza intersecare insiemi.
+        """
+        if not all(punteggi):
+            return
+        guida = min(range(len(punteggi)),
+                    key=lambda i: sum(len(self._matricole[p]) for p in punteggi[i]))
+        altri = [p for i, p in enumerate(punteggi) if i != guida]
+        visti: Set[str] = set()
+        for parola, somiglianza in punteggi[guida].items():
+            for matricola in self._matricole[parola]:
+                if matricola in visti:
+                    continue
+                # Le parole della guida sono in ordine decrescente: la prima
+                # che porta a uno studente è anche la sua migliore
+                visti.add(matricola)
+                parole_studente = self._parole_di[matricola]
+                totale = somiglianza
+                for termine in altri:
+                    migliore = max((termine.get(p, 0.0) for p in parole_studente), default=0.0)
+                    if not migliore:
+                        break
+                    totale += migliore
+                else:
+                    yield matricola, totale / len(punteggi), somiglianza
@@ -0,0 +1,363 @@
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Mapping, Optional, Set, Tuple
+from src.models.aggregati_voti import AggregatiVoti
+from src.models.indice_medie import IndiceMedie
+from src.models.indice_ricerca import IndiceRicerca
+from src.models.storico_voti import IndiceStorico, StatisticheCorso
+from src.models.studente import Studente, Voto
+from src.utils.file_handler import ConflittoModifiche, FileHandler
+from src.utils.osservatore_file import OsservatoreFile
+
+
+@dataclass
+class MetricheCache:
+    """Contatori del riallineamento del registro in memoria con il file"""
+    hit: int = 0  # controlli senza modifiche esterne
+    miss: int = 0  # controlli che hanno trovato modifiche esterne
+    riallineamenti_completi: int = 0  # miss gestiti confrontando tutto il registro
+    record_aggiornati: int = 0
+    secondi_riallineamento: float = 0.0
+
+    def riepilogo(self) -> str:
+        return (f"cache del registro: {self.hit} hit, {self.miss} miss "
+                f"({self.riallineamenti_completi} completi), {self.record_aggiornati} record "
+                f"aggiornati in {self.secondi_riallineamento * 1000:.1f} ms")
+
+
+class Registro:
+    """
+    Registro degli studenti tenuto in memoria per tutta la sessione.
+
+    Carica il registro una sola volta dal FileHandler, indicizza gli studenti
+    per matricola e per (cognome, nome) e tiene traccia dei record modificati:
+    flush() scrive solo quelli, e non fa nulla se non ci sono modifiche.
+
+    Per ogni record modificato conserva la versione letta, così il
+    FileHandler può fondere le modifiche con quelle salvate nel frattempo da
+    altri operatori (es. voti aggiunti a studenti diversi).
+
+    Tiene inoltre gli aggregati dei voti di ogni studente (AggregatiVoti),
+    aggiornati in O(1) da aggiungi_voto e ricalcolati quando i voti di un
+    record cambiano in altro modo (ricarica, fusione al flush).
+
+    L'IndiceRicerca su nome e cognome permette la ricerca per prefisso e
+    quella approssimata (cerca, cerca_simili); l'IndiceMedie tiene le medie
+    ordinate per classifiche, soglie e percentili; l'IndiceStorico i voti
+    datati in ordine di tempo e le statistiche per corso.
+
+    Le modifiche salvate da altri processi vengono recepite da
+    aggiorna_se_cambiato(), che aggiorna solo i record cambiati. Con
+    ``osserva`` il controllo usa inotify e non tocca il file finché non
+    arriva un evento.
+    """
+
+    def __init__(self, file_handler: FileHandler, osserva: bool = False):
+        self.file_handler = file_handler
+        self.metriche = MetricheCache()
+        # Matricole scartate per conflitto dall'ultimo flush() non riuscito
+        self.conflitti: List[str] = []
+        # Creato prima della lettura, per non perdere modifiche fatte nel frattempo
+        self._osservatore = OsservatoreFile(file_handler.percorsi_dati()) if osserva else None
+        self.ricarica()
+
+    def ricarica(self):
+        """Rilegge il registro dal FileHandler scartando le modifiche non salvate"""
+        self.file_handler.modifiche_esterne()
+        self._per_matricola: Dict[str, Studente] = {}
+        self._per_nome: Dict[Tuple[str, str], Set[str]] = {}
+        self._modificati: Set[str] = set()
+        self._cancellati: Set[str] = set()
+        # matricola -> record come letto dal file (None se aggiunto in sessione)
+        self._originali: Dict[str, Optional[Studente]] = {}
+        self._aggregati: Dict[str, AggregatiVoti] = {}
+        self._ricerca = IndiceRicerca()
+        self._versione = self.file_handler.versione()
+        for studente in self.file_handler.load_students():
+            self._indicizza(studente)
+        self._medie = IndiceMedie.da_medie(
+            (m, a.media) for m, a in self._aggregati.items() if a.conteggio)
+        self._storico = IndiceStorico.da_studenti(self._per_matricola.values())
+
+    def aggiorna_se_cambiato(self) -> bool:
+        """
+        Recepisce le modifiche salvate da altri (cambiano inode, data di
+        modifica o dimensione del file) aggiornando solo i record cambiati e i
+        loro indici. Con modifiche in sospeso non fa nulla: ci penserà flush()
+        a fonderle con quelle salvate.
+        """
+        if self.ha_modifiche:
+            return False
+        if self._osservatore is not None and not self._osservatore.cambiato():
+            self.metriche.hit += 1
+            return False
+        versione = self.file_handler.versione()
+        if versione == self._versione:
+            self.metriche.hit += 1
+            return False
+        inizio = time.perf_counter()
+        matricole = self.file_handler.modifiche_esterne()
+        if matricole is None:
+            try:
+                aggiornati = self._riallinea_tutto()
+            except json.JSONDecodeError:
+                # File non leggibile: il registro in memoria resta com'era
+                return False
+            self.metriche.riallineamenti_completi += 1
+        else:
+            aggiornati = sum(self._riallinea(self.file_handler.get_by_matricola(m), m)
+                             for m in matricole)
+        self._versione = versione
+        self.metriche.miss += 1
+        self.metriche.record_aggiornati += aggiornati
+        self.metriche.secondi_riallineamento += time.perf_counter() - inizio
+        return True
+
+    def close(self):
+        if self._osservatore is not None:
+            self._osservatore.close()
+
+    def __len__(self) -> int:
+        return len(self._per_matricola)
+
+    def __iter__(self) -> Iterator[Studente]:
+        """Studenti nell'ordine del registro, senza copiarne l'elenco"""
+        return iter(self._per_matricola.values())
+
+    def __contains__(self, matricola: str) -> bool:
+        return matricola in self._per_matricola
+
+    @property
+    def ha_modifiche(self) -> bool:
+        return bool(self._modificati or self._cancellati)
+
+    def studenti(self) -> List[Studente]:
+        return list(self._per_matricola.values())
+
+    def trova(self, matricola: str) -> Optional[Studente]:
+        return self._per_matricola.get(matricola)
+
+    def aggregati(self) -> Mapping[str, AggregatiVoti]:
+        """Aggregati dei voti per matricola (in sola lettura)"""
+        return MappingProxyType(self._aggregati)
+
+    def ricalcola_aggregati(self, matricola: Optional[str] = None):
+        """Ricalcola dai voti gli aggregati di uno studente, o di tutti"""
+        matricole = [matricola] if matricola is not None else list(self._per_matricola)
+        for m in matricole:
+            if m in self._per_matricola:
+                self._aggregati[m] = AggregatiVoti.da_voti(self._per_matricola[m].voti)
+                self._aggiorna_media(m)
+
+    def verifica_aggregati(self) -> List[str]:
+        """Matricole i cui aggregati non corrispondono ai voti (es. voti modificati direttamente)"""
+        return sorted(m for m, studente in self._per_matricola.items()
+                      if self._aggregati.get(m) != AggregatiVoti.da_voti(studente.voti))
+
+    def cerca_per_nome(self, cognome: str, nome: str) -> List[Studente]:
+        matricole = self._per_nome.get((cognome.lower(), nome.lower()), set())
+        return [self._per_matricola[m] for m in sorted(matricole)]
+
+    def cerca(self, testo: str, limite: int = 20) -> List[Studente]:
+        """Studenti con nome e cognome che iniziano come le parole di ``testo``"""
+        return [self._per_matricola[m] for m in self._ricerca.cerca_prefisso(testo, limite)]
+
+    def cerca_simili(self, testo: str, limite: int = 20) -> List[Studente]:
+        """Ricerca approssimata per nome e cognome, tollera refusi e accenti"""
+        return [self._per_matricola[m] for m, _ in self._ricerca.cerca_simili(testo, limite)]
+
+    def migliori(self, k: int) -> List[Tuple[Studente, float]]:
+        """I k studenti con la media più alta, dalla più alta"""
+        return [(self._per_matricola[m], media) for m, media in self._medie.migliori(k)]
+
+    def sotto_soglia(self, soglia: float) -> List[Tuple[Studente, float]]:
+        """Studenti con media minore di ``soglia``, dalla più bassa"""
+        return [(self._per_matricola[m], media) for m, media in self._medie.sotto(soglia)]
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Media al p-esimo percentile (studenti con almeno un voto)"""
+        return self._medie.percentile(p)
+
+    def rango_percentile(self, matricola: str) -> Optional[float]:
+        """Percentuale di studenti con una media più bassa di quella di ``matricola``"""
+        return self._medie.rango_percentile(matricola)
+
+    def voti_nel_periodo(self, inizio: datetime, fine: datetime) -> List[Tuple[Studente, Voto]]:
+        """Voti registrati in [inizio, fine), in ordine di data"""
+        return [(self._per_matricola[m], voto) for m, voto in self._storico.nel_periodo(inizio, fine)]
+
+    def statistiche_corso(self, corso: str) -> Optional[StatisticheCorso]:
+        """Numero di voti, media e lodi di un corso (None se non ha voti)"""
+        return self._storico.statistiche_corso(corso)
+
+    def corsi(self) -> List[str]:
+        return self._storico.corsi()
+
+    def aggiungi(self, studente: Studente) -> bool:
+        """Aggiunge uno studente; restituisce False se la matricola esiste già"""
+        if studente.matricola in self._per_matricola:
+            return False
+        self._originali.setdefault(studente.matricola, None)
+        self._indicizza(studente)
+        self._aggiorna_media(studente.matricola)
+        self._storico.aggiungi_studente(studente)
+        self._modificati.add(studente.matricola)
+        self._cancellati.discard(studente.matricola)
+        return True
+
+    def aggiungi_voto(self, matricola: str, voto: int, corso: Optional[str] = None,
+                      data: Optional[str] = None, lode: bool = False) -> bool:
+        """
+        Aggiunge un voto; senza ``data`` vale il momento della registrazione.
+
+        L'indice delle medie sposta lo studente solo oltre quelli con media
+        tra la vecchia e la nuova (vedi IndiceMedie.aggiorna), non riordina.
+        """
+        studente = self._per_matricola.get(matricola)
+        if not studente:
+            return False
+        self._ricorda_originale(studente)
+        data = data or datetime.now().isoformat(timespec="seconds")
+        studente.aggiungi_voto(voto, data, corso, lode)
+        self._aggregati[matricola].aggiungi(voto)
+        self._aggiorna_media(matricola)
+        self._storico.aggiungi_voto(matricola, Voto(voto, data, corso, lode))
+        self._modificati.add(matricola)
+        return True
+
+    def cancella(self, matricola: str) -> bool:
+        studente = self._per_matricola.get(matricola)
+        if not studente:
+            return False
+        self._ricorda_originale(studente)
+        self._togli_da_indici(studente)
+        del self._per_matricola[matricola]
+        self._modificati.discard(matricola)
+        self._cancellati.add(matricola)
+        return True
+
+    def flush(self) -> bool:
+        """
+        Salva i soli record modificati o cancellati dall'ultimo flush.
+
+        Se un altro operatore ha modificato il registro nel frattempo, dopo il
+        salvataggio il registro viene ricaricato per includere le sue modifiche.
+        Se alcune modifiche sono in conflitto restituisce False: le altre sono
+        comunque salvate e le matricole scartate restano in ``conflitti``.
+        """
+        self.conflitti = []
+        if not self.ha_modifiche:
+            return True
+        modificati = [self._per_matricola[m] for m in self._modificati]
+        originali = {m: self._originali.get(m) for m in self._modificati | self._cancellati}
+        modifiche_esterne = self.file_handler.versione() != self._versione
+        voti_prima = {s.matricola: len(s.voti) for s in modificati}
+        try:
+            if not self.file_handler.save_changes(modificati, list(self._cancellati), originali):
+                return False
+        except ConflittoModifiche as e:
+            print(f"⚠️ Modifiche scartate, studenti cambiati da un altro operatore: {', '.join(e.matricole)}")
+            self.conflitti = list(e.matricole)
+            self.ricarica()
+            return False
+        if modifiche_esterne:
+            self.ricarica()
+        else:
+            # La fusione può aver aggiunto ai record voti salvati da altri:
+            # solo quei record vanno reindicizzati
+            for studente in modificati:
+                if len(studente.voti) != voti_prima[studente.matricola]:
+                    self.ricalcola_aggregati(studente.matricola)
+                    self._storico.aggiungi_studente(studente)
+            self._modificati.clear()
+            self._cancellati.clear()
+            self._originali.clear()
+            self._versione = self.file_handler.versione()
+        return True
+
+    def _riallinea_tutto(self) -> int:
+        """Confronta ogni record del file con quello in memoria; restituisce quanti ne cambia"""
+        aggiornati = 0
+        visti: Set[str] = set()
+        for studente in self.file_handler.iter_students():
+            visti.add(studente.matricola)
+            aggiornati += self._riallinea(studente, studente.matricola)
+        for matricola in [m for m in self._per_matricola if m not in visti]:
+            aggiornati += self._riallinea(None, matricola)
+        return aggiornati
+
+    def _riallinea(self, studente: Optional[Studente], matricola: str) -> bool:
+        """Porta il record ``matricola`` allo stato letto dal file (None: cancellato)"""
+        attuale = self._per_matricola.get(matricola)
+        if attuale == studente:
+            return False
+        if attuale is not None:
+            self._togli_da_indici(attuale)
+        if studente is None:
+            del self._per_matricola[matricola]
+        else:
+            # Un record già presente resta nella sua posizione nell'elenco
+            self._indicizza(studente)
+            self._aggiorna_media(matricola)
+            self._storico.aggiungi_studente(studente)
+        return True
+
+    def _togli_da_indici(self, studente: Studente):
+        """Toglie lo studente da tutti gli indici tranne _per_matricola"""
+        matricola = studente.matricola
+        del self._aggregati[matricola]
+        self._ricerca.rimuovi(matricola)
+        self._medie.rimuovi(matricola)
+        self._storico.rimuovi_studente(matricola)
+        chiave = self._chiave_nome(studente)
+        self._per_nome[chiave].discard(matricola)
+        if not self._per_nome[chiave]:
+            del self._per_nome[chiave]
+
+    def _ricorda_originale(self, studente: Studente):
+        if studente.matricola not in self._originali:
+            self._originali[studente.matricola] = studente.copia()
+
+    def _indicizza(self, studente: Studente):
+        self._per_matricola[studente.matricola] = studente
+        self._aggregati[studente.matricola] = AggregatiVoti.da_voti(studente.voti)
+        self._ricerca.aggiungi(studente.matricola, studente.nome, studente.cognome)
+        self._per_nome.setdefault(self._chiave_nome(studente), set()).add(studente.matricola)
+
+    def _aggiorna_media(self, matricola: str):
+        aggregati = self._aggregati[matricola]
+        if aggregati.conteggio:
+            self._medie.aggiorna(matricola, aggregati.media)
+        else:
+            self._medie.rimuovi(matricola)
+
+    @staticmethod
+    def _chiave_nome(studente: Studente) -> Tuple[str, str]:
+        return studente.cognome.lower(), studente.nome.lower()
+
+
+# Un Registro per file, condiviso da tutto il processo
+_condivisi: Dict[str, Registro] = {}
+
+
+def registro_condiviso(file_handler: FileHandler) -> Registro:
+    """
+    Registro condiviso nel processo per il file di ``file_handler``.
+
+    La prima chiamata carica il registro; le successive restituiscono lo
+    stesso oggetto, aggiornato solo se il file è cambiato nel frattempo (con
+    inotify, se disponibile), quindi letture ripetute nella stessa sessione
+    non toccano il disco. Le chiamate
+    successive riusano il FileHandler della prima.
+    """
+    chiave = os.path.abspath(file_handler.file_path)
+    registro = _condivisi.get(chiave)
+    if registro is None:
+        registro = _condivisi[chiave] = Registro(file_handler, osserva=True)
+    else:
+        registro.aggiorna_se_cambiato()
+    return registro
@@ -0,0 +1,178 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from src.models.studente import Studente, Voto
+
+EPOCA = datetime(1970, 1, 1)
+
+
+def secondi(data: str) -> Optional[int]:
+    """Secondi dall'epoca di una data ISO 8601 (ora locale); None se non valida"""
+    try:
+        istante = datetime.fromisoformat(data)
+    except (TypeError, ValueError):
+        return None
+    if istante.tzinfo is not None:
+        istante = istante.astimezone().replace(tzinfo=None)
+    return int((istante - EPOCA).total_seconds())
+
+
+def periodo_mese(mese: str) -> Tuple[datetime, datetime]:
+    """[inizio, fine) di un mese scritto come "AAAA-MM" """
+    inizio = datetime.strptime(mese, "%Y-%m")
+    fine = inizio.replace(year=inizio.year + 1, month=1) if inizio.month == 12 else inizio.replace(month=inizio.month + 1)
+    return inizio, fine
+
+
+class StatisticheCorso(NamedTuple):
+    voti: int
+    media: float
+    lodi: int
+
+
+class IndiceStorico:
+    """
+    Indice dei voti con data e corso di tutto il registro.
+
+    I voti datati sono tenuti in array paralleli ordinati per istante
+    (secondi, valore, lode, corso come indice nella tabella dei codici,
+    matricola): i voti di un periodo sono un intervallo trovato con bisect,
+    senza scorrere gli studenti. Per ogni corso tiene conteggio, somma e lodi,
+    quindi la media di un corso è una lettura in O(1).
+    """
+
+    def __init__(self):
+        self._istanti = array("q")
+        self._valori = array("h")
+        self._lode = array("b")
+        self._corsi = array("i")
+        self._matricole: List[str] = []
+        self._codici: List[Optional[str]] = [None]
+        self._id_corso: Dict[Optional[str], int] = {None: 0}
+        # corso -> [voti, somma, lodi]
+        self._per_corso: Dict[str, List[int]] = {}
+        # matricola -> voti indicizzati, per poterli togliere quando il record cambia
+        self._voci: Dict[str, Tuple[Voto, ...]] = {}
+
+    @classmethod
+    def da_studenti(cls, studenti: Iterable[Studente]) -> 'IndiceStorico':
+        """Costruisce l'indice con un solo ordinamento (invece di n inserimenti)"""
+        indice = cls()
+        datati = []
+        for studente in studenti:
+            for voto in indice._registra(studente):
+                istante = secondi(voto.data) if voto.data else None
+                if istante is not None:
+                    datati.append((istante, voto, studente.matricola))
+        datati.sort(key=lambda elemento: elemento[0])
+        for _, voto, _ in datati:
+            if voto.corso not in indice._id_corso:
+                indice._id_corso[voto.corso] = len(indice._codici)
+                indice._codici.append(voto.corso)
+        # Colonne riempite in blocco: già ordinate, niente inserimenti
+        indice._istanti.extend(istante for istante, _, _ in datati)
+        indice._valori.extend(voto.valore for _, voto, _ in datati)
+        indice._lode.extend(voto.lode for _, voto, _ in datati)
+        indice._corsi.extend(indice._id_corso[voto.corso] for _, voto, _ in datati)
+        indice._matricole = [matricola for _, _, matricola in datati]
+        return indice
+
+    def __len__(self) -> int:
+        """Numero di voti datati"""
+        return len(self._istanti)
+
+    def aggiungi_studente(self, studente: Studente):
+        self.rimuovi_studente(studente.matricola)
+        for voto in self._registra(studente):
+            istante = secondi(voto.data) if voto.data else None
+            if istante is not None:
+                self._accoda(bisect_right(self._istanti, istante), istante, voto, studente.matricola)
+
+    def aggiungi_voto(self, matricola: str, voto: Voto):
+        """
+        Indicizza un voto appena aggiunto allo studente, senza togliere e
+        reinserire i suoi voti precedenti: con la data corrente l'inserimento
+        avviene in coda agli array.
+        """
+        if not self._indicizzabile(voto):
+            return
+        self._voci[matricola] = self._voci.get(matricola, ()) + (voto,)
+        self._conta(voto)
+        istante = secondi(voto.data) if voto.data else None
+        if istante is not None:
+            self._accoda(bisect_right(self._istanti, istante), istante, voto, matricola)
+
+    def rimuovi_studente(self, matricola: str):
+        for voto in self._voci.pop(matricola, ()):
+            if voto.corso:
+                statistiche = self._per_corso[voto.corso]
+                statistiche[0] -= 1
+                statistiche[1] -= voto.valore
+                statistiche[2] -= voto.lode
+                if not statistiche[0]:
+                    del self._per_corso[voto.corso]
+            istante = secondi(voto.data) if voto.data else None
+            if istante is None:
+                continue
+            for i in range(bisect_left(self._istanti, istante), bisect_right(self._istanti, istante)):
+                if self._matricole[i] == matricola and self._valori[i] == voto.valore:
+                    for colonna in (self._istanti, self._valori, self._lode, self._corsi, self._matricole):
+                        del colonna[i]
+                    break
+
+    def nel_periodo(self, inizio: datetime, fine: datetime) -> List[Tuple[str, Voto]]:
+        """(matricola, voto) registrati in [inizio, fine), in ordine di data"""
+        da = bisect_left(self._istanti, int((inizio - EPOCA).total_seconds()))
+        a = bisect_left(self._istanti, int((fine - EPOCA).total_seconds()), da)
+        return [(self._matricole[i],
+                 Voto(self._valori[i], (EPOCA + timedelta(seconds=self._istanti[i])).isoformat(),
+                      self._codici[self._corsi[i]], bool(self._lode[i])))
+                for i in range(da, a)]
+
+    def statistiche_corso(self, corso: str) -> Optional[StatisticheCorso]:
+        statistiche = self._per_corso.get(corso)
+        if not statistiche:
+            return None
+        voti, somma, lodi = statistiche
+        return StatisticheCorso(voti, somma / voti, lodi)
+
+    def media_corso(self, corso: str) -> Optional[float]:
+        statistiche = self.statistiche_corso(corso)
+        return statistiche.media if statistiche else None
+
+    def corsi(self) -> List[str]:
+        return sorted(self._per_corso)
+
+    def _registra(self, studente: Studente) -> Tuple[Voto, ...]:
+        """Aggiorna le statistiche per corso; restituisce i voti con dettagli"""
+        if not studente.dettagli:
+            return ()
+        voci = tuple(v for v in studente.voti_dettagliati() if self._indicizzabile(v))
+        if voci:
+            self._voci[studente.matricola] = voci
+        for voto in voci:
+            self._conta(voto)
+        return voci
+
+    @staticmethod
+    def _indicizzabile(voto: Voto) -> bool:
+        # Solo voti interi: gli array dell'indice sono di interi a 16 bit
+        return bool(voto.data or voto.corso) and type(voto.valore) is int and abs(voto.valore) < 2 ** 15
+
+    def _conta(self, voto: Voto):
+        if voto.corso:
+            statistiche = self._per_corso.setdefault(voto.corso, [0, 0, 0])
+            statistiche[0] += 1
+            statistiche[1] += voto.valore
+            statistiche[2] += voto.lode
+
+    def _accoda(self, i: int, istante: int, voto: Voto, matricola: str):
+        if voto.corso not in self._id_corso:
+            self._id_corso[voto.corso] = len(self._codici)
+            self._codici.append(voto.corso)
+        self._istanti.insert(i, istante)
+        self._valori.insert(i, voto.valore)
+        self._lode.insert(i, voto.lode)
+        self._corsi.insert(i, self._id_corso[voto.corso])
+        self._matricole.insert(i, matricola)
@@ -1,5 +1,76 @@
-from typing import List, Dict
-from dataclasses import dataclass
+import sys
+from array import array
+from typing import List, Dict, NamedTuple, Optional, Union
+from dataclasses import dataclass, field, replace
+
+
+class Voto(NamedTuple):
+    """Un voto con i suoi dettagli (None se non registrati)"""
+    valore: int
+    data: Optional[str] = None  # ISO 8601, es. "2025-06-12T09:30:00"
+    corso: Optional[str] = None
+    lode: bool = False
+
+
+@dataclass
+class DettagliVoti:
+    """
+    Data, codice del corso e lode dei voti di uno studente, in liste
+    parallele a ``Studente.voti``: l'elemento i descrive voti[i].
+
+    Le liste possono essere più corte dei voti: i voti in più (registrati
+    prima dello storico o da strumenti che conoscono solo il valore) non
+    hanno dettagli. Date e corsi ripetuti condividono la stessa stringa.
+    """
+    date: List[Optional[str]] = field(default_factory=list)
+    corsi: List[Optional[str]] = field(default_factory=list)
+    lode: List[bool] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.date)
+
+    def imposta(self, i: int, data: Optional[str], corso: Optional[str], lode: bool):
+        while len(self.date) <= i:
+            self.date.append(None)
+            self.corsi.append(None)
+            self.lode.append(False)
+        self.date[i] = sys.intern(data) if isinstance(data, str) and data else None
+        self.corsi[i] = sys.intern(corso) if isinstance(corso, str) and corso else None
+        self.lode[i] = bool(lode)
+
+    def copia(self) -> 'DettagliVoti':
+        return DettagliVoti(list(self.date), list(self.corsi), list(self.lode))
+
+    def to_dict(self) -> Dict:
+        return {"date": self.date, "corsi": self.corsi, "lode": self.lode}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> Optional['DettagliVoti']:
+        """Dettagli da un record JSON; None per i record nel formato con i soli voti"""
+        if "date" not in data and "corsi" not in data and "lode" not in data:
+            return None
+        date, corsi, lode = data.get("date") or [], data.get("corsi") or [], data.get("lode") or []
+        dettagli = cls()
+        for i in range(max(len(date), len(corsi), len(lode))):
+            dettagli.imposta(i, date[i] if i < len(date) else None,
+                             corsi[i] if i < len(corsi) else None,
+                             lode[i] if i < len(lode) else False)
+        return dettagli or None
+
+
+def unisci_dettagli(prima: Optional[DettagliVoti], n_prima: int,
+                    dopo: Optional[DettagliVoti], da: int) -> Optional[DettagliVoti]:
+    """
+    Dettagli dei voti ``voti_prima + voti_dopo[da:]``, come nella fusione a
+    tre vie dei record: ``n_prima`` è il numero di voti di ``prima``.
+    """
+    if dopo is None or len(dopo) <= da:
+        return prima
+    unione = prima.copia() if prima is not None else DettagliVoti()
+    for i in range(da, len(dopo)):
+        unione.imposta(n_prima + i - da, dopo.date[i], dopo.corsi[i], dopo.lode[i])
+    return unione
+
 
 @dataclass
 class Studente:
@@ -7,14 +78,40 @@ class Studente:
     nome: str
     cognome: str
     voti: List[int]
+    dettagli: Optional[DettagliVoti] = None
+
+    def aggiungi_voto(self, voto: int, data: Optional[str] = None, corso: Optional[str] = None,
+                      lode: bool = False):
+        """Aggiunge un voto, con data, corso e lode se noti"""
+        if lode and voto != 30:
+            raise ValueError("La lode è ammessa solo con 30")
+        self.voti.append(voto)
+        if data or corso or lode:
+            if self.dettagli is None:
+                self.dettagli = DettagliVoti()
+            self.dettagli.imposta(len(self.voti) - 1, data, corso, lode)
+
+    def voti_dettagliati(self) -> List[Voto]:
+        dettagli = self.dettagli
+        n = len(dettagli) if dettagli is not None else 0
+        return [Voto(voto, dettagli.date[i], dettagli.corsi[i], dettagli.lode[i]) if i < n else Voto(voto)
+                for i, voto in enumerate(self.voti)]
+
+    def copia(self) -> 'Studente':
+        """Copia con voti e dettagli propri, modificabili senza toccare l'originale"""
+        return replace(self, voti=list(self.voti),
+                       dettagli=self.dettagli.copia() if self.dettagli is not None else None)
 
     def to_dict(self) -> Dict:
-        return {
+        dati = {
             "matricola": self.matricola,
             "nome": self.nome,
             "cognome": self.cognome,
             "voti": self.voti
         }
+        if self.dettagli:
+            dati.update(self.dettagli.to_dict())
+        return dati
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'Studente':
@@ -22,5 +119,62 @@ class Studente:
             matricola=data.get("matricola", ""),
             nome=data.get("nome", ""),
             cognome=data.get("cognome", ""),
-            voti=data.get("voti", [])
-        )
\ No newline at end of file
+            voti=data.get("voti", []),
+            dettagli=DettagliVoti.from_dict(data)
+        )
+
+
+class StudenteCompatto:
+    """
+    Variante compatta di Studente per registri molto grandi.
+
+    Usa __slots__ al posto del dizionario per istanza, stringhe internate
+    (nomi e cognomi ripetuti condividono lo stesso oggetto) e voti in un
+    array('B') da un byte ciascuno, convertiti in int solo quando letti.
+    Voti che non stanno in un byte restano in una normale lista.
+    """
+    __slots__ = ("matricola", "nome", "cognome", "voti", "dettagli")
+
+    def __init__(self, matricola: str, nome: str, cognome: str, voti: List[int],
+                 dettagli: Optional[DettagliVoti] = None):
+        self.matricola = matricola
+        self.nome = sys.intern(nome)
+        self.cognome = sys.intern(cognome)
+        try:
+            self.voti: Union[array, List[int]] = array('B', voti)
+        except (OverflowError, TypeError):
+            self.voti = list(voti)
+        self.dettagli = dettagli
+
+    aggiungi_voto = Studente.aggiungi_voto
+    voti_dettagliati = Studente.voti_dettagliati
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (Studente, StudenteCompatto)):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return (f"StudenteCompatto(matricola={self.matricola!r}, nome={self.nome!r}, "
+                f"cognome={self.cognome!r}, voti={list(self.voti)!r})")
+
+    def to_dict(self) -> Dict:
+        dati = {
+            "matricola": self.matricola,
+            "nome": self.nome,
+            "cognome": self.cognome,
+            "voti": list(self.voti)
+        }
+        if self.dettagli:
+            dati.update(self.dettagli.to_dict())
+        return dati
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'StudenteCompatto':
+        return cls(
+            matricola=data.get("matricola", ""),
+            nome=data.get("nome", ""),
+            cognome=data.get("cognome", ""),
+            voti=data.get("voti", []),
+            dettagli=DettagliVoti.from_dict(data)
+        )
@@ -0,0 +1,94 @@
+from itertools import chain
+from typing import Iterable, Sequence
+from src.models.studente import Studente
+
+try:
+    import numpy as np
+except ImportError:  # numpy è opzionale: senza, ConsoleView calcola le medie riga per riga
+    np = None
+
+# Codici delle fasce di colore della media (vedi ConsoleView.stampa_studenti)
+FASCIA_BASSA, FASCIA_MEDIA, FASCIA_ALTA = 0, 1, 2
+SOGLIA_BASSA = 24
+SOGLIA_ALTA = 27
+
+
+def fascia(media: float) -> int:
+    """Fascia di colore di una singola media"""
+    return FASCIA_BASSA if media < SOGLIA_BASSA else FASCIA_ALTA if media >= SOGLIA_ALTA else FASCIA_MEDIA
+
+
+class ArchivioVoti:
+    """
+    Voti di tutti gli studenti in formato colonnare (CSR).
+
+    ``voti`` contiene i voti di tutti gli studenti uno dopo l'altro,
+    ``offset[i]:offset[i + 1]`` è l'intervallo dei voti dello studente i.
+    Medie, conteggi, minimi, massimi e fasce di colore vengono calcolati per
+    tutti gli studenti con una sola operazione vettoriale.
+    """
+
+    def __init__(self, voti: 'np.ndarray', offset: 'np.ndarray'):
+        self.voti = voti
+        self.offset = offset
+
+    @classmethod
+    def da_liste(cls, liste_voti: Iterable[Sequence[float]]) -> 'ArchivioVoti':
+        if np is None:
+            raise ImportError("ArchivioVoti richiede numpy")
+        liste_voti = list(liste_voti)
+        voti = np.array(list(chain.from_iterable(liste_voti)))
+        if voti.dtype.kind not in "biuf":
+            # Come calcola_media, considera solo i valori numerici
+            liste_voti = [[v for v in voti if isinstance(v, (int, float))] for voti in liste_voti]
+            return cls.da_liste(liste_voti)
+        voti = voti.astype(np.float64)
+        lunghezze = np.fromiter(map(len, liste_voti), dtype=np.int64, count=len(liste_voti))
+        offset = np.zeros(len(liste_voti) + 1, dtype=np.int64)
+        np.cumsum(lunghezze, out=offset[1:])
+        return cls(voti, offset)
+
+    @classmethod
+    def da_studenti(cls, studenti: Iterable[Studente]) -> 'ArchivioVoti':
+        return cls.da_liste(s.voti for s in studenti)
+
+    def __len__(self) -> int:
+        return len(self.offset) - 1
+
+    def conteggi(self) -> 'np.ndarray':
+        return np.diff(self.offset)
+
+    def somme(self) -> 'np.ndarray':
+        cumulata = np.concatenate(([0.0], np.cumsum(self.voti)))
+        return cumulata[self.offset[1:]] - cumulata[self.offset[:-1]]
+
+    def medie(self) -> 'np.ndarray':
+        """Media di ogni studente, 0.0 per chi non ha voti (come calcola_media)"""
+        conteggi = self.conteggi()
+        medie = np.zeros(len(self), dtype=np.float64)
+        np.divide(self.somme(), conteggi, out=medie, where=conteggi > 0)
+        return medie
+
+    def minimi(self) -> 'np.ndarray':
+        """Voto minimo di ogni studente, NaN per chi non ha voti"""
+        return self._riduci(np.minimum)
+
+    def massimi(self) -> 'np.ndarray':
+        """Voto massimo di ogni studente, NaN per chi non ha voti"""
+        return self._riduci(np.maximum)
+
+    def fasce(self, medie: 'np.ndarray' = None) -> 'np.ndarray':
+        """Fascia di colore di ogni media: FASCIA_BASSA, FASCIA_MEDIA o FASCIA_ALTA"""
+        if medie is None:
+            medie = self.medie()
+        return np.where(medie < SOGLIA_BASSA, FASCIA_BASSA,
+                        np.where(medie >= SOGLIA_ALTA, FASCIA_ALTA, FASCIA_MEDIA))
+
+    def _riduci(self, ufunc) -> 'np.ndarray':
+        risultato = np.full(len(self), np.nan)
+        non_vuoti = self.conteggi() > 0
+        if non_vuoti.any():
+            # Gli intervalli vuoti non contengono elementi, quindi basta
+            # ridurre a partire dall'inizio di quelli non vuoti
+            risultato[non_vuoti] = ufunc.reduceat(self.voti, self.offset[:-1][non_vuoti])
+        return risultato
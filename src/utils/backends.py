@@ -0,0 +1,38 @@
+import json
+import os
+from typing import Optional
+from .file_handler import FileHandler
+from .log_file_handler import LogFileHandler
+from .snapshot_file_handler import SnapshotFileHandler
+from .sqlite_file_handler import SqliteFileHandler, importa_da_json
+
+# Backend di salvataggio del registro: "json" (riscrittura completa), "log"
+# (snapshot + log append-only), "sqlite" (database indicizzato) o "snapshot"
+# (snapshot binario in sola lettura, per la reportistica).
+# Selezionabile con la variabile REGISTRO_BACKEND.
+BACKENDS = {
+    "json": (lambda percorso: FileHandler(percorso, journal=True), "registro.txt"),
+    "log": (LogFileHandler, "registro.txt"),
+    "sqlite": (SqliteFileHandler, "registro.db"),
+    "snapshot": (SnapshotFileHandler, "registro.snap"),
+}
+
+def crea_file_handler(backend: Optional[str] = None) -> FileHandler:
+    backend = backend or os.environ.get("REGISTRO_BACKEND", "json")
+    if backend not in BACKENDS:
+        print(f"⚠️ Backend '{backend}' sconosciuto, uso 'json'")
+        backend = "json"
+    classe, percorso = BACKENDS[backend]
+    if backend == "sqlite" and not os.path.exists(percorso) and os.path.exists("registro.txt"):
+        # Primo avvio con SQLite: migra il registro JSON esistente
+        handler = SqliteFileHandler(percorso)
+        try:
+            n = importa_da_json(handler, FileHandler("registro.txt").iter_students())
+        except json.JSONDecodeError:
+            # Un database importato a metà non va riusato ai prossimi avvii
+            handler.close()
+            os.remove(percorso)
+            raise
+        print(f"✅ Importati {n} studenti da registro.txt in {percorso}")
+        return handler
+    return classe(percorso)
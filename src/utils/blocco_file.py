@@ -0,0 +1,38 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: nessun lock consultivo, un solo operatore alla volta
+    fcntl = None
+
+class BloccoFile:
+    """
+    Lock consultivo (fcntl.flock) su ``<percorso>.lock`` condiviso tra processi.
+
+    È rientrante all'interno della stessa istanza: le operazioni che ne
+    chiamano altre già protette non si bloccano da sole.
+    """
+
+    def __init__(self, percorso: str):
+        self.percorso_lock = percorso + ".lock"
+        self._file = None
+        self._profondita = 0
+
+    @contextmanager
+    def esclusivo(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        if self._profondita == 0:
+            self._file = open(self.percorso_lock, 'a')
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        self._profondita += 1
+        try:
+            yield
+        finally:
+            self._profondita -= 1
+            if self._profondita == 0:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+                self._file.close()
+                self._file = None
@@ -0,0 +1,101 @@
+"""
+Classifiche sulle medie lette in streaming dal registro, senza caricarlo
+in memoria né ordinarlo per intero.
+
+Uso:
+    python -m src.utils.classifica migliori 100 [--backend sqlite]
+    python -m src.utils.classifica sotto 24
+    python -m src.utils.classifica percentili [--matricola 12345]
+"""
+
+import argparse
+import heapq
+import json
+import sys
+from typing import Iterable, Iterator, List, Optional, Tuple
+from ..models.aggregati_voti import AggregatiVoti
+from ..models.indice_medie import IstogrammaMedie
+from ..models.studente import Studente
+from .backends import BACKENDS, crea_file_handler
+from .file_handler import FileHandler
+
+PERCENTILI = (10, 25, 50, 75, 90)
+
+
+def con_media(studenti: Iterable[Studente]) -> Iterator[Tuple[Studente, float]]:
+    """(studente, media) degli studenti con almeno un voto, come IndiceMedie"""
+    for studente in studenti:
+        aggregati = AggregatiVoti.da_voti(studente.voti)
+        if aggregati.conteggio:
+            yield studente, aggregati.media
+
+
+def migliori(studenti: Iterable[Studente], k: int) -> List[Tuple[Studente, float]]:
+    """I k studenti con la media più alta con un heap di k elementi: O(n log k)"""
+    return heapq.nlargest(k, con_media(studenti), key=lambda coppia: coppia[1])
+
+
+def sotto_soglia(studenti: Iterable[Studente], soglia: float) -> List[Tuple[Studente, float]]:
+    """
+    Studenti con media minore di ``soglia``, dalla più bassa come
+    Registro.sotto_soglia: si ordinano solo quelli sotto la soglia
+    """
+    return sorted(((s, media) for s, media in con_media(studenti) if media < soglia),
+                  key=lambda coppia: (coppia[1], coppia[0].matricola))
+
+
+def istogramma(studenti: Iterable[Studente]) -> IstogrammaMedie:
+    risultato = IstogrammaMedie()
+    for _, media in con_media(studenti):
+        risultato.aggiungi(media)
+    return risultato
+
+
+def _stampa(righe: Iterable[Tuple[Studente, float]]):
+    print("Matricola\tNome\tCognome\tMedia Voti")
+    for studente, media in righe:
+        print(f"{studente.matricola}\t{studente.nome}\t{studente.cognome}\t{media:.2f}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Classifiche sulle medie del registro")
+    parser.add_argument("--backend", choices=list(BACKENDS), help="backend del registro (default: REGISTRO_BACKEND o json)")
+    comandi = parser.add_subparsers(dest="comando", required=True)
+    comandi.add_parser("migliori", help="i K studenti con la media più alta").add_argument("k", type=int)
+    comandi.add_parser("sotto", help="studenti con media minore della soglia").add_argument("soglia", type=float)
+    percentili = comandi.add_parser("percentili", help="percentili delle medie")
+    percentili.add_argument("--matricola", help="mostra anche il rango percentile di questo studente")
+    args = parser.parse_args(argv)
+
+    file_handler = crea_file_handler(args.backend)
+    try:
+        _esegui(file_handler, args)
+    except json.JSONDecodeError:
+        # Il messaggio è già stato stampato dal FileHandler
+        sys.exit(1)
+
+
+def _esegui(file_handler: FileHandler, args: argparse.Namespace):
+    if args.comando == "migliori":
+        _stampa(migliori(file_handler.iter_students(), args.k))
+    elif args.comando == "sotto":
+        _stampa(sotto_soglia(file_handler.iter_students(), args.soglia))
+    else:
+        medie = istogramma(file_handler.iter_students())
+        if not medie.totale:
+            print("Nessuno studente con voti nel registro.")
+            return
+        for p in PERCENTILI:
+            print(f"{p}° percentile\t{medie.percentile(p):.2f}")
+        if args.matricola:
+            studente = file_handler.get_by_matricola(args.matricola)
+            trovato = next(con_media([studente]), None) if studente else None
+            if not trovato:
+                print(f"❌ Matricola {args.matricola} non trovata o senza voti")
+                sys.exit(1)
+            media = trovato[1]
+            print(f"{studente.matricola}\tmedia {media:.2f}\tmeglio del {medie.rango_percentile(media):.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Controllo di integrità del registro con cache persistente dei risultati.
+
+Controlla per ogni studente il formato della matricola, nome e cognome non
+vuoti e i voti fuori intervallo, e sull'intero registro le matricole
+duplicate. I risultati dei controlli sul singolo record sono salvati in
+``<registro>.integrita`` indicizzati per impronta del contenuto: le
+esecuzioni successive ricontrollano solo i record cambiati, e se il registro
+non è cambiato affatto non lo rileggono.
+
+Uso:
+    python -m src.utils.controllo_integrita [--backend sqlite] [--senza-cache]
+
+Stampa un oggetto JSON per riga: uno per ogni problema trovato e per ultimo
+il riepilogo con i tempi. Esce con codice 1 se ci sono problemi. I messaggi
+di diagnostica dei backend sono scritti su stderr.
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from collections import Counter
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+from ..models.studente import Studente
+from .backends import BACKENDS, crea_file_handler
+from .file_handler import FileHandler
+from .input_validator import InputValidator
+from .scrittura_atomica import scrittura_atomica
+
+# Tipi di problema
+MATRICOLA_NON_VALIDA = "matricola_non_valida"
+MATRICOLA_DUPLICATA = "matricola_duplicata"
+NOME_VUOTO = "nome_vuoto"
+COGNOME_VUOTO = "cognome_vuoto"
+VOTO_NON_VALIDO = "voto_non_valido"
+
+VERSIONE_CACHE = 1
+
+
+@dataclass
+class Problema:
+    matricola: str
+    nome: str
+    cognome: str
+    tipo: str
+    dettaglio: str = ""
+
+
+@dataclass
+class RisultatoControllo:
+    studenti: int = 0
+    # Record effettivamente ricontrollati (gli altri vengono dalla cache)
+    ricontrollati: int = 0
+    secondi: float = 0.0
+    problemi: List[Problema] = field(default_factory=list)
+
+    @property
+    def valido(self) -> bool:
+        return not self.problemi
+
+    def riepilogo(self) -> Dict:
+        conteggi = Counter(p.tipo for p in self.problemi)
+        return {
+            "studenti": self.studenti,
+            "ricontrollati": self.ricontrollati,
+            "dalla_cache": self.studenti - self.ricontrollati,
+            "problemi": dict(conteggi),
+            "secondi": round(self.secondi, 3),
+        }
+
+
+def impronta(studente: Studente) -> str:
+    """Impronta del contenuto del record, stabile tra un'esecuzione e l'altra"""
+    contenuto = "\x1f".join((studente.matricola, studente.nome, studente.cognome, repr(list(studente.voti))))
+    return hashlib.blake2b(contenuto.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class ControlloIntegrita:
+    def __init__(self, file_handler: FileHandler, validator: Optional[InputValidator] = None,
+                 usa_cache: bool = True):
+        self.file_handler = file_handler
+        self.validator = validator or InputValidator()
+        self.usa_cache = usa_cache
+        self.percorso_cache = file_handler.file_path + ".integrita"
+
+    def controlla_record(self, studente: Studente) -> List[List[str]]:
+        """Problemi del singolo record come coppie [tipo, dettaglio]"""
+        problemi = []
+        if not self.validator.valida_matricola(studente.matricola):
+            problemi.append([MATRICOLA_NON_VALIDA, studente.matricola])
+        if not self.validator.valida_nome(studente.nome):
+            problemi.append([NOME_VUOTO, ""])
+        if not self.validator.valida_nome(studente.cognome):
+            problemi.append([COGNOME_VUOTO, ""])
+        for voto in studente.voti:
+            if isinstance(voto, bool) or not isinstance(voto, int) or not self.validator.valida_voto(str(voto)):
+                problemi.append([VOTO_NON_VALIDO, repr(voto)])
+        return problemi
+
+    def controlla(self) -> RisultatoControllo:
+        inizio = time.perf_counter()
+        versione = self.file_handler.versione()
+        intestazione = self._carica_cache(solo_intestazione=True) if self.usa_cache else {}
+        if versione is not None and intestazione.get("versione") == list(versione):
+            # Registro invariato dall'ultimo controllo
+            risultato = RisultatoControllo(
+                studenti=intestazione["studenti"],
+                problemi=[Problema(**p) for p in intestazione["problemi"]])
+            risultato.secondi = time.perf_counter() - inizio
+            return risultato
+
+        precedenti: Dict[str, List[List[str]]] = self._carica_cache().get("record", {}) if intestazione else {}
+        record: Dict[str, List[List[str]]] = {}
+        matricole: Counter = Counter()
+        risultato = RisultatoControllo()
+        for studente in self.file_handler.iter_students():
+            risultato.studenti += 1
+            matricole[studente.matricola] += 1
+            chiave = impronta(studente)
+            problemi = precedenti.get(chiave)
+            if problemi is None:
+                problemi = self.controlla_record(studente)
+                risultato.ricontrollati += 1
+            record[chiave] = problemi
+            if problemi:
+                risultato.problemi.extend(Problema(studente.matricola, studente.nome, studente.cognome, tipo, dettaglio)
+                                          for tipo, dettaglio in problemi)
+
+        duplicate = {m: n for m, n in matricole.items() if n > 1}
+        if duplicate:
+            # Di solito non ce ne sono: solo in quel caso serve una seconda lettura
+            for studente in self.file_handler.iter_students():
+                if studente.matricola in duplicate:
+                    risultato.problemi.append(Problema(studente.matricola, studente.nome, studente.cognome,
+                                                       MATRICOLA_DUPLICATA, f"{duplicate[studente.matricola]} studenti"))
+
+        if self.usa_cache:
+            self._salva_cache({
+                "formato": VERSIONE_CACHE,
+                "versione": list(versione) if versione is not None else None,
+                "studenti": risultato.studenti,
+                "problemi": [asdict(p) for p in risultato.problemi],
+            }, record)
+        risultato.secondi = time.perf_counter() - inizio
+        return risultato
+
+    # La cache è in due righe JSON: l'intestazione (versione del registro e
+    # risultato) e le impronte dei record, lette solo se il registro è cambiato.
+
+    def _carica_cache(self, solo_intestazione: bool = False) -> Dict:
+        try:
+            with open(self.percorso_cache, encoding="utf-8") as file:
+                intestazione = json.loads(file.readline())
+                if not isinstance(intestazione, dict) or intestazione.get("formato") != VERSIONE_CACHE:
+                    return {}
+                if not solo_intestazione:
+                    intestazione["record"] = json.loads(file.readline())
+                return intestazione
+        except (OSError, ValueError):
+            return {}
+
+    def _salva_cache(self, intestazione: Dict, record: Dict[str, List[List[str]]]):
+        try:
+            with scrittura_atomica(self.percorso_cache) as file:
+                # json.dumps usa l'encoder in C, json.dump no
+                file.write(json.dumps(intestazione, ensure_ascii=False) + "\n")
+                file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        except OSError as e:
+            # Senza cache il prossimo controllo ricontrolla tutto, nient'altro
+            print(f"⚠️ Impossibile salvare la cache dei controlli: {e}", file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Controlla l'integrità del registro")
+    parser.add_argument("--backend", choices=list(BACKENDS), help="backend del registro (default: REGISTRO_BACKEND o json)")
+    parser.add_argument("--senza-cache", action="store_true", help="ricontrolla tutti i record")
+    args = parser.parse_args(argv)
+
+    # I messaggi dei backend (es. "❌ ...") vanno su stderr: stdout resta JSON, una riga per oggetto
+    with redirect_stdout(sys.stderr):
+        controllo = ControlloIntegrita(crea_file_handler(args.backend), usa_cache=not args.senza_cache)
+        try:
+            risultato = controllo.controlla()
+        except json.JSONDecodeError as e:
+            risultato = None
+            errore = f"registro non leggibile: {e}"
+    if risultato is None:
+        print(json.dumps({"errore": errore}, ensure_ascii=False))
+        sys.exit(1)
+    for problema in risultato.problemi:
+        print(json.dumps(asdict(problema), ensure_ascii=False))
+    print(json.dumps({"riepilogo": risultato.riepilogo()}, ensure_ascii=False))
+    sys.exit(0 if risultato.valido else 1)
+
+
+if __name__ == "__main__":
+    main()
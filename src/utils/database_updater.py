@@ -1,7 +1,61 @@
-from typing import List, Dict, Tuple
+"""
+Correzione delle matricole non valide del registro.
+
+Oltre alla correzione interattiva usata dal menu, offre una modalità batch
+che assegna le nuove matricole da una sequenza deterministica senza
+collisioni, produce un report delle modifiche (anche solo in anteprima) e le
+applica con un'unica scrittura.
+
+Uso:
+    python -m src.utils.database_updater [--applica] [--report modifiche.tsv] [--backend sqlite]
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, TextIO, Tuple
 from src.models.studente import Studente
 from src.utils.input_validator import InputValidator
 from src.utils.file_handler import FileHandler
+from src.utils.backends import BACKENDS, crea_file_handler
+
+INIZIO_SEQUENZA = 10000
+INTESTAZIONE_REPORT = "vecchia\tnuova\tnome\tcognome\n"
+
+
+class Correzione(NamedTuple):
+    vecchia: str
+    nuova: str
+    nome: str
+    cognome: str
+
+
+class GeneratoreMatricole:
+    """
+    Sequenza deterministica di matricole libere.
+
+    Conta a partire da ``inizio`` saltando le matricole già usate; ogni
+    matricola restituita viene aggiunta a quelle usate, quindi non può
+    ripetersi. A parità di registro la sequenza è sempre la stessa: l'anteprima
+    mostra esattamente le matricole che verranno assegnate.
+    """
+
+    def __init__(self, usate: Set[str], validator: InputValidator, inizio: int = INIZIO_SEQUENZA):
+        self.usate = usate
+        self.validator = validator
+        self._prossima = inizio
+
+    def nuova(self, preferita: Optional[str] = None) -> str:
+        """Restituisce ``preferita`` se valida e libera, altrimenti la prossima della sequenza"""
+        if preferita and self.validator.valida_matricola(preferita) and preferita not in self.usate:
+            matricola = preferita
+        else:
+            while str(self._prossima) in self.usate:
+                self._prossima += 1
+            matricola = str(self._prossima)
+        self.usate.add(matricola)
+        return matricola
+
 
 class DatabaseUpdater:
     def __init__(self, file_handler: FileHandler, validator: InputValidator):
@@ -10,42 +64,53 @@ class DatabaseUpdater:
 
     def trova_matricole_non_valide(self) -> List[Studente]:
         """Trova tutti gli studenti con matricole non valide"""
-        studenti = self.file_handler.load_students()
-        return [s for s in studenti if not self.validator.valida_matricola(s.matricola)]
+        return [s for s in self.file_handler.iter_students()
+                if not self.validator.valida_matricola(s.matricola)]
+
+    def _matricole_usate(self) -> Set[str]:
+        return {s.matricola for s in self.file_handler.iter_students()
+                if self.validator.valida_matricola(s.matricola)}
 
     def aggiorna_matricole(self, modalita_interattiva: bool = True) -> Tuple[int, List[Dict]]:
         """
         Controlla e aggiorna le matricole non valide nel database.
-        
+
         Args:
             modalita_interattiva: Se True, chiede conferma per ogni aggiornamento
-            
+
         Returns:
             Tuple[int, List[Dict]]: Numero di matricole aggiornate e lista dei cambiamenti
         """
-        studenti = self.file_handler.load_students()
         matricole_aggiornate = []
         contatore_aggiornamenti = 0
+        try:
+            usate = self._matricole_usate()
+        except json.JSONDecodeError:
+            # Registro non leggibile (messaggio già stampato): nessuna modifica
+            return 0, []
+        generatore = GeneratoreMatricole(usate, self.validator)
 
-        for studente in studenti:
+        for studente in self.file_handler.iter_students():
             if not self.validator.valida_matricola(studente.matricola):
                 vecchia_matricola = studente.matricola
                 print(f"\nStudente trovato con matricola non valida:")
                 print(f"Nome: {studente.nome} {studente.cognome}")
                 print(f"Matricola attuale: {vecchia_matricola}")
-                
+
                 if modalita_interattiva:
                     while True:
                         nuova_matricola = input("Inserisci la nuova matricola (5-10 cifre): ").strip()
-                        if self.validator.valida_matricola(nuova_matricola):
+                        if not self.validator.valida_matricola(nuova_matricola):
+                            print("❌ Matricola non valida! Deve contenere tra 5 e 10 cifre.")
+                        elif nuova_matricola in generatore.usate:
+                            print("❌ Matricola già assegnata a un altro studente!")
+                        else:
+                            generatore.usate.add(nuova_matricola)
                             break
-                        print("❌ Matricola non valida! Deve contenere tra 5 e 10 cifre.")
                 else:
                     # Genera automaticamente una nuova matricola
-                    nuova_matricola = self._genera_nuova_matricola(vecchia_matricola)
+                    nuova_matricola = self._genera_nuova_matricola(vecchia_matricola, generatore)
 
-                # Aggiorna la matricola
-                studente.matricola = nuova_matricola
                 matricole_aggiornate.append({
                     'nome': studente.nome,
                     'cognome': studente.cognome,
@@ -56,18 +121,95 @@ class DatabaseUpdater:
 
         # Salva le modifiche se ci sono stati aggiornamenti
         if contatore_aggiornamenti > 0:
-            if self.file_handler.save_students(studenti):
+            # Coppie nell'ordine del file, non una mappa per valore: studenti con
+            # la stessa matricola non valida ricevono ciascuno la propria
+            modifiche = [(m['vecchia'], m['nuova']) for m in matricole_aggiornate]
+            if self.file_handler.update_matricole(modifiche):
                 print("\n✅ Database aggiornato con successo!")
             else:
                 print("\n❌ Errore durante il salvataggio delle modifiche!")
 
         return contatore_aggiornamenti, matricole_aggiornate
 
-    def _genera_nuova_matricola(self, vecchia_matricola: str) -> str:
+    def pianifica_correzioni(self) -> Iterator[Correzione]:
+        """
+        Restituisce una alla volta le correzioni delle matricole non valide.
+
+        Il registro viene letto una sola volta: in memoria restano l'insieme
+        delle matricole valide e i soli studenti da correggere. Gli studenti
+        che condividono la stessa matricola non valida ricevono ciascuno una
+        matricola diversa, nell'ordine del registro.
+        """
+        usate: Set[str] = set()
+        da_correggere: List[Tuple[str, str, str]] = []
+        for studente in self.file_handler.iter_students():
+            if self.validator.valida_matricola(studente.matricola):
+                usate.add(studente.matricola)
+            else:
+                da_correggere.append((studente.matricola, studente.nome, studente.cognome))
+
+        generatore = GeneratoreMatricole(usate, self.validator)
+        for matricola, nome, cognome in da_correggere:
+            yield Correzione(matricola, self._genera_nuova_matricola(matricola, generatore), nome, cognome)
+
+    def correggi_matricole(self, report: Optional[TextIO] = None, applica: bool = True) -> Tuple[int, bool]:
+        """
+        Corregge tutte le matricole non valide senza interazione.
+
+        Ogni correzione viene scritta su ``report`` (una riga TSV) man mano
+        che viene calcolata; con ``applica`` False il registro non viene
+        modificato (anteprima). Le modifiche sono salvate con un'unica
+        scrittura.
+
+        Returns:
+            Tuple[int, bool]: Numero di matricole corrette e esito del salvataggio
+        """
+        if report:
+            report.write(INTESTAZIONE_REPORT)
+        # Coppie nell'ordine del registro: le matricole ripetute sono rinominate per posizione
+        modifiche: List[Tuple[str, str]] = []
+        try:
+            for correzione in self.pianifica_correzioni():
+                if report:
+                    report.write("\t".join(correzione) + "\n")
+                modifiche.append((correzione.vecchia, correzione.nuova))
+        except json.JSONDecodeError:
+            return 0, False
+
+        if not modifiche or not applica:
+            return len(modifiche), True
+        if not self.file_handler.update_matricole(modifiche):
+            # Su stderr: senza --report lo stdout è il report TSV
+            print("❌ Errore durante il salvataggio delle modifiche!", file=sys.stderr)
+            return len(modifiche), False
+        return len(modifiche), True
+
+    def _genera_nuova_matricola(self, vecchia_matricola: str, generatore: GeneratoreMatricole) -> str:
         """Genera una nuova matricola valida basata sulla vecchia"""
-        # Se la matricola è numerica, aggiunge zeri all'inizio
-        if vecchia_matricola.isdigit():
-            return vecchia_matricola.zfill(5)
-        # Altrimenti genera una nuova matricola casuale
-        import random
-        return str(random.randint(10000, 99999))
\ No newline at end of file
+        # Se la matricola è numerica, prova ad aggiungere zeri all'inizio
+        preferita = vecchia_matricola.zfill(5) if vecchia_matricola.isdigit() else None
+        # Altrimenti (o se già assegnata) prende la prossima matricola libera
+        return generatore.nuova(preferita)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Corregge le matricole non valide del registro")
+    parser.add_argument("--applica", action="store_true", help="salva le correzioni (default: solo anteprima)")
+    parser.add_argument("--report", help="file TSV delle correzioni (default: standard output)")
+    parser.add_argument("--backend", choices=list(BACKENDS), help="backend del registro (default: REGISTRO_BACKEND o json)")
+    args = parser.parse_args(argv)
+
+    updater = DatabaseUpdater(crea_file_handler(args.backend), InputValidator())
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as report:
+            corrette, ok = updater.correggi_matricole(report, args.applica)
+    else:
+        corrette, ok = updater.correggi_matricole(sys.stdout, args.applica)
+    if not ok:
+        sys.exit(1)
+    azione = "corrette" if args.applica else "da correggere (anteprima)"
+    print(f"✅ Matricole {azione}: {corrette}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,443 @@
 import json
-from typing import List
-from ..models.studente import Studente
+import os
+from collections import deque
+from itertools import chain
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type, Union
+from ..models.studente import Studente, unisci_dettagli
+from .blocco_file import BloccoFile
+from .scrittura_atomica import scrittura_atomica
+
+CHUNK_SIZE = 64 * 1024
+
+_encode_string = json.encoder.encode_basestring
+_encode_other = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def _encode_value(value) -> str:
+    """Codifica JSON di un valore semplice, come json.dumps(ensure_ascii=False)"""
+    if type(value) is str:
+        return _encode_string(value)
+    if type(value) is int:
+        return int.__repr__(value)
+    return _encode_other(value)
+
+
+# Rinomine delle matricole: mappa vecchia -> nuova, oppure coppie (vecchia, nuova)
+# quando più studenti hanno la stessa matricola (vedi FileHandler.update_matricole)
+Rinomine = Union[Dict[str, str], Iterable[Tuple[str, str]]]
+
+
+def coppie_rinomine(modifiche: Rinomine) -> List[Tuple[str, str]]:
+    return list(modifiche.items()) if isinstance(modifiche, dict) else list(modifiche)
+
+
+class ConflittoModifiche(Exception):
+    """Alcune modifiche non sono state salvate: un altro operatore ha cambiato gli stessi studenti"""
+
+    def __init__(self, matricole: List[str]):
+        super().__init__(f"Modifiche in conflitto per le matricole: {', '.join(matricole)}")
+        self.matricole = matricole
+
+
+def unisci_record(originale: Optional[Studente], corrente: Optional[Studente],
+                  modificato: Studente) -> Optional[Studente]:
+    """
+    Fusione a tre vie di un record modificato in memoria con quello su disco.
+
+    ``originale`` è il record come era stato letto (None se nuovo), ``corrente``
+    quello attualmente salvato. Restituisce il record da salvare, oppure None
+    se le modifiche sono in conflitto. Voti aggiunti da entrambe le parti allo
+    stesso studente vengono uniti, con i loro dettagli.
+    """
+    if corrente == originale:
+        return modificato
+    if originale is None or corrente is None:
+        return None
+    if not (originale.nome == corrente.nome == modificato.nome and
+            originale.cognome == corrente.cognome == modificato.cognome):
+        return None
+    base = list(originale.voti)
+    if list(corrente.voti[:len(base)]) != base or list(modificato.voti[:len(base)]) != base:
+        return None
+    voti = list(corrente.voti) + list(modificato.voti[len(base):])
+    dettagli = unisci_dettagli(corrente.dettagli, len(corrente.voti), modificato.dettagli, len(base))
+    return Studente(modificato.matricola, modificato.nome, modificato.cognome, voti, dettagli)
+
+
+def contiene_modifica(corrente: Optional[Studente], modificato: Studente) -> bool:
+    """True se il record salvato include già la modifica (stessi dati, voti che iniziano con quelli modificati)"""
+    return (corrente is not None and corrente.nome == modificato.nome and
+            corrente.cognome == modificato.cognome and
+            list(corrente.voti[:len(modificato.voti)]) == list(modificato.voti))
+
 
 class FileHandler:
-    def __init__(self, file_path: str, encoding: str = 'utf-8'):
+    def __init__(self, file_path: str, encoding: str = 'utf-8', student_class: Type = Studente,
+                 journal: bool = False):
         self.file_path = file_path
         self.encoding = encoding
+        # Classe usata per i record letti dal JSON (Studente o StudenteCompatto)
+        self.student_class = student_class
+        # Con il journal, save_changes registra il batch prima di applicarlo:
+        # se il processo si interrompe, il batch viene completato al riavvio
+        self.journal = journal
+        self.journal_path = file_path + ".journal"
+        # Lock condiviso tra i processi che usano lo stesso registro
+        self.lock = BloccoFile(file_path)
+        if journal:
+            self.recupera_journal()
 
     def load_students(self) -> List[Studente]:
         try:
             with open(self.file_path, encoding=self.encoding) as file:
                 data = json.load(file)
-                return [Studente.from_dict(student_data) for student_data in data]
+                return [self.student_class.from_dict(student_data) for student_data in data]
         except (json.JSONDecodeError, FileNotFoundError):
             print("❌ Error in JSON file or file not found.")
             return []
 
-    def save_students(self, students: List[Studente]) -> bool:
+    def versione(self) -> Optional[Tuple[int, int, int]]:
+        """
+        Impronta della versione salvata del registro. Ogni salvataggio sostituisce
+        il file con una rinomina, quindi cambia almeno inode o data di modifica.
+        """
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def percorsi_dati(self) -> List[str]:
+        """File il cui cambiamento modifica il registro (da osservare per le modifiche esterne)"""
+        return [self.file_path]
+
+    def modifiche_esterne(self) -> Optional[Set[str]]:
+        """
+        Matricole cambiate da altri processi dall'ultima lettura, per i backend
+        che sanno individuarle senza rileggere tutto (es. dal log delle
+        operazioni). None se non è possibile: va confrontato l'intero registro.
+        """
+        return None
+
+    def iter_students(self) -> Iterator[Studente]:
+        """
+        Restituisce gli studenti uno alla volta leggendo l'array JSON a blocchi,
+        senza caricare in memoria l'intero documento.
+
+        Se il file non esiste non restituisce nulla; se è malformato solleva
+        json.JSONDecodeError dopo gli studenti già letti, così chi consuma
+        l'iteratore non scambia una parte del registro per il registro intero.
+        """
+        try:
+            with open(self.file_path, encoding=self.encoding) as file:
+                yield from self._parse_array(file, self.student_class)
+        except FileNotFoundError:
+            print("❌ Error in JSON file or file not found.")
+        except json.JSONDecodeError:
+            print("❌ Error in JSON file or file not found.")
+            raise
+
+    @staticmethod
+    def _parse_array(file, student_class: Type = Studente) -> Iterator[Studente]:
+        decoder = json.JSONDecoder()
+        buffer = ""
+        pos = 0
+        eof = False
+
+        def read_more() -> bool:
+            nonlocal buffer, pos, eof
+            chunk = file.read(CHUNK_SIZE)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return True
+
+        def next_token() -> str:
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos].isspace():
+                    pos += 1
+                if pos < len(buffer):
+                    return buffer[pos]
+                if not read_more():
+                    raise json.JSONDecodeError("Unexpected end of file", buffer, pos)
+
+        if next_token() != "[":
+            raise json.JSONDecodeError("Expected '['", buffer, pos)
+        pos += 1
+        if next_token() == "]":
+            return
+        while True:
+            next_token()
+            try:
+                data, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Oggetto spezzato tra due blocchi: legge il resto e riprova
+                if eof or not read_more():
+                    raise
+                continue
+            pos = end
+            yield student_class.from_dict(data)
+            separator = next_token()
+            pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise json.JSONDecodeError("Expected ',' or ']'", buffer, pos - 1)
+
+    def save_students(self, students: Iterable[Studente]) -> bool:
         try:
-            data = [student.to_dict() for student in students]
-            with open(self.file_path, 'w', encoding=self.encoding) as file:
-                json.dump(data, file, ensure_ascii=False, indent=2)
+            with self.lock.esclusivo(), scrittura_atomica(self.file_path, self.encoding) as file:
+                self._write_array(file, students)
             return True
         except Exception as e:
             print(f"❌ Error saving file: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    @staticmethod
+    def _write_array(file, students: Iterable[Studente]):
+        """
+        Scrive gli studenti uno alla volta, con lo stesso formato di
+        json.dump(..., indent=2), senza costruire la lista completa in memoria.
+        """
+        first = True
+        for student in students:
+            file.write("[\n  " if first else ",\n  ")
+            file.write(FileHandler._format_record(student.to_dict()))
+            first = False
+        file.write("[]" if first else "\n]")
+
+    @staticmethod
+    def _format_record(record: Dict) -> str:
+        """
+        Un record con l'indentazione di json.dump(..., indent=2) all'interno
+        dell'array. Con indent il modulo json usa l'encoder in Python puro:
+        i record piatti del registro vengono composti qui codificando i soli
+        valori, molto più velocemente; gli altri passano da json.dumps.
+        """
+        fields = []
+        for key, value in record.items():
+            if type(key) is not str:
+                break
+            if type(value) is list:
+                if not value:
+                    value = "[]"
+                else:
+                    items = list(map(_encode_value, value))
+                    if any(item[0] in "[{" for item in items):
+                        break
+                    value = "[\n      " + ",\n      ".join(items) + "\n    ]"
+            elif isinstance(value, (list, tuple, dict)):
+                break
+            else:
+                value = _encode_value(value)
+            fields.append(_encode_string(key) + ": " + value)
+        else:
+            return "{\n    " + ",\n    ".join(fields) + "\n  }" if fields else "{}"
+        return json.dumps(record, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+
+    def append_students(self, students: List[Studente]) -> bool:
+        """
+        Aggiunge in un'unica scrittura un blocco di studenti nuovi (matricole
+        non presenti). Il registro esistente viene copiato in streaming.
+        """
+        with self.lock.esclusivo():
+            if not os.path.exists(self.file_path):
+                return self.save_students(students)
+            return self.save_students(chain(self._existing_students(), students))
+
+    def _existing_students(self) -> Iterator[Studente]:
+        """
+        Come iter_students, ma un errore di lettura interrompe il salvataggio
+        in corso invece di troncare il registro riscritto in streaming.
+        """
+        with open(self.file_path, encoding=self.encoding) as file:
+            yield from self._parse_array(file, self.student_class)
+
+    def _students_for_update(self) -> Optional[List[Studente]]:
+        """
+        Registro da riscrivere con una modifica: vuoto se il file non esiste,
+        None (salvataggio da annullare) se è malformato. A differenza di
+        load_students un file illeggibile non diventa un registro vuoto.
+        """
+        try:
+            return list(self._existing_students())
+        except FileNotFoundError:
+            return []
+        except json.JSONDecodeError:
+            print("❌ Error in JSON file: changes not saved.")
+            return None
+
+    # Operazioni mirate: i backend indicizzati le ridefiniscono per non
+    # dover rileggere e riscrivere l'intero registro a ogni modifica.
+
+    def get_by_matricola(self, matricola: str) -> Optional[Studente]:
+        return next((s for s in self.load_students() if s.matricola == matricola), None)
+
+    # Le operazioni che rileggono e riscrivono il registro tengono il lock per
+    # tutta la durata, così non perdono modifiche di altri processi.
+
+    def add_student(self, student: Studente) -> bool:
+        with self.lock.esclusivo():
+            students = self._students_for_update()
+            if students is None:
+                return False
+            students.append(student)
+            return self.save_students(students)
+
+    def add_grade(self, matricola: str, voto: int) -> bool:
+        with self.lock.esclusivo():
+            students = self._students_for_update()
+            if students is None:
+                return False
+            student = next((s for s in students if s.matricola == matricola), None)
+            if not student:
+                return False
+            student.voti.append(voto)
+            return self.save_students(students)
+
+    def delete(self, matricola: str) -> bool:
+        with self.lock.esclusivo():
+            students = self._students_for_update()
+            if students is None:
+                return False
+            remaining = [s for s in students if s.matricola != matricola]
+            if len(remaining) == len(students):
+                return False
+            return self.save_students(remaining)
+
+    def update_matricole(self, modifiche: Rinomine) -> bool:
+        """
+        Rinomina le matricole secondo la mappa vecchia -> nuova, oppure secondo
+        coppie (vecchia, nuova): se più studenti hanno la stessa matricola le
+        coppie con quel valore sono usate una per studente, nell'ordine del file.
+        """
+        code: Dict[str, Deque[str]] = {}
+        for vecchia, nuova in coppie_rinomine(modifiche):
+            code.setdefault(vecchia, deque()).append(nuova)
+
+        def renamed() -> Iterator[Studente]:
+            for student in self._existing_students():
+                coda = code.get(student.matricola)
+                if coda:
+                    student.matricola = coda.popleft()
+                yield student
+
+        with self.lock.esclusivo():
+            return self.save_students(renamed())
+
+    def save_changes(self, modified: List[Studente], deleted: List[str],
+                     originals: Optional[Dict[str, Optional[Studente]]] = None) -> bool:
+        """
+        Applica in un solo passaggio i record modificati/aggiunti e quelli cancellati.
+
+        Se ``originals`` contiene i record come erano stati letti, le modifiche
+        vengono fuse con quelle salvate nel frattempo da altri processi (i record
+        in ``modified`` vengono aggiornati con il risultato); quelle
+        inconciliabili sono scartate e segnalate con ConflittoModifiche dopo aver
+        salvato le altre.
+        """
+        with self.lock.esclusivo():
+            if self.journal:
+                try:
+                    with scrittura_atomica(self.journal_path, self.encoding) as file:
+                        json.dump(self._batch_to_dict(modified, deleted, originals), file, ensure_ascii=False)
+                except OSError as e:
+                    print(f"❌ Error writing journal: {e}")
+                    return False
+            ok, conflicts = self._merge_changes(modified, deleted, originals)
+            if not ok:
+                return False
+            if self.journal:
+                os.remove(self.journal_path)
+        if conflicts:
+            raise ConflittoModifiche(conflicts)
+        return True
+
+    def recupera_journal(self) -> bool:
+        """
+        Completa un batch rimasto nel journal da un'esecuzione interrotta.
+
+        Il batch viene sempre riapplicato, anche se nel frattempo altri hanno
+        salvato il registro: i record che contengono già la modifica (il
+        processo si era interrotto dopo il salvataggio) vengono saltati, così
+        i voti non sono aggiunti due volte.
+        """
+        with self.lock.esclusivo():
+            try:
+                with open(self.journal_path, encoding=self.encoding) as file:
+                    batch = json.load(file)
+            except FileNotFoundError:
+                return False
+            except json.JSONDecodeError:
+                # Il journal viene scritto in modo atomico: non dovrebbe mai capitare
+                print("⚠️ Journal non leggibile, ignorato.")
+                os.remove(self.journal_path)
+                return False
+            students = self._students_for_update()
+            if students is None:
+                # Il journal resta: verrà riapplicato quando il registro sarà leggibile
+                return False
+            current = {s.matricola: s for s in students}
+            modified = [student for student in map(self.student_class.from_dict, batch.get("modified", []))
+                        if not contiene_modifica(current.get(student.matricola), student)]
+            originals = {m: self.student_class.from_dict(d) if d is not None else None
+                         for m, d in batch.get("originals", {}).items()} or None
+            ok, conflicts = self._merge_changes(modified, batch.get("deleted", []), originals)
+            if not ok:
+                return False
+            os.remove(self.journal_path)
+        print("✅ Modifiche interrotte recuperate dal journal.")
+        if conflicts:
+            print(f"⚠️ Modifiche scartate per conflitto: {', '.join(conflicts)}")
+        return True
+
+    @staticmethod
+    def _batch_to_dict(modified: List[Studente], deleted: List[str],
+                       originals: Optional[Dict[str, Optional[Studente]]]) -> Dict:
+        batch = {"modified": [s.to_dict() for s in modified], "deleted": list(deleted)}
+        if originals is not None:
+            batch["originals"] = {m: s.to_dict() if s is not None else None for m, s in originals.items()}
+        return batch
+
+    def _merge_changes(self, modified: List[Studente], deleted: List[str],
+                       originals: Optional[Dict[str, Optional[Studente]]] = None) -> Tuple[bool, List[str]]:
+        by_matricola = {s.matricola: s for s in modified}
+        deleted_set = set(deleted)
+        conflicts = []
+        students = []
+        existing = self._students_for_update()
+        if existing is None:
+            return False, []
+        for student in existing:
+            matricola = student.matricola
+            if matricola in deleted_set:
+                deleted_set.discard(matricola)
+                # Non cancella uno studente modificato nel frattempo da altri
+                if originals is not None and student != originals.get(matricola):
+                    conflicts.append(matricola)
+                    students.append(student)
+                continue
+            if matricola in by_matricola:
+                new = by_matricola.pop(matricola)
+                if originals is not None:
+                    merged = unisci_record(originals.get(matricola), student, new)
+                    if merged is None:
+                        conflicts.append(matricola)
+                        new = student
+                    elif merged is not new:
+                        # Il chiamante vede i voti aggiunti dagli altri processi
+                        new.voti[:] = merged.voti
+                        new.dettagli = merged.dettagli
+                students.append(new)
+                continue
+            students.append(student)
+        for matricola, student in by_matricola.items():
+            # Studente modificato qui ma cancellato nel frattempo da altri
+            if originals is not None and originals.get(matricola) is not None:
+                conflicts.append(matricola)
+                continue
+            students.append(student)
+        return self.save_students(students), conflicts
@@ -0,0 +1,246 @@
+"""
+Importazione ed esportazione massiva del registro in formato CSV o JSONL.
+
+Formati supportati:
+- CSV: intestazioni "matricola", "nome", "cognome", "voti" con i voti
+  separati da punto e virgola (es. "24;26;30"); le colonne facoltative
+  "date", "corsi" e "lode" riportano i dettagli dei voti nello stesso modo
+  (elemento vuoto se mancante, lode "1" o "0")
+- JSONL: un oggetto JSON per riga con i campi di Studente.to_dict(),
+  dettagli dei voti compresi
+
+I file vengono letti e scritti in streaming; l'importazione valida ogni riga
+con InputValidator, scarta le matricole duplicate e salva a blocchi con una
+sola scrittura per blocco.
+
+Uso:
+    python -m src.utils.importa_esporta importa studenti.csv [--backend sqlite]
+    python -m src.utils.importa_esporta esporta registro.jsonl [--backend log]
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from ..models.storico_voti import secondi
+from ..models.studente import DettagliVoti, Studente
+from .backends import BACKENDS, crea_file_handler
+from .file_handler import FileHandler
+from .input_validator import InputValidator
+
+DIMENSIONE_BATCH = 10_000
+MAX_ERRORI_RIPORTATI = 100
+CAMPI_CSV = ["matricola", "nome", "cognome", "voti", "date", "corsi", "lode"]
+SEPARATORE_VOTI = ";"
+LODE_CSV = {"1": True, "0": False, "": False}
+
+
+@dataclass
+class RisultatoOperazione:
+    """Riepilogo di un'importazione o esportazione"""
+    righe: int = 0
+    salvati: int = 0
+    duplicati: int = 0
+    scartati: int = 0
+    secondi: float = 0.0
+    # Solo i primi MAX_ERRORI_RIPORTATI errori, per non crescere con il file
+    errori: List[Tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def righe_al_secondo(self) -> float:
+        return self.righe / self.secondi if self.secondi else 0.0
+
+    def aggiungi_errore(self, riga: int, motivo: str):
+        self.scartati += 1
+        if len(self.errori) < MAX_ERRORI_RIPORTATI:
+            self.errori.append((riga, motivo))
+
+
+def _formato(percorso: str) -> str:
+    estensione = os.path.splitext(percorso)[1].lower()
+    if estensione not in (".csv", ".jsonl"):
+        raise ValueError("Formato file non supportato. Utilizzare .csv o .jsonl")
+    return estensione
+
+
+def leggi_righe(percorso: str) -> Iterator[Tuple[int, Dict]]:
+    """Restituisce (numero di riga, dati grezzi) per ogni record del file"""
+    if _formato(percorso) == ".csv":
+        with open(percorso, newline='', encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for riga in reader:
+                voti = (riga.get("voti") or "").strip()
+                dati = {
+                    "matricola": (riga.get("matricola") or "").strip(),
+                    "nome": (riga.get("nome") or "").strip(),
+                    "cognome": (riga.get("cognome") or "").strip(),
+                    "voti": [v.strip() for v in voti.split(SEPARATORE_VOTI)] if voti else [],
+                }
+                date, corsi, lode = ((riga.get(campo) or "").strip() for campo in ("date", "corsi", "lode"))
+                if date or corsi or lode:
+                    dati["date"] = [d.strip() or None for d in date.split(SEPARATORE_VOTI)] if date else []
+                    dati["corsi"] = [c.strip() or None for c in corsi.split(SEPARATORE_VOTI)] if corsi else []
+                    # Un valore diverso da "1", "0" o vuoto resta stringa e viene scartato
+                    dati["lode"] = [LODE_CSV.get(l.strip(), l) for l in lode.split(SEPARATORE_VOTI)] if lode else []
+                yield reader.line_num, dati
+    else:
+        with open(percorso, encoding="utf-8") as f:
+            for numero, riga in enumerate(f, start=1):
+                if not riga.strip():
+                    continue
+                try:
+                    yield numero, json.loads(riga)
+                except json.JSONDecodeError as e:
+                    yield numero, {"_errore": f"JSON non valido: {e.msg}"}
+
+
+def valida_riga(dati: Dict, validator: InputValidator) -> Tuple[Optional[Studente], str]:
+    """Restituisce lo studente costruito dalla riga oppure (None, motivo dello scarto)"""
+    if not isinstance(dati, dict):
+        return None, "record non valido"
+    if "_errore" in dati:
+        return None, dati["_errore"]
+    matricola = str(dati.get("matricola", "")).strip()
+    nome = str(dati.get("nome", "")).strip()
+    cognome = str(dati.get("cognome", "")).strip()
+    if not validator.valida_matricola(matricola):
+        return None, f"matricola non valida: {matricola!r}"
+    if not validator.valida_nome(nome):
+        return None, "nome vuoto"
+    if not validator.valida_nome(cognome):
+        return None, "cognome vuoto"
+    voti = dati.get("voti") or []
+    if not isinstance(voti, list):
+        return None, "voti non in formato lista"
+    for voto in voti:
+        if not validator.valida_voto(str(voto)):
+            return None, f"voto non valido: {voto!r}"
+    voti = [int(v) for v in voti]
+    errore = _errore_dettagli(dati, voti)
+    if errore:
+        return None, errore
+    return Studente(matricola, nome, cognome, voti, DettagliVoti.from_dict(dati)), ""
+
+
+def _errore_dettagli(dati: Dict, voti: List[int]) -> str:
+    """Motivo per cui date, corsi e lode della riga non sono validi ("" se lo sono)"""
+    date, corsi, lode = (dati.get(campo) or [] for campo in ("date", "corsi", "lode"))
+    if not all(isinstance(dettaglio, list) for dettaglio in (date, corsi, lode)):
+        return "dettagli dei voti non in formato lista"
+    if max(len(date), len(corsi), len(lode)) > len(voti):
+        return "più dettagli che voti"
+    for data in date:
+        if data is not None and secondi(data) is None:
+            return f"data non valida: {data!r}"
+    for corso in corsi:
+        if corso is not None and not isinstance(corso, str):
+            return f"corso non valido: {corso!r}"
+    for voto, con_lode in zip(voti, lode):
+        if type(con_lode) is not bool:
+            return f"lode non valida: {con_lode!r}"
+        if con_lode and voto != 30:
+            return "la lode è ammessa solo con 30"
+    return ""
+
+
+def importa(file_handler: FileHandler, percorso: str, validator: Optional[InputValidator] = None,
+            dimensione_batch: int = DIMENSIONE_BATCH) -> RisultatoOperazione:
+    """
+    Importa gli studenti dal file nel registro, un blocco alla volta.
+
+    In memoria restano solo il blocco corrente e l'insieme delle matricole
+    già viste (esistenti o importate), usato per scartare i duplicati.
+    Con il backend JSON ogni blocco riscrive l'intero registro: per file da
+    milioni di righe conviene il backend log o sqlite, o blocchi più grandi.
+    """
+    validator = validator or InputValidator()
+    risultato = RisultatoOperazione()
+    inizio = time.perf_counter()
+    matricole: Set[str] = {s.matricola for s in file_handler.iter_students()}
+    batch: List[Studente] = []
+
+    def salva_batch():
+        if not file_handler.append_students(batch):
+            raise IOError("salvataggio del blocco non riuscito")
+        risultato.salvati += len(batch)
+        batch.clear()
+
+    for numero, dati in leggi_righe(percorso):
+        risultato.righe += 1
+        studente, motivo = valida_riga(dati, validator)
+        if studente is None:
+            risultato.aggiungi_errore(numero, motivo)
+            continue
+        if studente.matricola in matricole:
+            risultato.duplicati += 1
+            continue
+        matricole.add(studente.matricola)
+        batch.append(studente)
+        if len(batch) >= dimensione_batch:
+            salva_batch()
+    if batch:
+        salva_batch()
+    risultato.secondi = time.perf_counter() - inizio
+    return risultato
+
+
+def esporta(file_handler: FileHandler, percorso: str) -> RisultatoOperazione:
+    """Scrive tutti gli studenti del registro nel file, uno alla volta"""
+    formato = _formato(percorso)
+    risultato = RisultatoOperazione()
+    inizio = time.perf_counter()
+    with open(percorso, "w", newline='', encoding="utf-8") as f:
+        if formato == ".csv":
+            writer = csv.writer(f)
+            writer.writerow(CAMPI_CSV)
+            for studente in file_handler.iter_students():
+                dettagli = studente.dettagli
+                writer.writerow([studente.matricola, studente.nome, studente.cognome,
+                                 SEPARATORE_VOTI.join(str(v) for v in studente.voti)] + ([
+                                     SEPARATORE_VOTI.join(d or "" for d in dettagli.date),
+                                     SEPARATORE_VOTI.join(c or "" for c in dettagli.corsi),
+                                     SEPARATORE_VOTI.join("1" if l else "0" for l in dettagli.lode),
+                                 ] if dettagli else ["", "", ""]))
+                risultato.righe += 1
+        else:
+            for studente in file_handler.iter_students():
+                f.write(json.dumps(studente.to_dict(), ensure_ascii=False) + "\n")
+                risultato.righe += 1
+    risultato.salvati = risultato.righe
+    risultato.secondi = time.perf_counter() - inizio
+    return risultato
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Importa o esporta il registro in CSV/JSONL")
+    parser.add_argument("comando", choices=["importa", "esporta"])
+    parser.add_argument("file", help="file .csv o .jsonl")
+    parser.add_argument("--backend", choices=list(BACKENDS), help="backend del registro (default: REGISTRO_BACKEND o json)")
+    parser.add_argument("--batch", type=int, default=DIMENSIONE_BATCH, help="studenti salvati per ogni scrittura")
+    args = parser.parse_args(argv)
+
+    file_handler = crea_file_handler(args.backend)
+    try:
+        if args.comando == "importa":
+            risultato = importa(file_handler, args.file, dimensione_batch=args.batch)
+        else:
+            risultato = esporta(file_handler, args.file)
+    except (ValueError, OSError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"✅ Righe elaborate: {risultato.righe} - salvate: {risultato.salvati} - "
+          f"duplicate: {risultato.duplicati} - scartate: {risultato.scartati}")
+    print(f"⏱️ {risultato.secondi:.2f}s ({risultato.righe_al_secondo:,.0f} righe/s)")
+    for numero, motivo in risultato.errori:
+        print(f"- riga {numero}: {motivo}")
+    if risultato.scartati > len(risultato.errori):
+        print(f"... e altri {risultato.scartati - len(risultato.errori)} errori")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+import json
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from ..models.studente import Studente
+from .file_handler import FileHandler, Rinomine, coppie_rinomine
+
+class LogFileHandler(FileHandler):
+    """
+    Registro salvato come snapshot JSON più un log append-only delle operazioni.
+
+    Lo snapshot è il normale ``registro.txt``; ogni modifica aggiunge una sola
+    riga al file ``<registro>.log`` (operazioni ``add``, ``grade``, ``delete``,
+    ``rename``), quindi il costo di I/O non dipende dalla dimensione del
+    registro. Quando il log supera ``soglia_compattazione`` righe (e il numero
+    di studenti) viene riversato nello snapshot e azzerato, così all'avvio si
+    rilegge solo la coda di operazioni recenti.
+
+    Le operazioni aggiunte al log da altri processi vengono applicate
+    leggendo solo la parte nuova del log (``modifiche_esterne``).
+    """
+
+    def __init__(self, file_path: str, encoding: str = 'utf-8', soglia_compattazione: int = 1000):
+        super().__init__(file_path, encoding)
+        self.log_path = file_path + ".log"
+        self.soglia_compattazione = soglia_compattazione
+        self._indice: Optional[Dict[str, Studente]] = None  # matricola -> studente
+        self._righe_log = 0
+        # Byte del log già applicati all'indice e snapshot da cui è stato letto
+        self._offset_log = 0
+        self._versione_snapshot: Optional[Tuple] = None
+
+    def versione(self) -> Optional[Tuple]:
+        """Come FileHandler.versione, ma cambia anche a ogni operazione aggiunta al log"""
+        snapshot = super().versione()
+        try:
+            stat = os.stat(self.log_path)
+        except FileNotFoundError:
+            return snapshot
+        return (snapshot or ()) + (stat.st_mtime_ns, stat.st_size)
+
+    def percorsi_dati(self) -> List[str]:
+        return [self.file_path, self.log_path]
+
+    def modifiche_esterne(self) -> Optional[Set[str]]:
+        """Applica all'indice le sole operazioni aggiunte al log da altri processi"""
+        if self._indice is None:
+            return None
+        if super().versione() != self._versione_snapshot:
+            # Snapshot riscritto altrove (compattazione): va riletto tutto
+            self._indice = None
+            return None
+        try:
+            dimensione = os.path.getsize(self.log_path)
+        except FileNotFoundError:
+            dimensione = 0
+        if dimensione < self._offset_log:
+            self._indice = None
+            return None
+        if dimensione == self._offset_log:
+            return set()
+        righe, toccate = self._replay_log(self._indice)
+        self._righe_log += righe
+        return toccate
+
+    def load_students(self) -> List[Studente]:
+        try:
+            return [s.copia() for s in self._carica().values()]
+        except json.JSONDecodeError:
+            # Come FileHandler.load_students; le scritture invece falliscono,
+            # per non compattare nello snapshot un registro letto a metà
+            return []
+
+    def iter_students(self) -> Iterator[Studente]:
+        for s in list(self._carica().values()):
+            yield s.copia()
+
+    def save_students(self, students: Iterable[Studente]) -> bool:
+        students = list(students)
+        if not super().save_students(students):
+            return False
+        self._indice = {s.matricola: s.copia() for s in students}
+        self._versione_snapshot = super().versione()
+        self._azzera_log()
+        return True
+
+    def get_by_matricola(self, matricola: str) -> Optional[Studente]:
+        studente = self._carica().get(matricola)
+        return studente.copia() if studente else None
+
+    def add_student(self, student: Studente) -> bool:
+        indice = self._carica()
+        if not self._scrivi_operazione({"op": "add", "studente": student.to_dict()}):
+            return False
+        indice[student.matricola] = student.copia()
+        return self._compatta_se_necessario()
+
+    def add_grade(self, matricola: str, voto: int) -> bool:
+        studente = self._carica().get(matricola)
+        if not studente:
+            return False
+        # La posizione rende il replay idempotente: un voto già presente nello
+        # snapshot (compattazione interrotta) non viene aggiunto due volte.
+        operazione = {"op": "grade", "matricola": matricola, "voto": voto, "pos": len(studente.voti)}
+        if not self._scrivi_operazione(operazione):
+            return False
+        studente.voti.append(voto)
+        return self._compatta_se_necessario()
+
+    def delete(self, matricola: str) -> bool:
+        indice = self._carica()
+        if matricola not in indice:
+            return False
+        if not self._scrivi_operazione({"op": "delete", "matricola": matricola}):
+            return False
+        del indice[matricola]
+        return self._compatta_se_necessario()
+
+    def update_matricole(self, modifiche: Rinomine) -> bool:
+        indice = self._carica()
+        # Nell'indice le matricole sono uniche: vale la prima coppia per ogni valore
+        operazioni, rinominate = [], set()
+        for vecchia, nuova in coppie_rinomine(modifiche):
+            if vecchia in indice and vecchia not in rinominate:
+                rinominate.add(vecchia)
+                operazioni.append({"op": "rename", "da": vecchia, "a": nuova})
+        if not self._scrivi_operazioni(operazioni):
+            return False
+        for operazione in operazioni:
+            self._applica(indice, operazione)
+        return self._compatta_se_necessario()
+
+    def save_changes(self, modified: List[Studente], deleted: List[str],
+                     originals: Optional[Dict[str, Optional[Studente]]] = None) -> bool:
+        # Il log è pensato per un solo processo scrittore: l'indice in memoria
+        # è già lo stato aggiornato, quindi non serve alcuna fusione
+        indice = self._carica()
+        operazioni = [{"op": "delete", "matricola": m} for m in deleted if m in indice]
+        # "add" sostituisce l'intero record: il replay resta idempotente
+        operazioni += [{"op": "add", "studente": s.to_dict()} for s in modified]
+        if not self._scrivi_operazioni(operazioni):
+            return False
+        for matricola in deleted:
+            indice.pop(matricola, None)
+        for student in modified:
+            indice[student.matricola] = student.copia()
+        return self._compatta_se_necessario()
+
+    def append_students(self, students: List[Studente]) -> bool:
+        return self.save_changes(students, [])
+
+    def compatta(self) -> bool:
+        """Riscrive lo snapshot con lo stato corrente e svuota il log"""
+        return self.save_students(list(self._carica().values()))
+
+    def _carica(self) -> Dict[str, Studente]:
+        if self._indice is None:
+            self._versione_snapshot = super().versione()
+            indice = {s.matricola: s for s in super().iter_students()}
+            self._offset_log = 0
+            self._righe_log, _ = self._replay_log(indice)
+            self._indice = indice
+        return self._indice
+
+    def _replay_log(self, indice: Dict[str, Studente]) -> Tuple[int, Set[str]]:
+        """
+        Applica le operazioni del log successive a ``_offset_log``.
+        Restituisce il numero di righe applicate e le matricole toccate.
+        """
+        try:
+            with open(self.log_path, 'rb') as log:
+                log.seek(self._offset_log)
+                dati = log.read()
+        except FileNotFoundError:
+            return 0, set()
+        # Un'ultima riga senza a capo è ancora in scrittura: la si legge la prossima volta
+        fine = dati.rfind(b"\n") + 1
+        self._offset_log += fine
+        righe = 0
+        toccate: Set[str] = set()
+        for riga in dati[:fine].splitlines():
+            try:
+                operazione = json.loads(riga.decode(self.encoding))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                # Riga troncata da un'interruzione durante l'append
+                continue
+            self._applica(indice, operazione)
+            toccate.update(self._matricole(operazione))
+            righe += 1
+        return righe, toccate
+
+    @staticmethod
+    def _matricole(operazione: Dict) -> List[str]:
+        if operazione.get("op") == "add":
+            return [operazione["studente"].get("matricola", "")]
+        if operazione.get("op") == "rename":
+            return [operazione["da"], operazione["a"]]
+        return [operazione.get("matricola", "")]
+
+    @staticmethod
+    def _applica(indice: Dict[str, Studente], operazione: Dict):
+        tipo = operazione.get("op")
+        if tipo == "add":
+            studente = Studente.from_dict(operazione["studente"])
+            indice[studente.matricola] = studente
+        elif tipo == "grade":
+            studente = indice.get(operazione["matricola"])
+            if studente and len(studente.voti) == operazione["pos"]:
+                studente.voti.append(operazione["voto"])
+        elif tipo == "delete":
+            indice.pop(operazione["matricola"], None)
+        elif tipo == "rename":
+            studente = indice.pop(operazione["da"], None)
+            if studente:
+                studente.matricola = operazione["a"]
+                indice[studente.matricola] = studente
+
+    def _scrivi_operazione(self, operazione: Dict) -> bool:
+        return self._scrivi_operazioni([operazione])
+
+    def _scrivi_operazioni(self, operazioni: List[Dict]) -> bool:
+        """Aggiunge le operazioni al log con un'unica scrittura e un solo fsync"""
+        if not operazioni:
+            return True
+        try:
+            with open(self.log_path, 'ab') as log:
+                inizio = log.tell()
+                log.write("".join(json.dumps(op, ensure_ascii=False) + "\n" for op in operazioni)
+                          .encode(self.encoding))
+                log.flush()
+                os.fsync(log.fileno())
+                if inizio == self._offset_log:
+                    # Nessuna operazione di altri processi in mezzo: le nostre
+                    # sono già nell'indice
+                    self._offset_log = log.tell()
+            self._righe_log += len(operazioni)
+            return True
+        except OSError as e:
+            print(f"❌ Error writing log: {e}")
+            return False
+
+    def _compatta_se_necessario(self) -> bool:
+        # Compatta solo quando il log supera anche la dimensione del registro:
+        # il costo della riscrittura resta ammortizzato anche con grandi import
+        if self._righe_log >= max(self.soglia_compattazione, len(self._indice)):
+            return self.compatta()
+        return True
+
+    def _azzera_log(self):
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+        self._righe_log = 0
+        self._offset_log = 0
@@ -0,0 +1,91 @@
+import ctypes
+import ctypes.util
+import os
+import struct
+from typing import Dict, Iterable, Optional, Set
+
+# Costanti di <sys/inotify.h>
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+EVENTI = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENTO = struct.Struct("iIII")  # wd, mask, cookie, len (segue il nome)
+
+
+def _libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    except OSError:
+        return None
+    # inotify esiste solo su Linux
+    return libc if hasattr(libc, "inotify_init1") else None
+
+
+class OsservatoreFile:
+    """
+    Segnala se i file del registro sono stati modificati, con inotify dove
+    disponibile (Linux).
+
+    Si osservano le cartelle e non i file: ogni salvataggio sostituisce il
+    registro con una rinomina, che un watch sul file perderebbe. Senza
+    inotify ``cambiato`` restituisce sempre True e la verifica ricade sul
+    confronto di FileHandler.versione() (un stat).
+    """
+
+    def __init__(self, percorsi: Iterable[str]):
+        self._fd: Optional[int] = None
+        self._nomi: Dict[int, Set[str]] = {}  # watch -> nomi dei file osservati
+        libc = _libc()
+        if libc is None:
+            return
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return
+        for percorso in percorsi:
+            cartella, nome = os.path.split(os.path.abspath(percorso))
+            wd = libc.inotify_add_watch(fd, os.fsencode(cartella), EVENTI)
+            if wd < 0:
+                os.close(fd)
+                return
+            self._nomi.setdefault(wd, set()).add(nome)
+        self._fd = fd
+
+    @property
+    def attivo(self) -> bool:
+        """True se usa inotify, False se ricade sul confronto con stat"""
+        return self._fd is not None
+
+    def cambiato(self) -> bool:
+        """
+        True se dall'ultima chiamata c'è stato un evento sui file osservati
+        (o se inotify non è disponibile). Non si blocca mai.
+        """
+        if self._fd is None:
+            return True
+        cambiato = False
+        while True:
+            try:
+                dati = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return cambiato
+            pos = 0
+            while pos < len(dati):
+                wd, maschera, _, lunghezza = EVENTO.unpack_from(dati, pos)
+                nome = dati[pos + EVENTO.size:pos + EVENTO.size + lunghezza].rstrip(b"\0")
+                pos += EVENTO.size + lunghezza
+                if maschera & IN_Q_OVERFLOW or os.fsdecode(nome) in self._nomi.get(wd, ()):
+                    cambiato = True
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __del__(self):
+        self.close()
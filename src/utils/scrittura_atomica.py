@@ -0,0 +1,49 @@
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Iterator
+
+@contextmanager
+def scrittura_atomica(percorso: str, encoding: str = 'utf-8', binario: bool = False) -> Iterator[IO]:
+    """
+    Apre in scrittura un file temporaneo nella stessa cartella di ``percorso``
+    (in modalità binaria se ``binario``).
+
+    All'uscita dal blocco il contenuto viene forzato su disco (fsync) e il file
+    temporaneo sostituisce atomicamente quello originale: in caso di errore o
+    interruzione il file originale resta intatto.
+
+    Esempio:
+        with scrittura_atomica("registro.txt") as file:
+            json.dump(dati, file)
+    """
+    directory = os.path.dirname(os.path.abspath(percorso))
+    fd, percorso_tmp = tempfile.mkstemp(prefix=os.path.basename(percorso) + ".", suffix=".tmp", dir=directory)
+    try:
+        with (os.fdopen(fd, 'wb') if binario else os.fdopen(fd, 'w', encoding=encoding)) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        # mkstemp crea il file con permessi 0600: mantiene quelli dell'originale
+        if os.path.exists(percorso):
+            shutil.copymode(percorso, percorso_tmp)
+        else:
+            os.chmod(percorso_tmp, 0o644)
+        os.replace(percorso_tmp, percorso)
+    except BaseException:
+        if os.path.exists(percorso_tmp):
+            os.remove(percorso_tmp)
+        raise
+    fsync_directory(directory)
+
+
+def fsync_directory(directory: str):
+    """Rende persistente la rinomina di un file (non disponibile su Windows)"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,307 @@
+"""
+Servizio HTTP/JSON asincrono (solo libreria standard) per il registro.
+
+Endpoint:
+    GET    /studenti?offset=0&limite=100    elenco paginato
+    GET    /studenti/<matricola>            uno studente
+    POST   /studenti                        {"matricola", "nome", "cognome", "voti"?}
+    POST   /studenti/<matricola>/voti       {"voto": 28, "corso"?, "data"?, "lode"?}
+    DELETE /studenti/<matricola>
+
+Le letture sono servite dal Registro in memoria, riallineato prima di ogni
+lettura e di ogni gruppo di scritture con le modifiche salvate da altri
+processi (un solo stat se il file non è cambiato). Le scritture sono messe in
+coda e applicate a gruppi (group commit): tutte quelle arrivate mentre era
+in corso un salvataggio vengono applicate insieme e salvate con un solo
+flush, quindi il numero di scritture su disco non cresce con le richieste.
+Ogni client riceve la risposta solo dopo il salvataggio del suo gruppo.
+
+Uso:
+    python -m src.utils.servizio_registro [--host 127.0.0.1] [--porta 8080] [--backend log]
+"""
+
+import argparse
+import asyncio
+import json
+from http import HTTPStatus
+from itertools import islice
+from typing import Any, Callable, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+from ..models.registro import Registro
+from ..models.storico_voti import secondi
+from ..models.studente import Studente
+from .backends import BACKENDS, crea_file_handler
+from .input_validator import InputValidator
+
+DIMENSIONE_MASSIMA_CORPO = 1024 * 1024
+LIMITE_PAGINA = 100
+
+Risposta = Tuple[int, Any]
+# Modifica da applicare al registro nel gruppo: restituisce la risposta
+Operazione = Callable[[], Risposta]
+
+ERRORE_SALVATAGGIO: Risposta = (HTTPStatus.INTERNAL_SERVER_ERROR, {"errore": "salvataggio non riuscito"})
+ERRORE_CONFLITTO: Risposta = (HTTPStatus.CONFLICT, {"errore": "studente modificato da un altro operatore"})
+
+
+class RichiestaNonValida(Exception):
+    pass
+
+
+class ServizioRegistro:
+    def __init__(self, registro: Registro, validator: Optional[InputValidator] = None,
+                 finestra: float = 0.0):
+        self.registro = registro
+        self.validator = validator or InputValidator()
+        # Attesa (in secondi) prima di chiudere un gruppo, per raccogliere più scritture
+        self.finestra = finestra
+        # (operazione, matricola che modifica, futuro della risposta)
+        self._coda: List[Tuple[Operazione, str, asyncio.Future]] = []
+        self._nuove_scritture: Optional[asyncio.Event] = None
+        self._committer: Optional[asyncio.Task] = None
+        self.salvataggi = 0
+        self.scritture = 0
+
+    async def avvia(self, host: str = "127.0.0.1", porta: int = 8080) -> asyncio.AbstractServer:
+        self._nuove_scritture = asyncio.Event()
+        self._committer = asyncio.create_task(self._salva_a_gruppi())
+        return await asyncio.start_server(self._gestisci_connessione, host, porta)
+
+    async def chiudi(self):
+        if self._committer is not None:
+            self._committer.cancel()
+            try:
+                await self._committer
+            except asyncio.CancelledError:
+                pass
+            self._committer = None
+        # Le scritture rimaste in coda vengono comunque salvate
+        if self._coda:
+            self._applica_gruppo()
+
+    # --- HTTP ---------------------------------------------------------------
+
+    async def _gestisci_connessione(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                riga = await reader.readline()
+                if not riga:
+                    break
+                try:
+                    metodo, url, versione = riga.decode("latin-1").split()
+                except ValueError:
+                    await self._invia(writer, (HTTPStatus.BAD_REQUEST, {"errore": "richiesta non valida"}), False)
+                    break
+                intestazioni = {}
+                while True:
+                    riga = await reader.readline()
+                    if riga in (b"\r\n", b"\n", b""):
+                        break
+                    nome, _, valore = riga.decode("latin-1").partition(":")
+                    intestazioni[nome.strip().lower()] = valore.strip()
+                mantieni = (intestazioni.get("connection", "").lower() != "close"
+                            and versione == "HTTP/1.1")
+                try:
+                    lunghezza = int(intestazioni.get("content-length", 0) or 0)
+                except ValueError:
+                    lunghezza = -1
+                if lunghezza < 0:
+                    await self._invia(writer, (HTTPStatus.BAD_REQUEST, {"errore": "Content-Length non valido"}), False)
+                    break
+                if lunghezza > DIMENSIONE_MASSIMA_CORPO:
+                    await self._invia(writer, (HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"errore": "corpo troppo grande"}), False)
+                    break
+                corpo = await reader.readexactly(lunghezza) if lunghezza else b""
+                await self._invia(writer, await self.gestisci(metodo, url, corpo), mantieni)
+                if not mantieni:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _invia(writer: asyncio.StreamWriter, risposta: Risposta, mantieni: bool):
+        stato, dati = risposta
+        corpo = json.dumps(dati, ensure_ascii=False).encode("utf-8")
+        stato = HTTPStatus(stato)
+        writer.write(f"HTTP/1.1 {stato.value} {stato.phrase}\r\n"
+                     f"Content-Type: application/json; charset=utf-8\r\n"
+                     f"Content-Length: {len(corpo)}\r\n"
+                     f"Connection: {'keep-alive' if mantieni else 'close'}\r\n\r\n".encode("latin-1") + corpo)
+        await writer.drain()
+
+    async def gestisci(self, metodo: str, url: str, corpo: bytes) -> Risposta:
+        """Risposta (stato, dati JSON) a una richiesta"""
+        parti = urlsplit(url)
+        percorso = [unquote(p) for p in parti.path.split("/") if p]
+        try:
+            dati = json.loads(corpo) if corpo else {}
+            if percorso[:1] != ["studenti"] or len(percorso) > 3:
+                return HTTPStatus.NOT_FOUND, {"errore": "risorsa non trovata"}
+            if metodo == "GET":
+                # Le letture vedono anche le modifiche salvate da altri processi
+                self.registro.aggiorna_se_cambiato()
+            if len(percorso) == 1:
+                if metodo == "GET":
+                    return self._elenco(parse_qs(parti.query))
+                if metodo == "POST":
+                    studente = self._nuovo_studente(dati)
+                    return await self._scrivi(studente.matricola, self._aggiunta(studente))
+            elif len(percorso) == 2:
+                if metodo == "GET":
+                    studente = self.registro.trova(percorso[1])
+                    if not studente:
+                        return HTTPStatus.NOT_FOUND, {"errore": "studente non trovato"}
+                    return HTTPStatus.OK, studente.to_dict()
+                if metodo == "DELETE":
+                    return await self._scrivi(percorso[1], self._cancellazione(percorso[1]))
+            elif percorso[2] == "voti" and metodo == "POST":
+                return await self._scrivi(percorso[1], self._nuovo_voto(percorso[1], dati))
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"errore": "metodo non consentito"}
+        except (RichiestaNonValida, ValueError, TypeError) as e:
+            return HTTPStatus.BAD_REQUEST, {"errore": str(e) or "richiesta non valida"}
+
+    # --- Letture ------------------------------------------------------------
+
+    def _elenco(self, parametri) -> Risposta:
+        offset = int(parametri.get("offset", ["0"])[0])
+        limite = min(int(parametri.get("limite", [str(LIMITE_PAGINA)])[0]), LIMITE_PAGINA)
+        if offset < 0 or limite < 0:
+            raise RichiestaNonValida("offset e limite non possono essere negativi")
+        pagina = islice(self.registro, offset, offset + limite)
+        return HTTPStatus.OK, {"totale": len(self.registro),
+                               "studenti": [s.to_dict() for s in pagina]}
+
+    # --- Scritture (validate subito, applicate nel gruppo) -------------------
+
+    def _nuovo_studente(self, dati) -> Studente:
+        if not isinstance(dati, dict):
+            raise RichiestaNonValida("atteso un oggetto JSON")
+        matricola = str(dati.get("matricola", "")).strip()
+        nome = str(dati.get("nome", "")).strip()
+        cognome = str(dati.get("cognome", "")).strip()
+        voti = dati.get("voti", [])
+        if not self.validator.valida_matricola(matricola):
+            raise RichiestaNonValida("matricola non valida")
+        if not self.validator.valida_nome(nome) or not self.validator.valida_nome(cognome):
+            raise RichiestaNonValida("nome e cognome sono obbligatori")
+        if not isinstance(voti, list) or not all(self._voto_valido(v) for v in voti):
+            raise RichiestaNonValida("voti non validi")
+        return Studente(matricola, nome, cognome, list(voti))
+
+    def _aggiunta(self, studente: Studente) -> Operazione:
+        def applica() -> Risposta:
+            if not self.registro.aggiungi(studente):
+                return HTTPStatus.CONFLICT, {"errore": "matricola già esistente"}
+            return HTTPStatus.CREATED, studente.to_dict()
+        return applica
+
+    def _nuovo_voto(self, matricola: str, dati) -> Operazione:
+        if not isinstance(dati, dict):
+            raise RichiestaNonValida("atteso un oggetto JSON")
+        voto, corso, data, lode = dati.get("voto"), dati.get("corso"), dati.get("data"), dati.get("lode", False)
+        if not self._voto_valido(voto):
+            raise RichiestaNonValida("voto non valido (18-30)")
+        if corso is not None and not (isinstance(corso, str) and corso.strip()):
+            raise RichiestaNonValida("corso non valido")
+        if data is not None and secondi(data) is None:
+            raise RichiestaNonValida("data non valida (ISO 8601)")
+        if type(lode) is not bool or (lode and voto != 30):
+            raise RichiestaNonValida("la lode è ammessa solo con 30")
+
+        def applica() -> Risposta:
+            if not self.registro.aggiungi_voto(matricola, voto, corso and corso.strip(), data, lode):
+                return HTTPStatus.NOT_FOUND, {"errore": "studente non trovato"}
+            return HTTPStatus.OK, self.registro.trova(matricola).to_dict()
+        return applica
+
+    def _cancellazione(self, matricola: str) -> Operazione:
+        def applica() -> Risposta:
+            if not self.registro.cancella(matricola):
+                return HTTPStatus.NOT_FOUND, {"errore": "studente non trovato"}
+            return HTTPStatus.OK, {"matricola": matricola}
+        return applica
+
+    def _voto_valido(self, voto) -> bool:
+        return type(voto) is int and self.validator.valida_voto(str(voto))
+
+    async def _scrivi(self, matricola: str, operazione: Operazione) -> Risposta:
+        futuro = asyncio.get_running_loop().create_future()
+        self._coda.append((operazione, matricola, futuro))
+        self._nuove_scritture.set()
+        return await futuro
+
+    async def _salva_a_gruppi(self):
+        while True:
+            await self._nuove_scritture.wait()
+            if self.finestra:
+                await asyncio.sleep(self.finestra)
+            self._applica_gruppo()
+            # Lascia rispondere i client e leggere le nuove richieste
+            await asyncio.sleep(0)
+
+    def _applica_gruppo(self):
+        """Applica tutte le scritture in coda e le salva con un solo flush"""
+        self._nuove_scritture.clear()
+        gruppo, self._coda = self._coda, []
+        if not gruppo:
+            return
+        try:
+            self.registro.aggiorna_se_cambiato()
+            risposte = [operazione() for operazione, _, _ in gruppo]
+            # Il salvataggio blocca il loop, ma avviene una volta per gruppo: le
+            # richieste arrivate nel frattempo formeranno il gruppo successivo
+            if not self.registro.flush():
+                conflitti = set(self.registro.conflitti)
+                if conflitti:
+                    # Le altre modifiche sono state salvate e il registro già ricaricato
+                    risposte = [ERRORE_CONFLITTO if stato < 400 and matricola in conflitti else (stato, dati)
+                                for (_, matricola, _), (stato, dati) in zip(gruppo, risposte)]
+                else:
+                    # Il registro in memoria torna uguale a quello salvato
+                    self.registro.ricarica()
+                    risposte = [ERRORE_SALVATAGGIO if stato < 400 else (stato, dati) for stato, dati in risposte]
+        except Exception as e:
+            # Un errore non deve fermare il committer: il gruppo fallisce, i successivi no
+            print(f"❌ Errore durante il salvataggio del gruppo: {e}")
+            risposte = [ERRORE_SALVATAGGIO] * len(gruppo)
+            try:
+                self.registro.ricarica()
+            except Exception as e:
+                print(f"❌ Errore durante la rilettura del registro: {e}")
+        self.salvataggi += 1
+        self.scritture += len(gruppo)
+        for (_, _, futuro), risposta in zip(gruppo, risposte):
+            if not futuro.done():
+                futuro.set_result(risposta)
+
+
+async def _servi(host: str, porta: int, backend: Optional[str], finestra: float):
+    servizio = ServizioRegistro(Registro(crea_file_handler(backend)), finestra=finestra)
+    server = await servizio.avvia(host, porta)
+    print(f"✅ Servizio del registro su http://{host}:{porta}/studenti")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await servizio.chiudi()
+        print(f"Salvataggi: {servizio.salvataggi} per {servizio.scritture} scritture")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Servizio HTTP/JSON del registro")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8080)
+    parser.add_argument("--backend", choices=list(BACKENDS), help="backend del registro (default: REGISTRO_BACKEND o json)")
+    parser.add_argument("--finestra", type=float, default=0.0,
+                        help="millisecondi di attesa per raccogliere le scritture di un gruppo")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_servi(args.host, args.porta, args.backend, args.finestra / 1000))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import mmap
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from ..models.studente import Studente
+from .file_handler import FileHandler
+from .scrittura_atomica import scrittura_atomica
+
+# Formato dello snapshot (little endian):
+#   intestazione: MAGIC, numero di record, offset di stringhe e voti
+#   tabella dei record a larghezza fissa, ordinata per matricola:
+#     matricola (16 byte, riempita con zeri), nome e cognome come
+#     (offset, lunghezza) nelle stringhe, voti come (indice, numero)
+#   stringhe: nomi e cognomi in UTF-8, ciascuno scritto una sola volta
+#   voti: tutti i voti uno dopo l'altro, interi a 16 bit
+# Data, corso e lode dei voti (Studente.dettagli) non sono esportati.
+MAGIC = b"REGSNAP1"
+INTESTAZIONE = struct.Struct("<8sIQQ")
+RECORD = struct.Struct("<16sIHIHIH")
+LUNGHEZZA_MATRICOLA = 16
+# Limiti dei campi a 16 bit: lunghezza in byte di nome e cognome, numero e valore dei voti
+MAX_LUNGHEZZA = MAX_VOTI = 2 ** 16 - 1
+MIN_VOTO, MAX_VOTO = -2 ** 15, 2 ** 15 - 1
+
+
+def _chiave(matricola: str) -> bytes:
+    chiave = matricola.encode("utf-8")
+    if len(chiave) > LUNGHEZZA_MATRICOLA:
+        raise ValueError(f"Matricola troppo lunga per lo snapshot: {matricola!r}")
+    return chiave.ljust(LUNGHEZZA_MATRICOLA, b"\0")
+
+
+def esporta_snapshot(studenti: Iterable[Studente], percorso: str) -> int:
+    """
+    Scrive gli studenti in uno snapshot binario in sola lettura.
+    Restituisce il numero di studenti scritti.
+    """
+    stringhe = bytearray()
+    posizioni: Dict[str, Tuple[int, int]] = {}
+    voti = array("h")
+    righe: List[Tuple[bytes, int, int, int, int, int, int]] = []
+
+    def stringa(testo: str, matricola: str) -> Tuple[int, int]:
+        if testo not in posizioni:
+            codificata = testo.encode("utf-8")
+            if len(codificata) > MAX_LUNGHEZZA:
+                raise ValueError(f"Nome o cognome troppo lungo per lo snapshot per la matricola {matricola}")
+            posizioni[testo] = (len(stringhe), len(codificata))
+            stringhe.extend(codificata)
+        return posizioni[testo]
+
+    for studente in studenti:
+        if any(type(v) is not int for v in studente.voti):
+            raise ValueError(f"Voti non interi per la matricola {studente.matricola}")
+        if len(studente.voti) > MAX_VOTI:
+            raise ValueError(f"Troppi voti per lo snapshot per la matricola {studente.matricola}")
+        if studente.voti and not MIN_VOTO <= min(studente.voti) <= max(studente.voti) <= MAX_VOTO:
+            raise ValueError(f"Voti fuori intervallo per lo snapshot per la matricola {studente.matricola}")
+        inizio_voti = len(voti)
+        voti.extend(studente.voti)
+        righe.append((_chiave(studente.matricola), *stringa(studente.nome, studente.matricola),
+                      *stringa(studente.cognome, studente.matricola), inizio_voti, len(studente.voti)))
+    if len(stringhe) >= 2 ** 32 or len(voti) >= 2 ** 32:
+        raise ValueError("Registro troppo grande per lo snapshot")
+    righe.sort(key=lambda riga: riga[0])
+    voti_bytes = voti.tobytes() if sys.byteorder == "little" else _little_endian(voti)
+
+    offset_stringhe = INTESTAZIONE.size + RECORD.size * len(righe)
+    offset_voti = offset_stringhe + len(stringhe)
+    with scrittura_atomica(percorso, binario=True) as file:
+        file.write(INTESTAZIONE.pack(MAGIC, len(righe), offset_stringhe, offset_voti))
+        file.write(b"".join(RECORD.pack(*riga) for riga in righe))
+        file.write(stringhe)
+        file.write(voti_bytes)
+    return len(righe)
+
+
+def _little_endian(voti: array) -> bytes:
+    copia = array("h", voti)
+    copia.byteswap()
+    return copia.tobytes()
+
+
+class Snapshot:
+    """
+    Lettore di uno snapshot mappato in memoria (mmap).
+
+    L'apertura legge solo l'intestazione; ``trova`` fa una ricerca binaria
+    sulla tabella dei record e decodifica soltanto il record trovato.
+    """
+
+    def __init__(self, percorso: str):
+        with open(percorso, "rb") as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, self._n, self._offset_stringhe, self._offset_voti = INTESTAZIONE.unpack_from(self._mm, 0)
+        except struct.error:
+            magic = None
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{percorso} non è uno snapshot del registro")
+        self._voti = memoryview(self._mm)[self._offset_voti:].cast("h")
+
+    def close(self):
+        self._voti.release()
+        self._mm.close()
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _matricola(self, i: int) -> bytes:
+        inizio = INTESTAZIONE.size + i * RECORD.size
+        return self._mm[inizio:inizio + LUNGHEZZA_MATRICOLA]
+
+    def _studente(self, i: int) -> Studente:
+        chiave, nome_off, nome_len, cognome_off, cognome_len, voti_off, voti_n = \
+            RECORD.unpack_from(self._mm, INTESTAZIONE.size + i * RECORD.size)
+        stringhe = self._offset_stringhe
+        if sys.byteorder == "little":
+            voti = self._voti[voti_off:voti_off + voti_n].tolist()
+        else:
+            copia = array("h", self._voti[voti_off:voti_off + voti_n].tobytes())
+            copia.byteswap()
+            voti = copia.tolist()
+        return Studente(
+            chiave.rstrip(b"\0").decode("utf-8"),
+            self._mm[stringhe + nome_off:stringhe + nome_off + nome_len].decode("utf-8"),
+            self._mm[stringhe + cognome_off:stringhe + cognome_off + cognome_len].decode("utf-8"),
+            voti)
+
+    def trova(self, matricola: str) -> Optional[Studente]:
+        try:
+            chiave = _chiave(matricola)
+        except ValueError:
+            return None
+        basso, alto = 0, self._n
+        while basso < alto:
+            medio = (basso + alto) // 2
+            if self._matricola(medio) < chiave:
+                basso = medio + 1
+            else:
+                alto = medio
+        if basso < self._n and self._matricola(basso) == chiave:
+            return self._studente(basso)
+        return None
+
+    def __iter__(self) -> Iterator[Studente]:
+        """Tutti gli studenti in ordine di matricola"""
+        for i in range(self._n):
+            yield self._studente(i)
+
+
+class SnapshotFileHandler(FileHandler):
+    """
+    Registro in sola lettura da uno snapshot binario, per i lavori di
+    reportistica: niente parsing JSON e avvio quasi istantaneo.
+    Le operazioni di scrittura non sono supportate e restituiscono False.
+    """
+
+    def __init__(self, file_path: str, encoding: str = 'utf-8'):
+        super().__init__(file_path, encoding)
+        self._snapshot: Optional[Snapshot] = None
+
+    def _apri(self) -> Optional[Snapshot]:
+        if self._snapshot is None:
+            try:
+                self._snapshot = Snapshot(self.file_path)
+            except (OSError, ValueError) as e:
+                print(f"❌ Error opening snapshot: {e}")
+        return self._snapshot
+
+    def close(self):
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+
+    def load_students(self) -> List[Studente]:
+        return list(self.iter_students())
+
+    def iter_students(self) -> Iterator[Studente]:
+        snapshot = self._apri()
+        if snapshot is not None:
+            yield from snapshot
+
+    def get_by_matricola(self, matricola: str) -> Optional[Studente]:
+        snapshot = self._apri()
+        return snapshot.trova(matricola) if snapshot is not None else None
+
+    def _sola_lettura(self, *args, **kwargs) -> bool:
+        print("❌ Lo snapshot è in sola lettura")
+        return False
+
+    save_students = append_students = add_student = add_grade = delete = _sola_lettura
+    update_matricole = save_changes = _sola_lettura
+
+
+if __name__ == "__main__":
+    # Uso: python -m src.utils.snapshot_file_handler registro.txt registro.snap
+    if len(sys.argv) != 3:
+        print("Uso: python -m src.utils.snapshot_file_handler <registro.json> <registro.snap>")
+        sys.exit(1)
+    try:
+        n = esporta_snapshot(FileHandler(sys.argv[1]).iter_students(), sys.argv[2])
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"✅ Esportati {n} studenti in {sys.argv[2]}")
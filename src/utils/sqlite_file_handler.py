@@ -0,0 +1,254 @@
+import json
+import sqlite3
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional
+from ..models.studente import DettagliVoti, Studente
+from .file_handler import ConflittoModifiche, FileHandler, Rinomine, coppie_rinomine, unisci_record
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    id INTEGER PRIMARY KEY,
+    matricola TEXT NOT NULL UNIQUE,
+    nome TEXT NOT NULL,
+    cognome TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS grades (
+    student_id INTEGER NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    pos INTEGER NOT NULL,
+    voto INTEGER NOT NULL,
+    data TEXT,
+    corso TEXT,
+    lode INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (student_id, pos)
+);
+"""
+
+# Colonne dei dettagli dei voti, aggiunte ai database creati prima dello storico
+COLONNE_DETTAGLI = {"data": "TEXT", "corso": "TEXT", "lode": "INTEGER NOT NULL DEFAULT 0"}
+
+
+def _aggiungi_voto(studente: Studente, voto: int, data: Optional[str], corso: Optional[str], lode: int):
+    studente.voti.append(voto)
+    if data or corso or lode:
+        if studente.dettagli is None:
+            studente.dettagli = DettagliVoti()
+        studente.dettagli.imposta(len(studente.voti) - 1, data, corso, bool(lode))
+
+class SqliteFileHandler(FileHandler):
+    """
+    Registro salvato in un database SQLite con tabelle indicizzate
+    ``students`` (per matricola) e ``grades`` (per studente).
+
+    Espone lo stesso contratto di FileHandler; le operazioni mirate toccano
+    solo le righe interessate invece di caricare l'intero registro.
+    """
+
+    def __init__(self, file_path: str, encoding: str = 'utf-8'):
+        super().__init__(file_path, encoding)
+        self.conn = sqlite3.connect(file_path, timeout=30)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+        colonne = {riga[1] for riga in self.conn.execute("PRAGMA table_info(grades)")}
+        with self.conn:
+            for nome, tipo in COLONNE_DETTAGLI.items():
+                if nome not in colonne:
+                    self.conn.execute(f"ALTER TABLE grades ADD COLUMN {nome} {tipo}")
+
+    def close(self):
+        self.conn.close()
+
+    def load_students(self) -> List[Studente]:
+        studenti = {
+            student_id: Studente(matricola, nome, cognome, [])
+            for student_id, matricola, nome, cognome in self.conn.execute(
+                "SELECT id, matricola, nome, cognome FROM students ORDER BY id")
+        }
+        for student_id, voto, data, corso, lode in self.conn.execute(
+                "SELECT student_id, voto, data, corso, lode FROM grades ORDER BY student_id, pos"):
+            if student_id in studenti:
+                _aggiungi_voto(studenti[student_id], voto, data, corso, lode)
+        return list(studenti.values())
+
+    def iter_students(self) -> Iterator[Studente]:
+        corrente: Optional[Studente] = None
+        corrente_id = None
+        for student_id, matricola, nome, cognome, voto, data, corso, lode in self.conn.execute(
+                "SELECT s.id, s.matricola, s.nome, s.cognome, g.voto, g.data, g.corso, g.lode "
+                "FROM students s LEFT JOIN grades g ON g.student_id = s.id ORDER BY s.id, g.pos"):
+            if student_id != corrente_id:
+                if corrente:
+                    yield corrente
+                corrente, corrente_id = Studente(matricola, nome, cognome, []), student_id
+            if voto is not None:
+                _aggiungi_voto(corrente, voto, data, corso, lode)
+        if corrente:
+            yield corrente
+
+    def save_students(self, students: Iterable[Studente]) -> bool:
+        try:
+            with self.conn:
+                self.conn.execute("DELETE FROM grades")
+                self.conn.execute("DELETE FROM students")
+                self._inserisci(students)
+            return True
+        except sqlite3.Error as e:
+            print(f"❌ Error saving database: {e}")
+            return False
+
+    def get_by_matricola(self, matricola: str) -> Optional[Studente]:
+        riga = self.conn.execute(
+            "SELECT id, nome, cognome FROM students WHERE matricola = ?", (matricola,)).fetchone()
+        if not riga:
+            return None
+        student_id, nome, cognome = riga
+        studente = Studente(matricola, nome, cognome, [])
+        for voto, data, corso, lode in self.conn.execute(
+                "SELECT voto, data, corso, lode FROM grades WHERE student_id = ? ORDER BY pos", (student_id,)):
+            _aggiungi_voto(studente, voto, data, corso, lode)
+        return studente
+
+    def add_student(self, student: Studente) -> bool:
+        return self.append_students([student])
+
+    def append_students(self, students: List[Studente]) -> bool:
+        try:
+            with self.conn:
+                self._inserisci(students)
+            return True
+        except sqlite3.Error as e:
+            print(f"❌ Error saving database: {e}")
+            return False
+
+    def add_grade(self, matricola: str, voto: int) -> bool:
+        try:
+            with self.conn:
+                riga = self.conn.execute(
+                    "SELECT id FROM students WHERE matricola = ?", (matricola,)).fetchone()
+                if not riga:
+                    return False
+                self.conn.execute(
+                    "INSERT INTO grades (student_id, pos, voto) "
+                    "SELECT ?, COALESCE(MAX(pos) + 1, 0), ? FROM grades WHERE student_id = ?",
+                    (riga[0], voto, riga[0]))
+            return True
+        except sqlite3.Error as e:
+            print(f"❌ Error saving database: {e}")
+            return False
+
+    def delete(self, matricola: str) -> bool:
+        try:
+            with self.conn:
+                cursore = self.conn.execute("DELETE FROM students WHERE matricola = ?", (matricola,))
+            return cursore.rowcount > 0
+        except sqlite3.Error as e:
+            print(f"❌ Error saving database: {e}")
+            return False
+
+    def update_matricole(self, modifiche: Rinomine) -> bool:
+        try:
+            with self.conn:
+                # Le matricole sono uniche: le coppie ripetute non trovano più il record
+                self.conn.executemany(
+                    "UPDATE students SET matricola = ? WHERE matricola = ?",
+                    [(nuova, vecchia) for vecchia, nuova in coppie_rinomine(modifiche)])
+            return True
+        except sqlite3.Error as e:
+            print(f"❌ Error saving database: {e}")
+            return False
+
+    def save_changes(self, modified: List[Studente], deleted: List[str],
+                     originals: Optional[Dict[str, Optional[Studente]]] = None) -> bool:
+        conflicts = []
+        try:
+            with self.conn:
+                # BEGIN IMMEDIATE blocca gli altri scrittori fino al commit:
+                # i record letti per la fusione non possono cambiare nel frattempo
+                self.conn.execute("BEGIN IMMEDIATE")
+                if originals is not None:
+                    modified, deleted, conflicts = self._unisci(modified, deleted, originals)
+                self.conn.executemany("DELETE FROM students WHERE matricola = ?",
+                                      [(m,) for m in deleted] + [(s.matricola,) for s in modified])
+                self._inserisci(modified)
+        except sqlite3.Error as e:
+            print(f"❌ Error saving database: {e}")
+            return False
+        if conflicts:
+            raise ConflittoModifiche(conflicts)
+        return True
+
+    def _unisci(self, modified: List[Studente], deleted: List[str],
+                originals: Dict[str, Optional[Studente]]):
+        da_salvare, da_cancellare, conflicts = [], [], []
+        for studente in modified:
+            unito = unisci_record(originals.get(studente.matricola),
+                                  self.get_by_matricola(studente.matricola), studente)
+            if unito is None:
+                conflicts.append(studente.matricola)
+                continue
+            if unito is not studente:
+                studente.voti[:] = unito.voti
+                studente.dettagli = unito.dettagli
+            da_salvare.append(studente)
+        for matricola in deleted:
+            corrente = self.get_by_matricola(matricola)
+            if corrente is not None and corrente != originals.get(matricola):
+                conflicts.append(matricola)
+            else:
+                da_cancellare.append(matricola)
+        return da_salvare, da_cancellare, conflicts
+
+    def _inserisci(self, students: Iterable[Studente]):
+        for student in students:
+            cursore = self.conn.execute(
+                "INSERT INTO students (matricola, nome, cognome) VALUES (?, ?, ?)",
+                (student.matricola, student.nome, student.cognome))
+            self.conn.executemany(
+                "INSERT INTO grades (student_id, pos, voto, data, corso, lode) VALUES (?, ?, ?, ?, ?, ?)",
+                [(cursore.lastrowid, pos, v.valore, v.data, v.corso, int(v.lode))
+                 for pos, v in enumerate(student.voti_dettagliati())])
+
+
+def importa_da_json(handler: SqliteFileHandler, studenti: Iterable[Studente], dimensione_batch: int = 5000) -> int:
+    """
+    Importa gli studenti nel database con una transazione ogni ``dimensione_batch`` record.
+
+    Le matricole già presenti vengono saltate. Restituisce il numero di studenti importati.
+    """
+    importati = 0
+    batch: List[Studente] = []
+
+    def scrivi_batch():
+        nonlocal importati
+        with handler.conn:
+            for studente in batch:
+                if handler.conn.execute("SELECT 1 FROM students WHERE matricola = ?",
+                                        (studente.matricola,)).fetchone():
+                    print(f"⚠️ Matricola duplicata saltata: {studente.matricola}")
+                    continue
+                handler._inserisci([studente])
+                importati += 1
+        batch.clear()
+
+    for studente in studenti:
+        batch.append(studente)
+        if len(batch) >= dimensione_batch:
+            scrivi_batch()
+    if batch:
+        scrivi_batch()
+    return importati
+
+
+if __name__ == "__main__":
+    # Uso: python -m src.utils.sqlite_file_handler registro.txt registro.db
+    if len(sys.argv) != 3:
+        print("Uso: python -m src.utils.sqlite_file_handler <registro.json> <registro.db>")
+        sys.exit(1)
+    sorgente = FileHandler(sys.argv[1])
+    destinazione = SqliteFileHandler(sys.argv[2])
+    try:
+        n = importa_da_json(destinazione, sorgente.iter_students())
+    except json.JSONDecodeError:
+        sys.exit(1)
+    finally:
+        destinazione.close()
+    print(f"✅ Importati {n} studenti in {sys.argv[2]}")
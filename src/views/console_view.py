@@ -1,8 +1,15 @@
+import sys
+from bisect import bisect_left
 from colorama import Fore, Style
 from tabulate import tabulate
-from src.models.studente import Studente
+from src.models.aggregati_voti import AggregatiVoti
+from src.models.studente import Studente, Voto
 from src.utils.matematici import calcola_media
-from typing import List, Optional
+from src.utils.archivio_voti import ArchivioVoti, FASCIA_BASSA, FASCIA_MEDIA, FASCIA_ALTA, fascia, np
+from typing import Iterable, List, Mapping, Optional, TextIO, Tuple
+
+DIMENSIONE_PAGINA = 20
+COLORI_FASCE = {FASCIA_BASSA: Fore.RED, FASCIA_MEDIA: Fore.RESET, FASCIA_ALTA: Fore.GREEN}
 
 class ConsoleView:
     @staticmethod
@@ -12,29 +19,159 @@ class ConsoleView:
         print("[2] Aggiungi studente")
         print("[3] Aggiungi voto")
         print("[4] Cancella studente")
+        print("[6] Cerca studente per nome")
+        print("[7] Classifiche e percentili")
+        print("[8] Storico voti (per mese e per corso)")
         print("[0] Esci")
         return input("\nScelta: ").strip()
 
     @staticmethod
-    def stampa_studenti(studenti: List[Studente]):
-        # Ordina gli studenti per matricola
-        studenti_ordinati = sorted(studenti, key=lambda s: s.matricola)
-        
+    def _medie_e_fasce(studenti: List[Studente],
+                       aggregati: Optional[Mapping[str, AggregatiVoti]] = None) -> Tuple[List[float], List[int]]:
+        if aggregati is not None:
+            # Medie già aggiornate dal Registro: basta leggerle
+            medie = [aggregati[s.matricola].media for s in studenti]
+            return medie, [fascia(m) for m in medie]
+        if np is not None:
+            # Medie e fasce di colore calcolate in un unico passaggio vettoriale
+            archivio = ArchivioVoti.da_studenti(studenti)
+            medie = archivio.medie()
+            return medie.tolist(), archivio.fasce(medie).tolist()
+        medie = [calcola_media(s.voti) for s in studenti]
+        return medie, [fascia(m) for m in medie]
+
+    @staticmethod
+    def stampa_studenti(studenti: Iterable[Studente], aggregati: Optional[Mapping[str, AggregatiVoti]] = None):
         headers = ["Matricola", "Nome", "Cognome", "Media Voti"]
-        rows = []
-        for studente in studenti_ordinati:  # Usa la lista ordinata invece di quella originale
-            media = calcola_media(studente.voti)
-            color = (Fore.RED if media < 24 else 
-                    Fore.GREEN if media >= 27 else 
-                    Fore.RESET)
-            rows.append([
+        studenti = list(studenti)
+        medie, fasce = ConsoleView._medie_e_fasce(studenti, aggregati)
+
+        rows = [
+            [
                 studente.matricola,
                 studente.nome,
                 studente.cognome,
-                f"{color}{media:.2f}{Fore.RESET}"
-            ])
+                f"{COLORI_FASCE[fascia]}{media:.2f}{Fore.RESET}"
+            ]
+            for studente, media, fascia in zip(studenti, medie, fasce)
+        ]
+        # Ordina le righe per matricola
+        rows.sort(key=lambda row: row[0])
         print(tabulate(rows, headers=headers, tablefmt="grid"))
-        
+
+    @staticmethod
+    def stampa_classifica(classifica: Iterable[Tuple[Studente, float]]):
+        """Studenti con la loro media nell'ordine dato, con la posizione"""
+        rows = [
+            [posizione, studente.matricola, studente.nome, studente.cognome,
+             f"{COLORI_FASCE[fascia(media)]}{media:.2f}{Fore.RESET}"]
+            for posizione, (studente, media) in enumerate(classifica, start=1)
+        ]
+        if not rows:
+            print("Nessuno studente trovato.")
+            return
+        print(tabulate(rows, headers=["#", "Matricola", "Nome", "Cognome", "Media Voti"], tablefmt="grid"))
+
+    @staticmethod
+    def stampa_voti_storico(voti: Iterable[Tuple[Studente, Voto]]):
+        """Voti con data, corso e lode, nell'ordine dato"""
+        rows = [
+            [voto.data.replace("T", " ") if voto.data else "N/D", voto.corso or "N/D",
+             studente.matricola, studente.nome, studente.cognome,
+             f"{voto.valore}{' e lode' if voto.lode else ''}"]
+            for studente, voto in voti
+        ]
+        if not rows:
+            print("Nessun voto trovato.")
+            return
+        print(tabulate(rows, headers=["Data", "Corso", "Matricola", "Nome", "Cognome", "Voto"], tablefmt="grid"))
+
+    @staticmethod
+    def stampa_studenti_paginata(studenti: Iterable[Studente], dimensione_pagina: int = DIMENSIONE_PAGINA,
+                                 aggregati: Optional[Mapping[str, AggregatiVoti]] = None,
+                                 output: Optional[TextIO] = None):
+        """
+        Mostra gli studenti ordinati per matricola una pagina alla volta.
+
+        Le larghezze delle colonne sono calcolate una sola volta, quindi ogni
+        pagina costa solo le righe visibili. Comandi: [n] pagina successiva,
+        [p] precedente, [v <matricola>] vai alla matricola, [q] esci.
+        La tabella è scritta su ``output`` (default: sys.stdout al momento della chiamata).
+        """
+        if output is None:
+            output = sys.stdout
+        studenti = list(studenti)
+        if not studenti:
+            print("Nessuno studente presente nel registro.", file=output)
+            return
+        medie, fasce = ConsoleView._medie_e_fasce(studenti, aggregati)
+        ordine = sorted(range(len(studenti)), key=lambda i: studenti[i].matricola)
+        matricole_ordinate = [studenti[i].matricola for i in ordine]
+
+        headers = ["Matricola", "Nome", "Cognome", "Media Voti"]
+        larghezze = [
+            max(len(headers[0]), max(map(len, matricole_ordinate))),
+            max(len(headers[1]), max(len(s.nome) for s in studenti)),
+            max(len(headers[2]), max(len(s.cognome) for s in studenti)),
+            max(len(headers[3]), 6),
+        ]
+        separatore = "+" + "+".join("-" * (l + 2) for l in larghezze) + "+"
+        separatore_intestazione = separatore.replace("-", "=")
+
+        pagine = (len(studenti) + dimensione_pagina - 1) // dimensione_pagina
+        pagina = 0
+        while True:
+            print(separatore, file=output)
+            print(ConsoleView._riga_tabella(headers, larghezze), file=output)
+            print(separatore_intestazione, file=output)
+            for i in ordine[pagina * dimensione_pagina:(pagina + 1) * dimensione_pagina]:
+                studente = studenti[i]
+                media = f"{medie[i]:.2f}".rjust(larghezze[3])
+                print(ConsoleView._riga_tabella(
+                    [studente.matricola, studente.nome, studente.cognome,
+                     f"{COLORI_FASCE[fasce[i]]}{media}{Fore.RESET}"],
+                    larghezze), file=output)
+            print(separatore, file=output)
+            print(f"Pagina {pagina + 1}/{pagine} - {len(studenti)} studenti", file=output)
+
+            comando = input("[n] Successiva  [p] Precedente  [v <matricola>] Vai a  [q] Esci: ").strip()
+            if comando.lower() == "q":
+                break
+            elif comando.lower() == "n":
+                pagina = min(pagina + 1, pagine - 1)
+            elif comando.lower() == "p":
+                pagina = max(pagina - 1, 0)
+            elif comando.lower().startswith("v"):
+                matricola = comando[1:].strip()
+                posizione = bisect_left(matricole_ordinate, matricola)
+                if posizione < len(matricole_ordinate) and matricole_ordinate[posizione] == matricola:
+                    pagina = posizione // dimensione_pagina
+                else:
+                    print(f"❌ Matricola {matricola} non trovata", file=output)
+            else:
+                print("⚠️ Comando non valido!", file=output)
+
+    @staticmethod
+    def _riga_tabella(celle: List[str], larghezze: List[int]) -> str:
+        # L'ultima colonna può contenere codici colore: è già allineata dal chiamante
+        testo = [c.ljust(l) for c, l in zip(celle[:-1], larghezze)] + [celle[-1].rjust(larghezze[-1])]
+        return "| " + " | ".join(testo) + " |"
+
+    @staticmethod
+    def stampa_studenti_testo(studenti: Iterable[Studente], output: Optional[TextIO] = None,
+                              aggregati: Optional[Mapping[str, AggregatiVoti]] = None):
+        """
+        Scrive una riga di testo semplice per studente man mano che li legge,
+        senza colori né ordinamento: adatta a essere rediretta su file.
+        Senza ``output`` scrive su sys.stdout al momento della chiamata.
+        """
+        if output is None:
+            output = sys.stdout
+        output.write("Matricola\tNome\tCognome\tMedia Voti\n")
+        for studente in studenti:
+            media = aggregati[studente.matricola].media if aggregati is not None else calcola_media(studente.voti)
+            output.write(f"{studente.matricola}\t{studente.nome}\t{studente.cognome}\t{media:.2f}\n")
+
     @staticmethod
     def richiedi_dati_studente(validator: 'InputValidator') -> Optional[Studente]:
         """Richiede all'utente i dati per un nuovo studente"""
@@ -0,0 +1,31 @@
+import unittest
+import os
+import sys
+import math
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.archivio_voti import ArchivioVoti, FASCIA_BASSA, FASCIA_MEDIA, FASCIA_ALTA, np
+from src.utils.matematici import calcola_media
+
+@unittest.skipIf(np is None, "numpy non installato")
+class TestArchivioVoti(unittest.TestCase):
+    def setUp(self):
+        self.liste = [[26], [], [27, 20, 21], [30, 28], [], ["x", "27", 18]]
+        self.archivio = ArchivioVoti.da_liste(self.liste)
+
+    def test_medie_uguali_a_calcola_media(self):
+        self.assertEqual(self.archivio.medie().tolist(), [calcola_media(v) for v in self.liste])
+        self.assertEqual(self.archivio.conteggi().tolist(), [1, 0, 3, 2, 0, 1])
+
+    def test_minimi_massimi_e_fasce(self):
+        minimi = self.archivio.minimi().tolist()
+        self.assertEqual([m for m in minimi if not math.isnan(m)], [26, 20, 28, 18])
+        self.assertTrue(math.isnan(minimi[1]) and math.isnan(minimi[4]))
+        self.assertEqual(self.archivio.massimi().tolist()[2], 27)
+        self.assertEqual(self.archivio.fasce().tolist(),
+                         [FASCIA_MEDIA, FASCIA_BASSA, FASCIA_BASSA, FASCIA_ALTA, FASCIA_BASSA, FASCIA_BASSA])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+import os
+import sys
+import random
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.indice_medie import IndiceMedie
+from src.models.studente import Studente
+from src.utils.classifica import istogramma, migliori, sotto_soglia
+
+class TestClassifica(unittest.TestCase):
+    def setUp(self):
+        rnd = random.Random(7)
+        self.studenti = [Studente(str(10000 + i), "Nome", "Cognome", [rnd.randint(18, 30) for _ in range(3)])
+                         for i in range(500)]
+        self.studenti.append(Studente("99999", "Senza", "Voti", []))
+
+    def test_heap_e_indice_concordano_con_ordinamento_completo(self):
+        medie = sorted(((sum(s.voti) / 3, s.matricola) for s in self.studenti if s.voti), reverse=True)
+        indice = IndiceMedie.da_medie((m, media) for media, m in medie)
+
+        self.assertEqual([media for _, media in migliori(self.studenti, 10)], [media for media, _ in medie[:10]])
+        self.assertEqual([media for _, media in indice.migliori(10)], [media for media, _ in medie[:10]])
+        self.assertEqual([s.matricola for s, _ in sotto_soglia(self.studenti, 22)],
+                         [m for m, _ in indice.sotto(22)])
+
+    def test_percentili_da_istogramma(self):
+        medie = sorted(sum(s.voti) / 3 for s in self.studenti if s.voti)
+        isto = istogramma(self.studenti)
+        self.assertEqual(isto.totale, 500)
+        self.assertAlmostEqual(isto.percentile(50), medie[249], places=2)
+        self.assertAlmostEqual(isto.percentile(100), medie[-1], places=2)
+        self.assertEqual(isto.rango_percentile(medie[0]), 0.0)
+
+    def test_aggiornamenti_tengono_l_indice_ordinato(self):
+        rnd = random.Random(3)
+        indice = IndiceMedie()
+        medie = {}
+        for _ in range(2000):
+            matricola = str(rnd.randrange(50))
+            medie[matricola] = rnd.choice([medie.get(matricola, 18), rnd.randint(18, 30)])
+            indice.aggiorna(matricola, medie[matricola])
+        attese = sorted((media, m) for m, media in medie.items())
+        self.assertEqual(indice.migliori(len(medie)), [(m, media) for media, m in reversed(attese)])
+        self.assertEqual(indice.istogramma.totale, len(medie))
+
+if __name__ == '__main__':
+    unittest.main()
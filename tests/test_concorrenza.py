@@ -0,0 +1,56 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+import multiprocessing
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.registro import Registro
+from src.models.studente import Studente
+from src.utils.blocco_file import fcntl
+from src.utils.file_handler import FileHandler
+
+N_PROCESSI = 6
+VOTI_PER_PROCESSO = 20
+MATRICOLE = ["10001", "10002", "10003"]
+
+
+def operatore(percorso: str, indice: int):
+    """Simula un operatore che aggiunge voti senza mai ricaricare il registro"""
+    registro = Registro(FileHandler(percorso))
+    for i in range(VOTI_PER_PROCESSO):
+        # Gli operatori si sovrappongono sugli stessi studenti
+        matricola = MATRICOLE[(indice + i) % len(MATRICOLE)]
+        registro.aggiungi_voto(matricola, 18 + (indice + i) % 13)
+        if not registro.flush():
+            raise RuntimeError("flush fallito")
+
+
+@unittest.skipIf(fcntl is None, "lock consultivi non disponibili su questa piattaforma")
+class TestAccessoConcorrente(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.percorso = os.path.join(self.tmp_dir.name, "registro.txt")
+        FileHandler(self.percorso).save_students([Studente(m, "Nome", "Cognome", []) for m in MATRICOLE])
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_nessun_voto_perso(self):
+        processi = [multiprocessing.Process(target=operatore, args=(self.percorso, i))
+                    for i in range(N_PROCESSI)]
+        for p in processi:
+            p.start()
+        for p in processi:
+            p.join(60)
+            self.assertEqual(p.exitcode, 0)
+
+        with open(self.percorso, encoding="utf-8") as f:
+            voti_salvati = sum(len(s["voti"]) for s in json.load(f))
+        self.assertEqual(voti_salvati, N_PROCESSI * VOTI_PER_PROCESSO)
+
+if __name__ == '__main__':
+    unittest.main()
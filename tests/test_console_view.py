@@ -0,0 +1,70 @@
+import unittest
+import io
+import os
+import sys
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.studente import Studente
+from src.views.console_view import ConsoleView
+
+def righe_studenti(testo):
+    return [riga.split(" | ")[0].strip("| ") for riga in testo.splitlines()
+            if riga.startswith("| 1")]
+
+class TestStampaStudentiPaginata(unittest.TestCase):
+    def setUp(self):
+        # Inseriti in disordine: la vista li ordina per matricola
+        self.studenti = [Studente(f"1000{i}", f"Nome{i}", f"Cognome{i}", [18 + i]) for i in (3, 0, 4, 1, 2)]
+
+    def stampa(self, comandi, dimensione_pagina=2):
+        output = io.StringIO()
+        with patch("builtins.input", side_effect=comandi):
+            ConsoleView.stampa_studenti_paginata(self.studenti, dimensione_pagina, output=output)
+        return output.getvalue()
+
+    def test_pagine_e_limiti(self):
+        testo = self.stampa(["p", "n", "n", "n", "q"])
+        pagine = [riga for riga in testo.splitlines() if riga.startswith("Pagina")]
+        # [p] sulla prima e [n] sull'ultima pagina non escono dall'elenco
+        self.assertEqual(pagine, ["Pagina 1/3 - 5 studenti", "Pagina 1/3 - 5 studenti",
+                                  "Pagina 2/3 - 5 studenti", "Pagina 3/3 - 5 studenti",
+                                  "Pagina 3/3 - 5 studenti"])
+        self.assertEqual(righe_studenti(testo),
+                         ["10000", "10001", "10000", "10001", "10002", "10003", "10004", "10004"])
+
+    def test_vai_alla_matricola(self):
+        testo = self.stampa(["v 10004", "v 99999", "x", "q"])
+        self.assertIn("Pagina 3/3", testo)
+        self.assertIn("❌ Matricola 99999 non trovata", testo)
+        self.assertIn("⚠️ Comando non valido!", testo)
+
+    def test_pagina_esatta(self):
+        testo = self.stampa(["n", "n", "q"], dimensione_pagina=5)
+        self.assertEqual(testo.count("Pagina 1/1 - 5 studenti"), 3)
+
+    def test_registro_vuoto(self):
+        output = io.StringIO()
+        ConsoleView.stampa_studenti_paginata([], output=output)
+        self.assertEqual(output.getvalue(), "Nessuno studente presente nel registro.\n")
+
+class TestStampaStudentiTesto(unittest.TestCase):
+    def test_righe_di_testo(self):
+        output = io.StringIO()
+        ConsoleView.stampa_studenti_testo(iter([Studente("10001", "Anna", "Verdi", [28, 30]),
+                                                Studente("10000", "Luca", "Rossi", [])]), output)
+        self.assertEqual(output.getvalue(), "Matricola\tNome\tCognome\tMedia Voti\n"
+                                            "10001\tAnna\tVerdi\t29.00\n"
+                                            "10000\tLuca\tRossi\t0.00\n")
+
+    def test_stdout_rediretto_dopo_l_import(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            ConsoleView.stampa_studenti_testo([Studente("10000", "Luca", "Rossi", [26])])
+        self.assertEqual(output.getvalue().splitlines()[1], "10000\tLuca\tRossi\t26.00")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import os
+import sys
+import tempfile
+import io
+import json
+from contextlib import redirect_stderr, redirect_stdout
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.studente import Studente
+from src.utils.controllo_integrita import (ControlloIntegrita, MATRICOLA_DUPLICATA, MATRICOLA_NON_VALIDA,
+                                           NOME_VUOTO, VOTO_NON_VALIDO, main)
+from src.utils.file_handler import FileHandler
+from src.utils.log_file_handler import LogFileHandler
+
+class TestControlloIntegrita(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_handler = FileHandler(os.path.join(self.tmp_dir.name, "registro.txt"))
+        self.file_handler.save_students([
+            Studente("12345", "Luca", "Rossi", [26, 74]),
+            Studente("12", "Anna", "Verdi", []),
+            Studente("23456", " ", "Bianchi", [30]),
+            Studente("34567", "Mario", "Neri", [18]),
+            Studente("34567", "Sara", "Neri", []),
+        ])
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def problemi(self, risultato):
+        return sorted((p.matricola, p.tipo) for p in risultato.problemi)
+
+    def test_trova_tutti_i_tipi_di_problema(self):
+        risultato = ControlloIntegrita(self.file_handler, usa_cache=False).controlla()
+        self.assertEqual(self.problemi(risultato), [
+            ("12", MATRICOLA_NON_VALIDA),
+            ("12345", VOTO_NON_VALIDO),
+            ("23456", NOME_VUOTO),
+            ("34567", MATRICOLA_DUPLICATA),
+            ("34567", MATRICOLA_DUPLICATA),
+        ])
+        self.assertEqual(risultato.ricontrollati, 5)
+        self.assertFalse(os.path.exists(self.file_handler.file_path + ".integrita"))
+
+    def test_ricontrolla_solo_i_record_cambiati(self):
+        primo = ControlloIntegrita(self.file_handler).controlla()
+        self.assertEqual(primo.ricontrollati, 5)
+
+        # Registro invariato: risultato interamente dalla cache
+        secondo = ControlloIntegrita(self.file_handler).controlla()
+        self.assertEqual((secondo.studenti, secondo.ricontrollati), (5, 0))
+        self.assertEqual(self.problemi(secondo), self.problemi(primo))
+
+        self.file_handler.add_grade("12345", 28)
+        self.file_handler.delete("12")
+        terzo = ControlloIntegrita(self.file_handler).controlla()
+        self.assertEqual((terzo.studenti, terzo.ricontrollati), (4, 1))
+        self.assertNotIn(("12", MATRICOLA_NON_VALIDA), self.problemi(terzo))
+        self.assertIn(("12345", VOTO_NON_VALIDO), self.problemi(terzo))
+
+    def test_backend_log_vede_le_operazioni_nel_log(self):
+        handler = LogFileHandler(self.file_handler.file_path)
+        # L'indice per matricola del backend log tiene un solo 34567
+        self.assertEqual(len(ControlloIntegrita(handler).controlla().problemi), 3)
+        handler.add_grade("34567", 15)
+        risultato = ControlloIntegrita(handler).controlla()
+        self.assertEqual(risultato.ricontrollati, 1)
+        self.assertEqual(len(risultato.problemi), 4)
+
+    def test_cli_scrive_solo_json_su_stdout(self):
+        cartella = os.getcwd()
+        os.chdir(self.tmp_dir.name)
+        try:
+            with open("registro.txt", "w", encoding="utf-8") as f:
+                f.write('[{"matricola": "12345"')
+            stdout, stderr = io.StringIO(), io.StringIO()
+            with redirect_stdout(stdout), redirect_stderr(stderr), self.assertRaises(SystemExit):
+                main(["--senza-cache"])
+        finally:
+            os.chdir(cartella)
+        righe = [json.loads(riga) for riga in stdout.getvalue().splitlines()]
+        self.assertEqual(len(righe), 1)
+        self.assertIn("registro non leggibile", righe[0]["errore"])
+        self.assertIn("❌", stderr.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,10 +16,9 @@ class TestDatabaseIntegrity(unittest.TestCase):
 
     def test_matricole_database(self):
         """Verifica che tutte le matricole nel database siano valide"""
-        studenti = self.file_handler.load_students()
         matricole_non_valide = []
 
-        for studente in studenti:
+        for studente in self.file_handler.iter_students():
             matricola = studente.matricola
             if not self.validator.valida_matricola(matricola):
                 matricole_non_valide.append({
@@ -0,0 +1,80 @@
+import unittest
+import io
+import os
+import sys
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.studente import Studente
+from src.utils.database_updater import DatabaseUpdater, GeneratoreMatricole
+from src.utils.file_handler import FileHandler
+from src.utils.input_validator import InputValidator
+
+class TestDatabaseUpdater(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_handler = FileHandler(os.path.join(self.tmp_dir.name, "registro.txt"))
+        self.file_handler.save_students([
+            Studente("12", "Luca", "Rossi", [26]),          # -> 00012
+            Studente("00034", "Anna", "Verdi", []),
+            Studente("34", "Mario", "Bianchi", []),         # 00034 già usata
+            Studente("abc", "Sara", "Neri", []),
+            Studente("10000", "Paolo", "Gialli", [30]),
+            Studente("x", "Luigi", "Bruni", []),            # ripetuta
+            Studente("x", "Marta", "Bruni", []),
+        ])
+        self.updater = DatabaseUpdater(self.file_handler, InputValidator())
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_generatore_senza_collisioni(self):
+        generatore = GeneratoreMatricole({"10000", "10001", "10003"}, InputValidator())
+        self.assertEqual([generatore.nuova() for _ in range(3)], ["10002", "10004", "10005"])
+        self.assertEqual(generatore.nuova("00012"), "00012")
+        self.assertEqual(generatore.nuova("00012"), "10006")
+
+    def test_anteprima_non_modifica_il_registro(self):
+        report = io.StringIO()
+        corrette, ok = self.updater.correggi_matricole(report, applica=False)
+        self.assertEqual((corrette, ok), (5, True))
+        righe = report.getvalue().splitlines()
+        self.assertEqual(righe[0], "vecchia\tnuova\tnome\tcognome")
+        self.assertEqual([r.split("\t")[:2] for r in righe[1:]],
+                         [["12", "00012"], ["34", "10001"], ["abc", "10002"], ["x", "10003"], ["x", "10004"]])
+        self.assertIn("abc", [s.matricola for s in self.file_handler.iter_students()])
+
+    def test_applica_correzioni_in_una_scrittura(self):
+        corrette, ok = self.updater.correggi_matricole()
+        self.assertEqual((corrette, ok), (5, True))
+        matricole = [s.matricola for s in self.file_handler.iter_students()]
+        # Anche le matricole ripetute ricevono una matricola ciascuna
+        self.assertEqual(matricole, ["00012", "00034", "10001", "10002", "10000", "10003", "10004"])
+        # Una seconda esecuzione non trova più nulla da correggere
+        self.assertEqual(self.updater.correggi_matricole(), (0, True))
+
+    def test_errore_di_salvataggio_non_sporca_il_report(self):
+        self.file_handler.update_matricole = lambda modifiche: False
+        report, errori = io.StringIO(), io.StringIO()
+        with redirect_stdout(report), redirect_stderr(errori):
+            self.assertEqual(self.updater.correggi_matricole(sys.stdout), (5, False))
+        self.assertTrue(all(len(riga.split("\t")) == 4 for riga in report.getvalue().splitlines()))
+        self.assertIn("❌", errori.getvalue())
+
+    def test_aggiorna_matricole_ripetute(self):
+        # Ogni studente con la stessa matricola non valida riceve la sua nuova matricola
+        with redirect_stdout(io.StringIO()):
+            contatore, aggiornate = self.updater.aggiorna_matricole(modalita_interattiva=False)
+        self.assertEqual(contatore, 5)
+        matricole = [s.matricola for s in self.file_handler.iter_students()]
+        self.assertEqual(len(set(matricole)), len(matricole))
+        nuove = {(m['nome'], m['cognome']): m['nuova'] for m in aggiornate}
+        for studente in self.file_handler.iter_students():
+            if (studente.nome, studente.cognome) in nuove:
+                self.assertEqual(studente.matricola, nuove[(studente.nome, studente.cognome)])
+
+if __name__ == '__main__':
+    unittest.main()
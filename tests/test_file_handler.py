@@ -0,0 +1,121 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+import io
+from contextlib import redirect_stdout
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.studente import Studente
+from src.utils import file_handler as file_handler_module
+from src.utils.file_handler import FileHandler
+from src.utils.scrittura_atomica import scrittura_atomica
+
+class TestIterStudents(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.percorso = os.path.join(self.tmp_dir.name, "registro.txt")
+        self.chunk_size = file_handler_module.CHUNK_SIZE
+        # Blocchi piccoli per spezzare i record tra una lettura e l'altra
+        file_handler_module.CHUNK_SIZE = 7
+
+    def tearDown(self):
+        file_handler_module.CHUNK_SIZE = self.chunk_size
+        self.tmp_dir.cleanup()
+
+    def scrivi(self, contenuto: str):
+        with open(self.percorso, "w", encoding="utf-8") as f:
+            f.write(contenuto)
+
+    def test_stesso_risultato_di_load_students(self):
+        dati = [{"matricola": str(10000 + i), "nome": "Nicolò", "cognome": "D'Amico",
+                 "voti": list(range(18, 18 + i % 13))} for i in range(50)]
+        for indent in (None, 2):
+            self.scrivi(json.dumps(dati, ensure_ascii=False, indent=indent))
+            handler = FileHandler(self.percorso)
+            self.assertEqual(list(handler.iter_students()), handler.load_students())
+
+    def test_array_vuoto_e_file_malformato(self):
+        self.scrivi("  [ ]  ")
+        self.assertEqual(list(FileHandler(self.percorso).iter_students()), [])
+        self.scrivi('[{"matricola": "12345"}, {"matricola": ')
+        letti = []
+        with redirect_stdout(io.StringIO()), self.assertRaises(json.JSONDecodeError):
+            for studente in FileHandler(self.percorso).iter_students():
+                letti.append(studente.matricola)
+        self.assertEqual(letti, ["12345"])
+
+class TestScritturaSicura(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.percorso = os.path.join(self.tmp_dir.name, "registro.txt")
+        FileHandler(self.percorso).save_students([Studente("12345", "Luca", "Rossi", [26])])
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_errore_durante_la_scrittura_lascia_il_file_intatto(self):
+        with self.assertRaises(RuntimeError):
+            with scrittura_atomica(self.percorso) as f:
+                f.write("[")
+                raise RuntimeError("interruzione simulata")
+        self.assertEqual(FileHandler(self.percorso).load_students()[0].matricola, "12345")
+        self.assertFalse([f for f in os.listdir(self.tmp_dir.name) if f.endswith(".tmp")])
+
+    def test_journal_recuperato_al_riavvio(self):
+        # Batch registrato nel journal ma mai applicato al registro
+        with open(self.percorso + ".journal", "w", encoding="utf-8") as f:
+            json.dump({"modified": [{"matricola": "54321", "nome": "Anna", "cognome": "Verdi", "voti": []}],
+                       "deleted": ["12345"]}, f)
+        handler = FileHandler(self.percorso, journal=True)
+        self.assertEqual([s.matricola for s in handler.load_students()], ["54321"])
+        self.assertFalse(os.path.exists(handler.journal_path))
+
+    def test_journal_riapplicato_dopo_altri_salvataggi(self):
+        # Il batch non è stato applicato, ma un altro processo ha salvato prima del recupero
+        originale = {"matricola": "12345", "nome": "Luca", "cognome": "Rossi", "voti": [26]}
+        with open(self.percorso + ".journal", "w", encoding="utf-8") as f:
+            json.dump({"modified": [dict(originale, voti=[26, 30])], "deleted": [],
+                       "originals": {"12345": originale}}, f)
+        FileHandler(self.percorso).save_students([Studente("12345", "Luca", "Rossi", [26, 18])])
+        with redirect_stdout(io.StringIO()):
+            handler = FileHandler(self.percorso, journal=True)
+        self.assertEqual(handler.get_by_matricola("12345").voti, [26, 18, 30])
+        self.assertFalse(os.path.exists(handler.journal_path))
+
+    def test_journal_gia_applicato_non_duplica_i_voti(self):
+        # Interruzione dopo il salvataggio e prima della rimozione del journal
+        originale = {"matricola": "12345", "nome": "Luca", "cognome": "Rossi", "voti": [26]}
+        with open(self.percorso + ".journal", "w", encoding="utf-8") as f:
+            json.dump({"modified": [dict(originale, voti=[26, 30])], "deleted": [],
+                       "originals": {"12345": originale}}, f)
+        FileHandler(self.percorso).save_students([Studente("12345", "Luca", "Rossi", [26, 30, 18])])
+        with redirect_stdout(io.StringIO()):
+            handler = FileHandler(self.percorso, journal=True)
+        self.assertEqual(handler.get_by_matricola("12345").voti, [26, 30, 18])
+        self.assertFalse(os.path.exists(handler.journal_path))
+
+    def test_registro_malformato_non_viene_sovrascritto(self):
+        with open(self.percorso, "w", encoding="utf-8") as f:
+            f.write('[{"matricola": "12345", "nome": "Luca", "cognome": "Rossi", "voti": [26]}, {"matr')
+        handler = FileHandler(self.percorso, journal=True)
+        with redirect_stdout(io.StringIO()):
+            self.assertFalse(handler.save_changes([Studente("54321", "Anna", "Verdi", [])], [], {"54321": None}))
+            self.assertFalse(handler.add_student(Studente("54321", "Anna", "Verdi", [])))
+            # Il batch resta nel journal finché il registro non torna leggibile
+            self.assertFalse(handler.recupera_journal())
+        with open(self.percorso, encoding="utf-8") as f:
+            self.assertTrue(f.read().endswith('{"matr'))
+        self.assertTrue(os.path.exists(handler.journal_path))
+
+    def test_save_changes_con_journal(self):
+        handler = FileHandler(self.percorso, journal=True)
+        self.assertTrue(handler.save_changes([Studente("12345", "Luca", "Rossi", [26, 30])], []))
+        self.assertEqual(handler.get_by_matricola("12345").voti, [26, 30])
+        self.assertFalse(os.path.exists(handler.journal_path))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import os
+import sys
+import tempfile
+import json
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.studente import Studente
+from src.utils.file_handler import FileHandler
+from src.utils.importa_esporta import importa, esporta
+
+class TestImportaEsporta(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.registro = os.path.join(self.tmp_dir.name, "registro.txt")
+        FileHandler(self.registro).save_students([Studente("12345", "Luca", "Rossi", [26])])
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def percorso(self, nome: str) -> str:
+        return os.path.join(self.tmp_dir.name, nome)
+
+    def test_importazione_csv_con_validazione_e_duplicati(self):
+        with open(self.percorso("studenti.csv"), "w", encoding="utf-8") as f:
+            f.write("matricola,nome,cognome,voti\n"
+                    "23456,Mario,Bianchi,25;30\n"
+                    "12345,Luca,Rossi,\n"      # già nel registro
+                    "23456,Mario,Bianchi,\n"   # duplicata nel file
+                    "12,Anna,Verdi,\n"         # matricola non valida
+                    "34567,Paolo,Neri,31\n"    # voto fuori intervallo
+                    "45678,Sara,Gialli,\n")
+        risultato = importa(FileHandler(self.registro), self.percorso("studenti.csv"), dimensione_batch=1)
+        self.assertEqual((risultato.righe, risultato.salvati, risultato.duplicati, risultato.scartati),
+                         (6, 2, 2, 2))
+        self.assertEqual([r for r, _ in risultato.errori], [5, 6])
+        studenti = FileHandler(self.registro).load_students()
+        self.assertEqual([s.matricola for s in studenti], ["12345", "23456", "45678"])
+        self.assertEqual(studenti[1].voti, [25, 30])
+
+    def test_esportazione_e_reimportazione(self):
+        for estensione in (".csv", ".jsonl"):
+            esportato = self.percorso("export" + estensione)
+            self.assertEqual(esporta(FileHandler(self.registro), esportato).righe, 1)
+            nuovo_registro = FileHandler(self.percorso("nuovo" + estensione + ".txt"))
+            self.assertEqual(importa(nuovo_registro, esportato).salvati, 1)
+            self.assertEqual(nuovo_registro.load_students(), FileHandler(self.registro).load_students())
+
+    def test_dettagli_dei_voti_conservati(self):
+        studente = Studente("23456", "Mario", "Bianchi", [26])
+        studente.aggiungi_voto(30, "2025-06-12T09:30:00", "PROG", True)
+        studente.aggiungi_voto(24, corso="ANA1")
+        FileHandler(self.registro).append_students([studente])
+        for estensione in (".csv", ".jsonl"):
+            esportato = self.percorso("export" + estensione)
+            esporta(FileHandler(self.registro), esportato)
+            nuovo_registro = FileHandler(self.percorso("nuovo" + estensione + ".txt"))
+            self.assertEqual(importa(nuovo_registro, esportato).salvati, 2)
+            self.assertEqual(nuovo_registro.load_students(), FileHandler(self.registro).load_students())
+
+    def test_dettagli_non_validi_scartati(self):
+        with open(self.percorso("studenti.jsonl"), "w", encoding="utf-8") as f:
+            for dati in ({"date": ["ieri"]}, {"lode": [True]}, {"corsi": [None, "PROG"]}, {"corsi": "PROG"}):
+                f.write(json.dumps(dict({"matricola": "23456", "nome": "Mario", "cognome": "Bianchi",
+                                         "voti": [26]}, **dati)) + "\n")
+        risultato = importa(FileHandler(self.registro), self.percorso("studenti.jsonl"))
+        self.assertEqual([motivo for _, motivo in risultato.errori],
+                         ["data non valida: 'ieri'", "la lode è ammessa solo con 30",
+                          "più dettagli che voti", "dettagli dei voti non in formato lista"])
+
+if __name__ == '__main__':
+    unittest.main()
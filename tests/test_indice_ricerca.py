@@ -0,0 +1,44 @@
+import unittest
+import os
+import sys
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.indice_ricerca import IndiceRicerca
+
+class TestIndiceRicerca(unittest.TestCase):
+    def setUp(self):
+        self.indice = IndiceRicerca()
+        self.indice.aggiungi("1", "Luca", "Rossi")
+        self.indice.aggiungi("2", "Lucia", "Rossini")
+        self.indice.aggiungi("3", "Nicolò", "De Luca")
+        self.indice.aggiungi("4", "Mario", "Bianchi")
+
+    def test_prefisso(self):
+        self.assertEqual(self.indice.cerca_prefisso("ross"), ["1", "2"])
+        self.assertEqual(sorted(self.indice.cerca_prefisso("luc")), ["1", "2", "3"])
+        self.assertEqual(self.indice.cerca_prefisso("rossi luca"), ["1"])
+        self.assertEqual(self.indice.cerca_prefisso("NICOLO de"), ["3"])
+        self.assertEqual(self.indice.cerca_prefisso("ross", limite=1), ["1"])
+        self.assertEqual(self.indice.cerca_prefisso("verdi"), [])
+
+    def test_simili_con_refusi(self):
+        risultati = self.indice.cerca_simili("rosi luca")
+        self.assertEqual(risultati[0][0], "1")
+        self.assertEqual(self.indice.cerca_simili("bianci")[0][0], "4")
+        self.assertEqual(self.indice.cerca_simili("zzzz"), [])
+
+    def test_aggiornato_con_aggiunte_e_rimozioni(self):
+        self.indice.rimuovi("4")
+        self.assertEqual(self.indice.cerca_prefisso("bian"), [])
+        self.assertNotIn("bianchi", self.indice._matricole)
+        self.indice.aggiungi("5", "Anna", "Bianchi")
+        self.assertEqual(self.indice.cerca_prefisso("bian"), ["5"])
+        # Riaggiungere una matricola sostituisce le sue parole
+        self.indice.aggiungi("5", "Anna", "Verdi")
+        self.assertEqual(self.indice.cerca_prefisso("bian"), [])
+        self.assertEqual(len(self.indice), 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+import io
+from contextlib import redirect_stdout
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.studente import Studente
+from src.utils.log_file_handler import LogFileHandler
+
+class TestLogFileHandler(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.percorso = os.path.join(self.tmp_dir.name, "registro.txt")
+        with open(self.percorso, "w", encoding="utf-8") as f:
+            json.dump([{"matricola": "12345", "nome": "Luca", "cognome": "Rossi", "voti": [26]}], f)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_modifiche_su_log_senza_riscrivere_snapshot(self):
+        handler = LogFileHandler(self.percorso)
+        snapshot_prima = os.path.getmtime(self.percorso), os.path.getsize(self.percorso)
+        self.assertTrue(handler.add_student(Studente("54321", "Anna", "Verdi", [])))
+        self.assertTrue(handler.add_grade("12345", 30))
+        self.assertTrue(handler.delete("54321"))
+        self.assertEqual((os.path.getmtime(self.percorso), os.path.getsize(self.percorso)), snapshot_prima)
+
+        # Un nuovo handler ricostruisce lo stato rileggendo il log
+        riletto = LogFileHandler(self.percorso)
+        self.assertIsNone(riletto.get_by_matricola("54321"))
+        self.assertEqual(riletto.get_by_matricola("12345").voti, [26, 30])
+
+    def test_snapshot_malformato_non_viene_compattato(self):
+        with open(self.percorso, "w", encoding="utf-8") as f:
+            f.write('[{"matricola": "12345", "nome": "Luca", "cognome": "Rossi", "voti": [26]}, {"matr')
+        handler = LogFileHandler(self.percorso, soglia_compattazione=1)
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(handler.load_students(), [])
+            with self.assertRaises(json.JSONDecodeError):
+                handler.add_grade("12345", 30)
+        with open(self.percorso, encoding="utf-8") as f:
+            self.assertTrue(f.read().endswith('{"matr'))
+
+    def test_compattazione(self):
+        handler = LogFileHandler(self.percorso, soglia_compattazione=2)
+        handler.add_grade("12345", 28)
+        handler.add_grade("12345", 29)
+        self.assertFalse(os.path.exists(handler.log_path))
+        with open(self.percorso, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)[0]["voti"], [26, 28, 29])
+
+    def test_replay_idempotente_dopo_compattazione_interrotta(self):
+        handler = LogFileHandler(self.percorso)
+        handler.add_grade("12345", 30)
+        # Simula uno snapshot già scritto ma log non ancora azzerato
+        with open(self.percorso, "w", encoding="utf-8") as f:
+            json.dump([{"matricola": "12345", "nome": "Luca", "cognome": "Rossi", "voti": [26, 30]}], f)
+        self.assertEqual(LogFileHandler(self.percorso).get_by_matricola("12345").voti, [26, 30])
+
+    def test_modifiche_esterne_dal_log(self):
+        lettore = LogFileHandler(self.percorso)
+        lettore.load_students()
+        self.assertEqual(lettore.modifiche_esterne(), set())
+
+        scrittore = LogFileHandler(self.percorso)
+        scrittore.add_student(Studente("54321", "Anna", "Verdi", []))
+        scrittore.add_grade("12345", 30)
+        self.assertEqual(lettore.modifiche_esterne(), {"54321", "12345"})
+        self.assertEqual(lettore.get_by_matricola("12345").voti, [26, 30])
+        self.assertEqual(lettore.modifiche_esterne(), set())
+
+        # Le operazioni del lettore stesso non sono modifiche esterne
+        lettore.delete("54321")
+        self.assertEqual(lettore.modifiche_esterne(), set())
+
+        # Snapshot riscritto da un altro processo: serve una rilettura completa
+        scrittore.add_grade("12345", 28)
+        scrittore.compatta()
+        self.assertIsNone(lettore.modifiche_esterne())
+        self.assertEqual(lettore.get_by_matricola("12345").voti, [26, 30, 28])
+
+if __name__ == '__main__':
+    unittest.main()
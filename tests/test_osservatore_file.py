@@ -0,0 +1,51 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.registro import Registro
+from src.models.studente import Studente
+from src.utils.file_handler import FileHandler
+from src.utils.osservatore_file import OsservatoreFile
+
+class TestOsservatoreFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.percorso = os.path.join(self.tmp_dir.name, "registro.txt")
+        FileHandler(self.percorso).save_students([Studente("12345", "Luca", "Rossi", [26])])
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_eventi_sui_soli_file_osservati(self):
+        osservatore = OsservatoreFile([self.percorso])
+        if not osservatore.attivo:
+            self.skipTest("inotify non disponibile")
+        self.assertFalse(osservatore.cambiato())
+        with open(os.path.join(self.tmp_dir.name, "altro.txt"), "w") as f:
+            f.write("x")
+        self.assertFalse(osservatore.cambiato())
+        # Salvataggio atomico: file temporaneo rinominato sul registro
+        FileHandler(self.percorso).save_students([])
+        self.assertTrue(osservatore.cambiato())
+        self.assertFalse(osservatore.cambiato())
+        osservatore.close()
+
+    def test_registro_osservato(self):
+        registro = Registro(FileHandler(self.percorso), osserva=True)
+        self.assertFalse(registro.aggiorna_se_cambiato())
+        FileHandler(self.percorso).save_students([Studente("12345", "Luca", "Rossi", [26, 30])])
+        self.assertTrue(registro.aggiorna_se_cambiato())
+        self.assertEqual(registro.trova("12345").voti, [26, 30])
+        # I salvataggi del registro stesso generano eventi ma non riallineamenti
+        registro.aggiungi_voto("12345", 18)
+        self.assertTrue(registro.flush())
+        self.assertFalse(registro.aggiorna_se_cambiato())
+        self.assertEqual(registro.metriche.miss, 1)
+        registro.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.registro import Registro, registro_condiviso
+from src.models.studente import Studente
+from src.utils.file_handler import FileHandler
+
+class TestRegistro(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.percorso = os.path.join(self.tmp_dir.name, "registro.txt")
+        with open(self.percorso, "w", encoding="utf-8") as f:
+            json.dump([
+                {"matricola": "12345", "nome": "Luca", "cognome": "Rossi", "voti": [26]},
+                {"matricola": "23456", "nome": "Mario", "cognome": "Bianchi", "voti": []},
+            ], f)
+        self.registro = Registro(FileHandler(self.percorso))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_indici(self):
+        self.assertIn("12345", self.registro)
+        self.assertEqual(self.registro.trova("23456").nome, "Mario")
+        self.assertEqual([s.matricola for s in self.registro.cerca_per_nome("rossi", "LUCA")], ["12345"])
+        self.assertFalse(self.registro.aggiungi(Studente("12345", "Altro", "Studente", [])))
+
+    def test_flush_solo_con_modifiche(self):
+        mtime = os.path.getmtime(self.percorso)
+        self.assertTrue(self.registro.flush())
+        self.assertEqual(os.path.getmtime(self.percorso), mtime)
+
+        self.registro.aggiungi_voto("12345", 30)
+        self.registro.cancella("23456")
+        self.assertTrue(self.registro.ha_modifiche)
+        self.assertTrue(self.registro.flush())
+        self.assertFalse(self.registro.ha_modifiche)
+        self.assertEqual(self.registro.cerca_per_nome("Bianchi", "Mario"), [])
+
+        riletto = FileHandler(self.percorso).load_students()
+        self.assertEqual([(s.matricola, s.voti) for s in riletto], [("12345", [26, 30])])
+
+    def test_aggregati_aggiornati_con_i_voti(self):
+        self.registro.aggiungi_voto("12345", 30)
+        self.registro.aggiungi_voto("23456", 18)
+        aggregati = self.registro.aggregati()
+        self.assertEqual((aggregati["12345"].media, aggregati["12345"].massimo), (28.0, 30))
+        self.assertEqual(aggregati["23456"].conteggio, 1)
+        self.assertEqual(self.registro.verifica_aggregati(), [])
+
+        # Voti cambiati senza passare dal Registro: la verifica li segnala
+        self.registro.trova("12345").voti.pop()
+        self.assertEqual(self.registro.verifica_aggregati(), ["12345"])
+        self.registro.ricalcola_aggregati("12345")
+        self.assertEqual(self.registro.verifica_aggregati(), [])
+
+        self.registro.cancella("23456")
+        self.assertNotIn("23456", self.registro.aggregati())
+
+    def test_ricerca_per_nome(self):
+        self.assertEqual([s.matricola for s in self.registro.cerca("ros")], ["12345"])
+        self.registro.aggiungi(Studente("34567", "Luisa", "Rosso", []))
+        self.assertEqual(sorted(s.matricola for s in self.registro.cerca("ros")), ["12345", "34567"])
+        self.registro.cancella("12345")
+        self.assertEqual([s.matricola for s in self.registro.cerca_simili("biancki")], ["23456"])
+        self.assertEqual([s.matricola for s in self.registro.cerca("ros")], ["34567"])
+
+    def test_classifiche_sulle_medie(self):
+        self.registro.aggiungi(Studente("34567", "Anna", "Verdi", [30, 28]))
+        self.registro.aggiungi(Studente("45678", "Sara", "Neri", [18, 20]))
+        # 23456 non ha voti: non è classificato
+        self.assertEqual([(s.matricola, m) for s, m in self.registro.migliori(2)],
+                         [("34567", 29.0), ("12345", 26.0)])
+        self.assertEqual([s.matricola for s, _ in self.registro.sotto_soglia(24)], ["45678"])
+
+        self.registro.aggiungi_voto("45678", 30)
+        self.registro.aggiungi_voto("23456", 18)
+        self.assertEqual([(s.matricola, round(m, 2)) for s, m in self.registro.sotto_soglia(24)],
+                         [("23456", 18.0), ("45678", 22.67)])
+        self.assertEqual(self.registro.percentile(50), 22.67)
+        self.assertEqual(self.registro.rango_percentile("34567"), 75.0)
+        self.registro.cancella("34567")
+        self.assertEqual(self.registro.migliori(1)[0][0].matricola, "12345")
+        self.assertIsNone(self.registro.rango_percentile("34567"))
+
+    def test_registro_condiviso(self):
+        letture = []
+
+        class FileHandlerContato(FileHandler):
+            def load_students(self):
+                letture.append(self.file_path)
+                return super().load_students()
+
+            def iter_students(self):
+                letture.append(self.file_path)
+                return super().iter_students()
+
+        registro = registro_condiviso(FileHandlerContato(self.percorso))
+        self.assertIs(registro_condiviso(FileHandlerContato(self.percorso)), registro)
+        self.assertEqual(len(letture), 1)
+
+        # Salvataggio di un altro processo: il registro viene riletto una volta
+        FileHandler(self.percorso).save_students([Studente("34567", "Anna", "Verdi", [30])])
+        self.assertEqual(registro_condiviso(FileHandler(self.percorso)).studenti(),
+                         [Studente("34567", "Anna", "Verdi", [30])])
+        self.assertEqual(len(letture), 2)
+
+        # I salvataggi fatti dal registro stesso non causano riletture
+        studente = registro.trova("34567")
+        registro.aggiungi_voto("34567", 28)
+        self.assertTrue(registro.flush())
+        self.assertIs(registro_condiviso(FileHandler(self.percorso)).trova("34567"), studente)
+
+    def test_riallineamento_incrementale(self):
+        invariato = self.registro.trova("23456")
+        FileHandler(self.percorso).save_students([
+            Studente("12345", "Luca", "Rossi", [26, 30]),
+            Studente("23456", "Mario", "Bianchi", []),
+            Studente("34567", "Anna", "Verdi", [28]),
+        ])
+        self.assertTrue(self.registro.aggiorna_se_cambiato())
+        self.assertFalse(self.registro.aggiorna_se_cambiato())
+        # I record non cambiati non vengono ricostruiti
+        self.assertIs(self.registro.trova("23456"), invariato)
+        self.assertEqual([s.matricola for s in self.registro.studenti()], ["12345", "23456", "34567"])
+        self.assertEqual(self.registro.aggregati()["12345"].media, 28.0)
+        self.assertEqual([s.matricola for s in self.registro.cerca("verdi")], ["34567"])
+        self.assertEqual((self.registro.metriche.hit, self.registro.metriche.miss,
+                          self.registro.metriche.record_aggiornati), (1, 1, 2))
+
+        FileHandler(self.percorso).save_students([Studente("34567", "Anna", "Verdi", [28])])
+        self.assertTrue(self.registro.aggiorna_se_cambiato())
+        self.assertEqual([s.matricola for s in self.registro.studenti()], ["34567"])
+        self.assertEqual(self.registro.cerca_per_nome("rossi", "luca"), [])
+        self.assertEqual(self.registro.verifica_aggregati(), [])
+
+if __name__ == '__main__':
+    unittest.main()
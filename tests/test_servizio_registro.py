@@ -0,0 +1,115 @@
+import unittest
+import asyncio
+import io
+import json
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.registro import Registro
+from src.models.studente import Studente
+from src.utils.file_handler import FileHandler
+from src.utils.servizio_registro import ServizioRegistro
+
+async def richiesta(porta, metodo, percorso, dati=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", porta)
+    corpo = json.dumps(dati).encode() if dati is not None else b""
+    writer.write(f"{metodo} {percorso} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+                 f"Content-Length: {len(corpo)}\r\n\r\n".encode() + corpo)
+    risposta = await reader.read()
+    writer.close()
+    intestazione, _, corpo = risposta.partition(b"\r\n\r\n")
+    return int(intestazione.split()[1]), json.loads(corpo)
+
+class TestServizioRegistro(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_handler = FileHandler(os.path.join(self.tmp_dir.name, "registro.txt"))
+        self.file_handler.save_students([Studente("10000", "Luca", "Rossi", [26])])
+        self.servizio = ServizioRegistro(Registro(self.file_handler))
+        self.server = await self.servizio.avvia("127.0.0.1", 0)
+        self.porta = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        await self.servizio.chiudi()
+        self.tmp_dir.cleanup()
+
+    async def test_operazioni(self):
+        self.assertEqual(await richiesta(self.porta, "GET", "/studenti/10000"),
+                         (200, {"matricola": "10000", "nome": "Luca", "cognome": "Rossi", "voti": [26]}))
+        self.assertEqual((await richiesta(self.porta, "POST", "/studenti",
+                                          {"matricola": "20000", "nome": "Anna", "cognome": "Bianchi"}))[0], 201)
+        self.assertEqual((await richiesta(self.porta, "POST", "/studenti",
+                                          {"matricola": "20000", "nome": "Anna", "cognome": "Bianchi"}))[0], 409)
+        self.assertEqual((await richiesta(self.porta, "POST", "/studenti/20000/voti", {"voto": 31}))[0], 400)
+        self.assertEqual((await richiesta(self.porta, "POST", "/studenti/20000/voti", {"voto": 30}))[0], 200)
+        self.assertEqual((await richiesta(self.porta, "DELETE", "/studenti/10000"))[0], 200)
+        self.assertEqual((await richiesta(self.porta, "GET", "/studenti/10000"))[0], 404)
+        stato, elenco = await richiesta(self.porta, "GET", "/studenti?limite=10")
+        self.assertEqual(elenco["totale"], 1)
+        self.assertEqual([(s.matricola, s.voti) for s in self.file_handler.load_students()], [("20000", [30])])
+
+    async def test_scritture_raggruppate(self):
+        risposte = await asyncio.gather(*(
+            richiesta(self.porta, "POST", "/studenti/10000/voti", {"voto": 18 + i % 13}) for i in range(40)))
+        self.assertTrue(all(stato == 200 for stato, _ in risposte))
+        self.assertEqual(len(self.file_handler.load_students()[0].voti), 41)
+        self.assertEqual(self.servizio.scritture, 40)
+        self.assertLess(self.servizio.salvataggi, 40)
+
+    async def test_errore_nel_gruppo_non_ferma_il_servizio(self):
+        flush = self.servizio.registro.flush
+
+        def flush_non_riuscito():
+            self.servizio.registro.flush = flush
+            raise OSError("disco pieno")
+        self.servizio.registro.flush = flush_non_riuscito
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual((await richiesta(self.porta, "POST", "/studenti/10000/voti", {"voto": 30}))[0], 500)
+        self.assertEqual(self.servizio.registro.trova("10000").voti, [26])
+        self.assertEqual((await richiesta(self.porta, "POST", "/studenti/10000/voti", {"voto": 28}))[0], 200)
+        self.assertEqual(self.file_handler.load_students()[0].voti, [26, 28])
+
+    async def test_conflitto_solo_per_le_matricole_coinvolte(self):
+        # Un altro operatore cancella 10000 mentre il gruppo è in corso:
+        # il nuovo voto è in conflitto, il nuovo studente no
+        flush = self.servizio.registro.flush
+
+        def flush_dopo_cancellazione():
+            self.servizio.registro.flush = flush
+            FileHandler(self.file_handler.file_path).delete("10000")
+            return flush()
+        self.servizio.registro.flush = flush_dopo_cancellazione
+        self.servizio.finestra = 0.05
+        with redirect_stdout(io.StringIO()):
+            voto, nuovo = await asyncio.gather(
+                richiesta(self.porta, "POST", "/studenti/10000/voti", {"voto": 30}),
+                richiesta(self.porta, "POST", "/studenti", {"matricola": "20000", "nome": "Anna", "cognome": "Bianchi"}))
+        self.assertEqual(self.servizio.salvataggi, 1)
+        self.assertEqual((voto[0], nuovo[0]), (409, 201))
+        self.assertEqual([s.matricola for s in self.file_handler.load_students()], ["20000"])
+
+    async def test_modifiche_di_altri_processi(self):
+        FileHandler(self.file_handler.file_path).add_student(Studente("20000", "Anna", "Bianchi", []))
+        self.assertEqual((await richiesta(self.porta, "GET", "/studenti/20000"))[0], 200)
+        # Una scrittura su uno studente aggiunto da altri non è un 404
+        self.assertEqual((await richiesta(self.porta, "POST", "/studenti/20000/voti", {"voto": 28}))[0], 200)
+
+    async def test_matricola_codificata_nel_percorso(self):
+        self.assertEqual((await richiesta(self.porta, "GET", "/studenti/%31%30000"))[0], 200)
+
+    async def test_content_length_non_valido(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.porta)
+        writer.write(b"POST /studenti HTTP/1.1\r\nHost: test\r\nContent-Length: abc\r\n\r\n")
+        risposta = await reader.read()
+        writer.close()
+        self.assertTrue(risposta.startswith(b"HTTP/1.1 400 "))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.studente import Studente
+from src.utils.snapshot_file_handler import SnapshotFileHandler, esporta_snapshot
+
+class TestSnapshotFileHandler(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.percorso = os.path.join(self.tmp_dir.name, "registro.snap")
+        self.studenti = [
+            Studente("30000", "Nicolò", "Rossi", [30, 28]),
+            Studente("10000", "Luca", "Rossi", []),
+            Studente("20000", "Anna", "Bianchi", [18]),
+        ]
+        esporta_snapshot(self.studenti, self.percorso)
+        self.handler = SnapshotFileHandler(self.percorso)
+
+    def tearDown(self):
+        self.handler.close()
+        self.tmp_dir.cleanup()
+
+    def test_andata_e_ritorno(self):
+        self.assertEqual(self.handler.load_students(),
+                         sorted(self.studenti, key=lambda s: s.matricola))
+        self.assertEqual(self.handler.get_by_matricola("30000"), self.studenti[0])
+        self.assertIsNone(self.handler.get_by_matricola("25000"))
+        self.assertIsNone(self.handler.get_by_matricola("9" * 40))
+
+    def test_sola_lettura(self):
+        self.assertFalse(self.handler.add_grade("10000", 30))
+        self.assertFalse(self.handler.save_students(self.studenti))
+        self.assertEqual(self.handler.get_by_matricola("10000").voti, [])
+
+    def test_voti_non_interi(self):
+        with self.assertRaises(ValueError):
+            esporta_snapshot([Studente("10000", "Luca", "Rossi", [27.5])], self.percorso)
+        # Lo snapshot precedente resta intatto
+        self.assertEqual(len(self.handler.load_students()), 3)
+
+    def test_limiti_dei_campi(self):
+        for studente in (Studente("10000", "L" * 70000, "Rossi", []),
+                         Studente("10000", "Luca", "Rossi", [18] * 70000),
+                         Studente("10000", "Luca", "Rossi", [40000])):
+            with self.assertRaisesRegex(ValueError, "matricola 10000"):
+                esporta_snapshot([studente], self.percorso)
+        self.assertEqual(len(self.handler.load_students()), 3)
+
+    def test_file_non_valido(self):
+        percorso = os.path.join(self.tmp_dir.name, "registro.txt")
+        with open(percorso, "w", encoding="utf-8") as file:
+            file.write("[]")
+        handler = SnapshotFileHandler(percorso)
+        self.assertEqual(handler.load_students(), [])
+        self.assertIsNone(handler.get_by_matricola("10000"))
+
+if __name__ == '__main__':
+    unittest.main()
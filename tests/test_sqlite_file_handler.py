@@ -0,0 +1,55 @@
+import unittest
+import os
+import sys
+import tempfile
+import io
+from contextlib import redirect_stdout
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.studente import Studente, Voto
+from src.utils.sqlite_file_handler import SqliteFileHandler, importa_da_json
+
+class TestSqliteFileHandler(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.handler = SqliteFileHandler(os.path.join(self.tmp_dir.name, "registro.db"))
+
+    def tearDown(self):
+        self.handler.close()
+        self.tmp_dir.cleanup()
+
+    def test_operazioni_mirate(self):
+        self.assertTrue(self.handler.add_student(Studente("12345", "Luca", "Rossi", [26])))
+        self.assertTrue(self.handler.add_grade("12345", 30))
+        self.assertFalse(self.handler.add_grade("99999", 30))
+        self.assertEqual(self.handler.get_by_matricola("12345").voti, [26, 30])
+        self.assertTrue(self.handler.update_matricole({"12345": "54321"}))
+        self.assertIsNone(self.handler.get_by_matricola("12345"))
+        self.assertTrue(self.handler.delete("54321"))
+        self.assertEqual(self.handler.load_students(), [])
+
+    def test_errore_database_nella_cancellazione(self):
+        self.handler.add_student(Studente("12345", "Luca", "Rossi", [26]))
+        self.handler.conn.close()
+        with redirect_stdout(io.StringIO()) as output:
+            self.assertFalse(self.handler.delete("12345"))
+        self.assertIn("❌", output.getvalue())
+
+    def test_dettagli_voti(self):
+        self.assertTrue(self.handler.add_student(Studente("12345", "Luca", "Rossi", [26])))
+        studente = self.handler.get_by_matricola("12345")
+        studente.aggiungi_voto(30, "2025-06-12T09:30:00", "PROG", True)
+        self.assertTrue(self.handler.save_changes([studente], []))
+        self.assertEqual(self.handler.get_by_matricola("12345").voti_dettagliati()[1],
+                         Voto(30, "2025-06-12T09:30:00", "PROG", True))
+
+    def test_importazione_a_batch(self):
+        studenti = [Studente(str(10000 + i), "Nome", "Cognome", [18 + i % 13]) for i in range(25)]
+        studenti.append(Studente("10000", "Duplicato", "Cognome", []))
+        self.assertEqual(importa_da_json(self.handler, studenti, dimensione_batch=10), 25)
+        self.assertEqual(self.handler.load_students(), studenti[:25])
+
+if __name__ == '__main__':
+    unittest.main()
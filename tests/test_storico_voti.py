@@ -0,0 +1,83 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+from datetime import datetime
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.registro import Registro
+from src.models.storico_voti import IndiceStorico, periodo_mese
+from src.models.studente import Studente, Voto
+from src.utils.file_handler import FileHandler
+
+class TestStoricoVoti(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.percorso = os.path.join(self.tmp_dir.name, "registro.txt")
+        with open(self.percorso, "w", encoding="utf-8") as f:
+            json.dump([
+                # Formato precedente: solo i valori dei voti
+                {"matricola": "12345", "nome": "Luca", "cognome": "Rossi", "voti": [26]},
+                {"matricola": "23456", "nome": "Mario", "cognome": "Bianchi", "voti": [24, 30],
+                 "date": ["2025-05-20T10:00:00", "2025-06-12T09:30:00"],
+                 "corsi": ["ANA1", "PROG"], "lode": [False, True]},
+            ], f)
+        self.registro = Registro(FileHandler(self.percorso))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_formato_precedente(self):
+        luca = self.registro.trova("12345")
+        self.assertIsNone(luca.dettagli)
+        self.assertEqual(luca.voti_dettagliati(), [Voto(26)])
+        self.assertNotIn("date", luca.to_dict())
+        self.assertEqual(self.registro.trova("23456").voti_dettagliati()[1],
+                         Voto(30, "2025-06-12T09:30:00", "PROG", True))
+
+    def test_lode_solo_con_30(self):
+        with self.assertRaises(ValueError):
+            Studente("1", "A", "B", []).aggiungi_voto(28, lode=True)
+
+    def test_periodo_e_corso(self):
+        self.registro.aggiungi_voto("12345", 28, "PROG", "2025-06-01T08:00:00")
+        voti = self.registro.voti_nel_periodo(*periodo_mese("2025-06"))
+        self.assertEqual([(s.matricola, v.valore) for s, v in voti], [("12345", 28), ("23456", 30)])
+        statistiche = self.registro.statistiche_corso("PROG")
+        self.assertEqual((statistiche.voti, statistiche.media, statistiche.lodi), (2, 29.0, 1))
+        self.assertEqual(self.registro.corsi(), ["ANA1", "PROG"])
+
+        # I dettagli sopravvivono al salvataggio, il voto senza data riceve quella corrente
+        self.registro.aggiungi_voto("12345", 18, "ANA1")
+        self.assertTrue(self.registro.flush())
+        ricaricato = Registro(FileHandler(self.percorso))
+        luca = ricaricato.trova("12345")
+        self.assertEqual([v.corso for v in luca.voti_dettagliati()], [None, "PROG", "ANA1"])
+        self.assertIsNotNone(luca.voti_dettagliati()[2].data)
+        self.assertEqual(ricaricato.statistiche_corso("PROG").voti, 2)
+
+    def test_rimozione_dall_indice(self):
+        indice = IndiceStorico.da_studenti(self.registro.studenti())
+        self.assertEqual(len(indice), 2)
+        indice.rimuovi_studente("23456")
+        self.assertEqual(len(indice), 0)
+        self.assertIsNone(indice.statistiche_corso("PROG"))
+        self.assertEqual(indice.nel_periodo(datetime(2000, 1, 1), datetime(2100, 1, 1)), [])
+
+    def test_voto_aggiunto_senza_reindicizzare(self):
+        self.registro.aggiungi_voto("23456", 27, "ANA1", "2025-05-25T10:00:00")
+        self.registro.aggiungi_voto("12345", 30, "PROG", "2025-04-01T10:00:00", True)
+        self.registro.cancella("12345")
+        # Lo stesso indice ricostruito da zero
+        ricostruito = IndiceStorico.da_studenti(self.registro.studenti())
+        periodo = datetime(2025, 1, 1), datetime(2026, 1, 1)
+        self.assertEqual(self.registro._storico.nel_periodo(*periodo), ricostruito.nel_periodo(*periodo))
+        self.assertEqual(self.registro.statistiche_corso("ANA1"), ricostruito.statistiche_corso("ANA1"))
+        self.assertEqual(self.registro.statistiche_corso("PROG"), ricostruito.statistiche_corso("PROG"))
+        self.assertEqual(len(self.registro._storico), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+import os
+import sys
+from array import array
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.aggregati_voti import AggregatiVoti
+from src.models.studente import Studente, StudenteCompatto
+from src.utils.matematici import calcola_media
+
+class TestStudenteCompatto(unittest.TestCase):
+    def test_compatibile_con_studente(self):
+        dati = {"matricola": "12345", "nome": "Luca", "cognome": "Rossi", "voti": [26, 30]}
+        compatto = StudenteCompatto.from_dict(dati)
+        self.assertIsInstance(compatto.voti, array)
+        self.assertEqual(compatto.to_dict(), dati)
+        self.assertEqual(compatto, Studente.from_dict(dati))
+        compatto.voti.append(18)
+        self.assertEqual(list(compatto.voti), [26, 30, 18])
+        self.assertFalse(hasattr(compatto, "__dict__"))
+
+    def test_nomi_internati_e_voti_fuori_byte(self):
+        a = StudenteCompatto("1", "".join(["Lu", "ca"]), "Rossi", [])
+        b = StudenteCompatto("2", "".join(["L", "uca"]), "Rossi", [300])
+        self.assertIs(a.nome, b.nome)
+        self.assertEqual(b.voti, [300])
+
+class TestAggregatiVoti(unittest.TestCase):
+    def test_aggregati_incrementali(self):
+        aggregati = AggregatiVoti.da_voti([24, "x", 30])
+        self.assertEqual((aggregati.conteggio, aggregati.minimo, aggregati.massimo), (2, 24, 30))
+        self.assertEqual(aggregati.media, calcola_media([24, "x", 30]))
+        self.assertEqual(aggregati.varianza, 9.0)
+        aggregati.aggiungi(18)
+        self.assertEqual(aggregati, AggregatiVoti.da_voti([24, 30, 18]))
+        self.assertEqual((AggregatiVoti().media, AggregatiVoti().varianza), (0.0, 0.0))
+
+if __name__ == '__main__':
+    unittest.main()